@@ -0,0 +1,527 @@
+# benchmarks/run_benchmarks.py
+"""
+Speed and memory benchmarks of the pipeline's hot paths at several input scales.
+
+    python benchmarks/run_benchmarks.py                        # run everything, compare with baselines.json
+    python benchmarks/run_benchmarks.py --scales small medium  # quicker run
+    python benchmarks/run_benchmarks.py --only simulate_strategy clean_gap_value
+    python benchmarks/run_benchmarks.py --save-baseline        # store this run as the new baselines
+
+Inputs are synthetic and seeded (race results are copies of data/raw/race_results), so runs
+differ only by code and machine. Every case runs once under tracemalloc for peak memory. Its
+loop count is then scaled until one timed sample takes at least MIN_SAMPLE_SECONDS (as
+timeit.Timer.autorange does), and `repeat` samples are taken; the median per-run time and
+items/s are reported. Cases whose fastest sample is more than `threshold` times slower per
+run (when above TIME_FLOOR_MS), or whose peak memory grew by more than `threshold` (above
+MEMORY_FLOOR_MB), compared with the stored baseline are flagged as regressions; regressions
+and failing cases make the script exit with status 1.
+
+Baselines are machine specific: re-record them (--save-baseline) on the machine you compare on.
+"""
+
+import argparse
+import ast
+import atexit
+import contextlib
+import io
+import json
+import platform
+import shutil
+import statistics
+import sys
+import tempfile
+import time
+import tracemalloc
+from datetime import datetime, timezone
+from pathlib import Path
+import numpy as np
+import pandas as pd
+
+ROOT = Path(__file__).resolve().parents[1]
+DATA_SCRIPTS = ROOT / "data" / "scripts"
+sys.path.insert(0, str(ROOT))
+
+BASELINE_PATH = Path(__file__).parent / "baselines.json"
+BABY_STRATEGIST_PATH = ROOT / "models" / "monaco_simulation" / "baby_strategist_ai.py"
+RACE_RESULTS_DIR = ROOT / "data" / "raw" / "race_results"
+
+# Input size multipliers; each benchmark scales its own base size by these
+SCALES = {'small': 1, 'medium': 5, 'large': 25}
+DEFAULT_THRESHOLD = 1.25
+# Peaks below this are allocator noise, so memory ratios are not compared under it
+MEMORY_FLOOR_MB = 1.0
+# Runs this short are dominated by timer and scheduler noise, so time ratios are not gated under it
+TIME_FLOOR_MS = 5.0
+# Each timed sample loops the case until it takes at least this long
+MIN_SAMPLE_SECONDS = 0.2
+DEFAULT_REPEAT = 5
+
+COMPOUNDS = ['SOFT', 'MEDIUM', 'HARD']
+DRIVERS_PER_SESSION = 20
+LAPS_PER_SESSION = 78
+SAMPLES_PER_TELEMETRY_LAP = 700   # ~4 Hz car data over a Monaco lap
+TELEMETRY_LAP_LENGTH = 3337.0     # metres
+CORNERS_PER_LAP = 19
+
+BENCHMARKS = {}
+
+
+def benchmark(name, unit):
+    """Register setup(scale, rng) -> (run, n_items) under name; run() is what gets timed."""
+    def register(setup):
+        BENCHMARKS[name] = (setup, unit)
+        return setup
+    return register
+
+
+def _data_script(name):
+    """Import a module from data/scripts (they are plain scripts, not a package)."""
+    import importlib
+    if str(DATA_SCRIPTS) not in sys.path:
+        sys.path.insert(0, str(DATA_SCRIPTS))
+    return importlib.import_module(name)
+
+
+def _script_functions(path, names, namespace):
+    """
+    Define only the named functions of a script in namespace, without running the script.
+    baby_strategist_ai.py loads the cluster bundle and runs a stint at import time, so its
+    functions are benchmarked this way with the globals they need supplied in namespace.
+    """
+    tree = ast.parse(Path(path).read_text(), filename=str(path))
+    functions = [node for node in tree.body if isinstance(node, ast.FunctionDef) and node.name in names]
+    missing = set(names) - {node.name for node in functions}
+    if missing:
+        raise ValueError(f"{path} has no function(s) {sorted(missing)}.")
+    exec(compile(ast.Module(body=functions, type_ignores=[]), str(path), 'exec'), namespace)
+    return namespace
+
+
+# --- Synthetic inputs -----------------------------------------------------------
+
+def _timedelta(seconds):
+    """Seconds -> timedelta64[ns], the resolution FastF1 data uses."""
+    return pd.to_timedelta(seconds, unit='s').astype('timedelta64[ns]')
+
+
+def synthetic_laps(n_sessions, rng):
+    """FastF1-style laps (timedelta columns) for n_sessions sessions of 20 drivers x 78 laps."""
+    sessions = []
+    for s in range(n_sessions):
+        driver = np.repeat(np.arange(1, DRIVERS_PER_SESSION + 1), LAPS_PER_SESSION)
+        lap_number = np.tile(np.arange(1, LAPS_PER_SESSION + 1), DRIVERS_PER_SESSION)
+        # One stop per driver: in-lap on pit_lap, out-lap on the next one
+        pit_lap = rng.integers(20, 50, DRIVERS_PER_SESSION).repeat(LAPS_PER_SESSION)
+        stint = np.where(lap_number <= pit_lap, 1, 2)
+        tyre_life = np.where(stint == 1, lap_number, lap_number - pit_lap)
+        in_lap, out_lap = lap_number == pit_lap, lap_number == pit_lap + 1
+        lap_time = 75 + 0.05 * tyre_life + rng.normal(0, 0.4, len(driver)) + (in_lap | out_lap) * 10
+        lap_start = 3600 + np.concatenate([np.r_[0, np.cumsum(times)[:-1]]
+                                           for times in lap_time.reshape(DRIVERS_PER_SESSION, LAPS_PER_SESSION)])
+        sectors = lap_time[:, None] * np.array([0.3, 0.45, 0.25])
+
+        frame = pd.DataFrame({
+            'Driver': [f"D{d:02d}" for d in driver],
+            'DriverNumber': driver.astype(str),
+            'LapNumber': lap_number.astype(float),
+            'Stint': stint.astype(float),
+            'Compound': np.where(stint == 1, 'SOFT', 'MEDIUM'),
+            'TyreLife': tyre_life.astype(float),
+            'LapTime': _timedelta(lap_time),
+            'Sector1Time': _timedelta(sectors[:, 0]),
+            'Sector2Time': _timedelta(sectors[:, 1]),
+            'Sector3Time': _timedelta(sectors[:, 2]),
+            'LapStartTime': _timedelta(lap_start),
+            'Time': _timedelta(lap_start + lap_time),
+            'PitInTime': _timedelta(np.where(in_lap, lap_start + lap_time - 5, np.nan)),
+            'PitOutTime': _timedelta(np.where(out_lap, lap_start + 5, np.nan)),
+        })
+        frame['year'] = 2018 + s // 4
+        frame['round'] = 6
+        frame['session_type'] = ['FP1', 'FP2', 'FP3', 'Q'][s % 4]
+        sessions.append(frame)
+    return pd.concat(sessions, ignore_index=True)
+
+
+def synthetic_weather(laps, rng):
+    """One weather sample per minute of the laps' session time."""
+    start, end = laps['LapStartTime'].min().total_seconds(), laps['Time'].max().total_seconds()
+    seconds = np.arange(start, end + 60, 60)
+    return pd.DataFrame({
+        'Time': _timedelta(seconds),
+        'AirTemp': 25 + rng.normal(0, 0.5, len(seconds)),
+        'TrackTemp': 40 + rng.normal(0, 1.0, len(seconds)),
+        'Humidity': 55 + rng.normal(0, 2.0, len(seconds)),
+        'Pressure': 1010 + rng.normal(0, 0.5, len(seconds)),
+        'Rainfall': rng.random(len(seconds)) < 0.05,
+    })
+
+
+def gap_strings(n, rng):
+    """Gap values as FastF1 timing data sends them: '+1.234', '1L', '' and floats."""
+    gaps = np.round(rng.exponential(8.0, n), 3)
+    kind = rng.random(n)
+    return pd.Series(np.where(kind < 0.6, np.char.add('+', gaps.astype(str)),
+                     np.where(kind < 0.7, '1L', np.where(kind < 0.75, '', gaps.astype(str)))), dtype=object)
+
+
+def synthetic_gaps(laps, rng):
+    """Timing gap samples shortly after every lap start, keyed like FastF1 timing data."""
+    return pd.DataFrame({
+        'Time': laps['LapStartTime'] + _timedelta(rng.uniform(0, 2, len(laps))),
+        'Driver': laps['DriverNumber'].to_numpy(),
+        'Position': rng.integers(1, DRIVERS_PER_SESSION + 1, len(laps)),
+        'GapToLeader': gap_strings(len(laps), rng),
+        'IntervalToPositionAhead': gap_strings(len(laps), rng),
+        'year': laps['year'].to_numpy(),
+        'round': laps['round'].to_numpy(),
+        'session_type': laps['session_type'].to_numpy(),
+    })
+
+
+def synthetic_car_data(n_laps, rng):
+    """Car data over n_laps consecutive laps (Distance keeps increasing), braking before each corner."""
+    n = n_laps * SAMPLES_PER_TELEMETRY_LAP
+    distance = np.linspace(0, n_laps * TELEMETRY_LAP_LENGTH, n)
+    corners = corner_distances(n_laps)
+    to_next_corner = corners[np.minimum(np.searchsorted(corners, distance), len(corners) - 1)] - distance
+    brake = (to_next_corner > 0) & (to_next_corner < 60)
+    speed = np.clip(280 - 180 * np.exp(-np.abs(to_next_corner) / 80) + rng.normal(0, 3, n), 60, 300)
+    return pd.DataFrame({
+        'SessionTime': _timedelta(3600 + np.arange(n) * 0.25),
+        'Distance': distance,
+        'Speed': speed,
+        'RPM': 6000 + 40 * speed,
+        'Throttle': np.where(brake, 0.0, np.clip(speed / 3, 0, 100)),
+        'Brake': brake,
+    })
+
+
+def corner_distances(n_laps):
+    per_lap = np.linspace(150, TELEMETRY_LAP_LENGTH - 150, CORNERS_PER_LAP)
+    return (per_lap[None, :] + TELEMETRY_LAP_LENGTH * np.arange(n_laps)[:, None]).ravel()
+
+
+def synthetic_tire_frame(n, rng, compound_prefix):
+    """Training frame for tire models: TyreLife, weather and one-hot compounds -> LapTime."""
+    compound = rng.choice(COMPOUNDS, n)
+    frame = pd.DataFrame({
+        'TyreLife': rng.integers(1, 40, n).astype(float),
+        'TrackTemp': rng.uniform(30, 50, n),
+        'AirTemp': rng.uniform(18, 30, n),
+        'Pressure': rng.uniform(1005, 1015, n),
+    })
+    for name in COMPOUNDS:
+        frame[f"{compound_prefix}_{name}"] = (compound == name).astype(float)
+    lap_time = (75 + 0.08 * frame['TyreLife'] * (1 + (compound == 'SOFT')) + 0.05 * frame['TrackTemp']
+                + rng.normal(0, 0.3, n))
+    return frame, lap_time.to_numpy()
+
+
+# --- Benchmarks -----------------------------------------------------------------
+
+@benchmark('pre_process_laps', unit='laps')
+def bench_pre_process_laps(scale, rng):
+    pre_process_laps = _data_script('batch_monaco_tyre').pre_process_laps
+    laps = synthetic_laps(scale, rng)
+    weather = synthetic_weather(laps, rng)
+    # pre_process_laps converts columns in place, so every run gets fresh copies
+    return lambda: pre_process_laps(laps.copy(), weather.copy()), len(laps)
+
+
+@benchmark('merge_laps_with_gaps', unit='laps')
+def bench_merge_laps_with_gaps(scale, rng):
+    # The data/scripts version used by the batch pipeline (per-session, per-driver merge_asof)
+    merge_laps_with_gaps = _data_script('batch_pickles').merge_laps_with_gaps
+    laps = synthetic_laps(scale, rng)
+    gaps = synthetic_gaps(laps, rng)
+    return lambda: merge_laps_with_gaps(laps, gaps), len(laps)
+
+
+@benchmark('clean_gap_value', unit='values')
+def bench_clean_gap_value(scale, rng):
+    from models.monaco_simulation.data_utils import clean_gap_value
+    values = gap_strings(20_000 * scale, rng)
+    return lambda: values.apply(clean_gap_value), len(values)
+
+
+@benchmark('clean_gap_column', unit='values')
+def bench_clean_gap_column(scale, rng):
+    from models.monaco_simulation.data_utils import clean_gap_column
+    values = gap_strings(20_000 * scale, rng)
+    return lambda: clean_gap_column(values), len(values)
+
+
+@benchmark('slice_car_data_by_brake+build_brake_zones', unit='samples')
+def bench_brake_zones(scale, rng):
+    from models.monaco_simulation.car_data_utils import slice_car_data_by_brake, build_brake_zones
+    car_data = synthetic_car_data(scale, rng)
+    return lambda: build_brake_zones(car_data, slice_car_data_by_brake(car_data)), len(car_data)
+
+
+@benchmark('get_car_data_around_corner', unit='corners')
+def bench_car_data_around_corner(scale, rng):
+    from models.monaco_simulation.car_data_utils import get_car_data_around_corner
+    car_data = synthetic_car_data(scale, rng)
+    distances = corner_distances(scale)
+    circuit_info = pd.DataFrame({'Number': np.arange(1, len(distances) + 1), 'Distance': distances})
+    return lambda: get_car_data_around_corner(car_data, None, circuit_info), len(circuit_info)
+
+
+@benchmark('predict_laptime', unit='calls')
+def bench_predict_laptime(scale, rng):
+    from sklearn.cluster import KMeans
+    from sklearn.preprocessing import StandardScaler
+    from models.monaco_simulation.tire_model import TirePerformanceModel
+
+    # The clustering and per-cluster models baby_strategist_ai.py loads from the cluster bundle
+    cluster_features = pd.DataFrame({
+        'TyreLife': rng.integers(1, 40, 2000), 'GapToLeader': rng.exponential(10, 2000),
+        'IntervalToPositionAhead': rng.exponential(2, 2000), 'TrackTemp': rng.uniform(30, 50, 2000),
+        'Pressure': rng.uniform(1005, 1015, 2000), 'Rainfall': (rng.random(2000) < 0.1).astype(float),
+    })
+    scaler = StandardScaler().fit(cluster_features)
+    kmeans = KMeans(n_clusters=4, random_state=42, n_init=10).fit(scaler.transform(cluster_features))
+    cluster_models = {}
+    for cluster_id in range(4):
+        frame, lap_time = synthetic_tire_frame(500, rng, 'MappedCompound')
+        frame.insert(4, 'Rainfall', 0.0)
+        cluster_models[cluster_id] = TirePerformanceModel(degree=2)
+        cluster_models[cluster_id].fit(frame, lap_time)
+
+    namespace = _script_functions(BABY_STRATEGIST_PATH, ['map_compound', 'predict_laptime'], {
+        'pd': pd, 'scaler': scaler, 'kmeans': kmeans, 'cluster_models': cluster_models, 'manifest': {'version': 'synthetic'},
+    })
+    predict_laptime = namespace['predict_laptime']
+    calls = 20 * scale
+    tyre_life = rng.integers(1, 40, calls)
+    compounds = rng.choice(COMPOUNDS, calls)
+
+    def run():
+        return [predict_laptime(life, 40.0, 25.0, 1010.0, 0, compound) for life, compound in zip(tyre_life, compounds)]
+    return run, calls
+
+
+def _strategy_model_and_strategies(scale, rng):
+    from models.monaco_simulation.tire_model import TirePerformanceModel
+    from models.monaco_simulation.strategy_generator import generate_stint_sequences
+    frame, lap_time = synthetic_tire_frame(2000, rng, 'Compound')
+    model = TirePerformanceModel(degree=2)
+    with contextlib.redirect_stdout(io.StringIO()):
+        model.fit(frame, lap_time)
+    strategies = generate_stint_sequences(20 + 10 * scale, ['Soft', 'Medium', 'Hard'])
+    return model, strategies
+
+
+@benchmark('simulate_strategy', unit='strategies')
+def bench_simulate_strategy(scale, rng):
+    from models.monaco_simulation.monaco_test_simulator import simulate_strategy
+    model, strategies = _strategy_model_and_strategies(scale, rng)
+    weather = {'TrackTemp': 40.0, 'AirTemp': 25.0, 'Pressure': 1010.0}
+    return lambda: [simulate_strategy(strategy, model, weather) for strategy in strategies], len(strategies)
+
+
+@benchmark('simulate_strategies_batch', unit='strategies')
+def bench_simulate_strategies_batch(scale, rng):
+    from models.monaco_simulation.monaco_test_simulator import simulate_strategies_batch
+    model, strategies = _strategy_model_and_strategies(scale, rng)
+    weather = {'TrackTemp': 40.0, 'AirTemp': 25.0, 'Pressure': 1010.0}
+    return lambda: simulate_strategies_batch(strategies, model, weather), len(strategies)
+
+
+@benchmark('load_and_flatten_all', unit='results')
+def bench_load_and_flatten_all(scale, rng):
+    preprocess_race_results = _data_script('preprocess_race_results')
+    # scale copies of every season file, read through the module's RAW_DATA_DIR setting
+    folder = Path(tempfile.mkdtemp(prefix='bench_race_results_'))
+    atexit.register(shutil.rmtree, folder, True)
+    for copy in range(scale):
+        for path in sorted(RACE_RESULTS_DIR.glob("*.json")):
+            shutil.copy(path, folder / f"{path.stem}_{copy}.json")
+
+    def run():
+        original = preprocess_race_results.RAW_DATA_DIR
+        preprocess_race_results.RAW_DATA_DIR = str(folder)
+        try:
+            return preprocess_race_results.load_and_flatten_all()
+        finally:
+            preprocess_race_results.RAW_DATA_DIR = original
+
+    with contextlib.redirect_stdout(io.StringIO()):
+        n_results = len(run())
+    return run, n_results
+
+
+# --- Runner ---------------------------------------------------------------------
+
+def machine_info():
+    return {
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'processor': platform.processor() or platform.machine(),
+        'numpy': np.__version__,
+        'pandas': pd.__version__,
+    }
+
+
+def _loops_per_sample(run):
+    """Smallest of 1, 2, 5, 10, 20, 50, ... loops of run that take at least MIN_SAMPLE_SECONDS."""
+    loops = 1
+    while True:
+        for factor in (1, 2, 5):
+            number = loops * factor
+            start = time.perf_counter()
+            for _ in range(number):
+                run()
+            if time.perf_counter() - start >= MIN_SAMPLE_SECONDS:
+                return number
+        loops *= 10
+
+
+def measure(run, n_items, repeat):
+    """Peak traced memory of one run, then the per-run wall time of `repeat` untraced auto-ranged samples."""
+    with contextlib.redirect_stdout(io.StringIO()):
+        tracemalloc.start()
+        try:
+            run()
+            _, peak = tracemalloc.get_traced_memory()
+        finally:
+            tracemalloc.stop()
+
+        loops = _loops_per_sample(run)
+        times = []
+        for _ in range(repeat):
+            start = time.perf_counter()
+            for _ in range(loops):
+                run()
+            times.append((time.perf_counter() - start) / loops)
+
+    median = statistics.median(times)
+    return {
+        'items': n_items,
+        'loops': loops,
+        'median_ms': median * 1000,
+        'min_ms': min(times) * 1000,
+        'items_per_s': n_items / median if median > 0 else float('inf'),
+        'peak_mb': peak / (1024 * 1024),
+    }
+
+
+def run_benchmarks(names=None, scales=tuple(SCALES), repeat=DEFAULT_REPEAT, seed=0):
+    """Run benchmarks x scales. Returns {"name@scale": result, {'skipped': reason} or {'error': message}}."""
+    names = list(BENCHMARKS) if names is None else names
+    unknown = [name for name in names if name not in BENCHMARKS]
+    if unknown:
+        raise ValueError(f"Unknown benchmark(s) {unknown}. Available: {list(BENCHMARKS)}")
+    bad_scales = [scale for scale in scales if scale not in SCALES]
+    if bad_scales:
+        raise ValueError(f"Unknown scale(s) {bad_scales}. Available: {list(SCALES)}")
+
+    results = {}
+    for name in names:
+        setup, unit = BENCHMARKS[name]
+        for scale in scales:
+            key = f"{name}@{scale}"
+            try:
+                with contextlib.redirect_stdout(io.StringIO()):
+                    run, n_items = setup(SCALES[scale], np.random.default_rng(seed))
+            except ImportError as e:
+                # e.g. fastf1 missing: report and carry on with the other benchmarks
+                results[key] = {'skipped': f"{type(e).__name__}: {e}"}
+                print(f"⏭️  {key}: skipped ({e})")
+                continue
+            try:
+                results[key] = dict(measure(run, n_items, repeat), unit=unit)
+            except Exception as e:
+                results[key] = {'error': f"{type(e).__name__}: {e}"}
+                print(f"❌ {key}: {results[key]['error']}")
+                continue
+            r = results[key]
+            print(f"⏱️  {key}: {r['median_ms']:.1f} ms, {r['items_per_s']:,.0f} {unit}/s, peak {r['peak_mb']:.1f} MB")
+    return results
+
+
+def compare(results, baselines, threshold=DEFAULT_THRESHOLD):
+    """Regression report: one row per case with time and peak memory ratios against the baseline."""
+    rows = []
+    for key, result in results.items():
+        name, scale = key.rsplit('@', 1)
+        row = {'benchmark': name, 'scale': scale}
+        if 'skipped' in result or 'error' in result:
+            rows.append(dict(row, status='skipped' if 'skipped' in result else 'error'))
+            continue
+
+        row.update(items=result['items'], median_ms=result['median_ms'], items_per_s=result['items_per_s'],
+                   peak_mb=result['peak_mb'])
+        base = baselines.get(key)
+        if base is None:
+            rows.append(dict(row, status='new'))
+            continue
+
+        # The fastest sample is the least disturbed by other load on the machine
+        time_ratio = result['min_ms'] / base['min_ms'] if base['min_ms'] > 0 else np.nan
+        mem_ratio = result['peak_mb'] / base['peak_mb'] if base['peak_mb'] > 0 else np.nan
+        timed = max(result['min_ms'], base['min_ms']) >= TIME_FLOOR_MS
+        memory_grew = result['peak_mb'] > MEMORY_FLOOR_MB and mem_ratio > threshold
+        if (timed and time_ratio > threshold) or memory_grew:
+            status = 'REGRESSION'
+        elif timed and time_ratio < 1 / threshold:
+            status = 'faster'
+        else:
+            status = 'ok'
+        rows.append(dict(row, baseline_ms=base['median_ms'], time_ratio=time_ratio,
+                         baseline_peak_mb=base['peak_mb'], mem_ratio=mem_ratio, status=status))
+    return pd.DataFrame(rows)
+
+
+def load_baselines(path=BASELINE_PATH):
+    path = Path(path)
+    if not path.exists():
+        return {}
+    with open(path) as f:
+        return json.load(f).get('results', {})
+
+
+def save_baselines(results, path=BASELINE_PATH):
+    """Merge results into the baseline file (cases not run this time keep their old baseline)."""
+    path = Path(path)
+    stored = load_baselines(path)
+    stored.update({key: result for key, result in results.items() if 'median_ms' in result})
+    with open(path, 'w') as f:
+        json.dump({
+            'created': datetime.now(timezone.utc).isoformat(),
+            'machine': machine_info(),
+            'results': dict(sorted(stored.items())),
+        }, f, indent=4)
+    print(f"✅ Saved {len(stored)} baselines to {path}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark the pipeline's hot paths")
+    parser.add_argument('--only', nargs='+', choices=list(BENCHMARKS), metavar='NAME',
+                        help=f"benchmarks to run (default: all): {', '.join(BENCHMARKS)}")
+    parser.add_argument('--scales', nargs='+', default=list(SCALES), choices=list(SCALES))
+    parser.add_argument('--repeat', type=int, default=DEFAULT_REPEAT, help="timed samples per case")
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--baseline', default=str(BASELINE_PATH), help="baseline JSON file")
+    parser.add_argument('--threshold', type=float, default=DEFAULT_THRESHOLD,
+                        help="slowdown or memory growth ratio that counts as a regression")
+    parser.add_argument('--save-baseline', action='store_true', help="store this run as the baselines")
+    parser.add_argument('--output', help="also write the report to this .csv path")
+    args = parser.parse_args(argv)
+
+    results = run_benchmarks(args.only, args.scales, repeat=args.repeat, seed=args.seed)
+    report = compare(results, load_baselines(args.baseline), threshold=args.threshold)
+    with pd.option_context('display.width', 200, 'display.max_columns', None, 'display.float_format', '{:.3g}'.format):
+        print(report.to_string(index=False))
+    if args.output:
+        report.to_csv(args.output, index=False)
+
+    if args.save_baseline:
+        save_baselines(results, args.baseline)
+        return 0
+    return 1 if report['status'].isin(['REGRESSION', 'error']).any() else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
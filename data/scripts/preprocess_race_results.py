@@ -20,7 +20,8 @@ def flatten_race_result(result, race_info):
         'constructor': constructor['name'],
         'grid': int(result.get('grid', 0)),
         'position': result.get('position'),
-        'position_order': int(result.get('positionOrder', -1)),
+        # Ergast has no positionOrder; its position is already the classification order incl. retirements
+        'position_order': int(result.get('positionOrder', result.get('position', -1))),
         'points': float(result.get('points', 0.0)),
         'status': result.get('status'),
         'fastest_lap_time': fastest_lap.get('Time', {}).get('time', None),
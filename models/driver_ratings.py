@@ -0,0 +1,93 @@
+# models/driver_ratings.py
+
+from bisect import bisect_left, bisect_right
+import numpy as np
+import pandas as pd
+from models.feature_engineering import RACE_RESULTS_PATH, RACE_COLS
+
+INITIAL_RATING = 1500.0
+K_FACTOR = 32.0
+ELO_SCALE = 400.0
+
+
+class DriverRatings:
+    """
+    Multi-driver Elo ratings from race finishing order.
+
+    Every race is treated as all pairwise duels between its drivers: each driver's rating moves by
+    k / (n - 1) × Σ (actual − expected) over the other n − 1 drivers, computed as one n × n
+    NumPy operation. After every round a copy of the rating vector is stored, so the ratings
+    as of any past round are a bisect over the round keys. Appending a round costs O(n²) for
+    the update plus one copy of the rating vector; history is never replayed.
+    """
+
+    def __init__(self, k=K_FACTOR, initial=INITIAL_RATING, scale=ELO_SCALE):
+        self.k = k
+        self.initial = initial
+        self.scale = scale
+        self.driver_index = {}
+        self.ratings = np.empty(0)
+        self.rounds = []      # sorted (season, round) keys
+        self.snapshots = []   # rating vector after each round
+
+    @classmethod
+    def from_results(cls, results, position_col='position_order', **kwargs):
+        ratings = cls(**kwargs)
+        for (season, rnd), race in results.sort_values(RACE_COLS).groupby(RACE_COLS, sort=True):
+            ratings.update_round(season, rnd, race['driver_id'], race[position_col])
+        return ratings
+
+    def _indices(self, drivers):
+        new = [driver for driver in dict.fromkeys(drivers) if driver not in self.driver_index]
+        if new:
+            for driver in new:
+                self.driver_index[driver] = len(self.driver_index)
+            self.ratings = np.concatenate([self.ratings, np.full(len(new), self.initial)])
+        return np.array([self.driver_index[driver] for driver in drivers])
+
+    def expected_scores(self, ratings):
+        """n × n matrix of P(i finishes ahead of j) under the Elo logistic curve."""
+        return 1.0 / (1.0 + 10.0 ** ((ratings[None, :] - ratings[:, None]) / self.scale))
+
+    def update_round(self, season, rnd, drivers, positions):
+        """Apply one race result (lower position = better) and store the rating snapshot."""
+        key = (season, rnd)
+        if self.rounds and key <= self.rounds[-1]:
+            raise ValueError(f"Round {key} is not after the last rated round {self.rounds[-1]}.")
+
+        idx = self._indices(list(drivers))
+        positions = np.asarray(positions, dtype=np.float64)
+        if len(idx) > 1:
+            expected = self.expected_scores(self.ratings[idx])
+            # 1 for beating j, 0.5 for a tie, 0 for losing; the diagonal cancels out (0.5 - 0.5)
+            actual = (positions[:, None] < positions[None, :]) + 0.5 * (positions[:, None] == positions[None, :])
+            self.ratings[idx] += self.k / (len(idx) - 1) * (actual - expected).sum(axis=1)
+
+        self.rounds.append(key)
+        self.snapshots.append(self.ratings.copy())
+
+    def as_of(self, season, rnd, include_round=True):
+        """
+        Ratings of every known driver after (season, rnd), or just before it with
+        include_round=False, which is what a backtest predicting that round should use.
+        """
+        find = bisect_right if include_round else bisect_left
+        position = find(self.rounds, (season, rnd))
+        if position == 0:
+            return pd.Series(dtype=float)
+        snapshot = self.snapshots[position - 1]
+        drivers = list(self.driver_index)[:len(snapshot)]
+        return pd.Series(snapshot, index=drivers).sort_values(ascending=False)
+
+    def rating(self, driver, season, rnd, include_round=True):
+        ratings = self.as_of(season, rnd, include_round)
+        return float(ratings.get(driver, self.initial))
+
+    def current(self):
+        return pd.Series(self.ratings, index=list(self.driver_index)).sort_values(ascending=False)
+
+
+if __name__ == "__main__":
+    results = pd.read_csv(RACE_RESULTS_PATH)
+    ratings = DriverRatings.from_results(results)
+    print(ratings.current().head(10).round(1).to_string())
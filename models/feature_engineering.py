@@ -0,0 +1,302 @@
+# models/feature_engineering.py
+
+import json
+import shutil
+from collections import deque
+from pathlib import Path
+import numpy as np
+import pandas as pd
+from models.monaco_simulation.data_utils import (WEATHER_FEATURES, GAP_FEATURES, SESSION_COLS, atomic_directory,
+                                                 clean_gap_column, content_hash)
+
+FEATURE_CACHE_FOLDER = Path(__file__).parent / "feature_cache"
+# Bumped whenever build_features changes its output, so old cache entries are not reused
+FEATURE_VERSION = 2
+
+META_COLS = SESSION_COLS + ['Driver', 'Stint', 'LapNumber']
+
+# Raw columns each feature group is built from (rows missing any of them are dropped)
+GROUP_INPUTS = {
+    'tyre': ['TyreLife'],
+    'weather': WEATHER_FEATURES,
+    'gaps': GAP_FEATURES,
+    'fuel': ['LapNumber'],
+    'stint': ['Driver', 'Stint'],
+    'compounds': ['Compound'],
+}
+
+# Groups computed from neighbouring laps rather than the lap's own columns
+SEQUENCE_GROUPS = ('fuel', 'stint')
+
+# Standard feature sets; 'base' and 'traffic' match train_tire_model.py and train_traffic_model.py
+FEATURE_SETS = {
+    'base': ['tyre', 'weather', 'compounds'],
+    'traffic': ['tyre', 'weather', 'gaps', 'compounds'],
+    'full': ['tyre', 'weather', 'gaps', 'fuel', 'stint', 'compounds'],
+}
+
+
+def _session_keys(laps):
+    return [col for col in SESSION_COLS if col in laps.columns]
+
+
+def fuel_load_proxy(laps):
+    """Share of the session's laps still to run, 1.0 on lap 1 and falling towards 0 at the end."""
+    lap_number = laps['LapNumber'].astype(float)
+    keys = _session_keys(laps)
+    max_lap = lap_number.groupby([laps[col] for col in keys]).transform('max') if keys else lap_number.max()
+    return (max_lap - lap_number + 1) / max_lap
+
+
+def stint_lap(laps):
+    """1-based position of each lap within its driver's stint (in lap order)."""
+    keys = _session_keys(laps) + ['Driver', 'Stint']
+    order = laps.sort_values('LapNumber') if 'LapNumber' in laps.columns else laps
+    return order.groupby(keys, sort=False).cumcount().add(1).reindex(laps.index)
+
+
+def _build_group(group, laps):
+    if group == 'tyre':
+        return laps[['TyreLife']]
+    if group == 'weather':
+        return laps[WEATHER_FEATURES]
+    if group == 'gaps':
+        return pd.DataFrame({col: clean_gap_column(laps[col]) for col in GAP_FEATURES}, index=laps.index)
+    if group == 'fuel':
+        return pd.DataFrame({'FuelLoad': fuel_load_proxy(laps)}, index=laps.index)
+    if group == 'stint':
+        return pd.DataFrame({'StintLap': stint_lap(laps)}, index=laps.index)
+    if group == 'compounds':
+        return pd.get_dummies(laps['Compound'], prefix='Compound')
+    raise ValueError(f"Unknown feature group '{group}'.")
+
+
+def build_features(laps, feature_set='base', target='LapTime'):
+    """
+    Build one feature set without caching.
+    Returns (X, y, columns, meta): C-contiguous float64 X, float64 y, column names and the
+    META_COLS present in laps for each row.
+    """
+    if feature_set not in FEATURE_SETS:
+        raise ValueError(f"Unknown feature set '{feature_set}'. Choose from {list(FEATURE_SETS)}.")
+    groups = FEATURE_SETS[feature_set]
+
+    required = [target] + [col for group in groups for col in GROUP_INPUTS[group]]
+    laps = laps.reset_index(drop=True)
+    # Fuel load and stint position depend on the other laps of the session/stint, so they are
+    # derived before laps without a time (in/out laps, lap 1, ...) are dropped
+    derived = {group: _build_group(group, laps) for group in groups if group in SEQUENCE_GROUPS}
+    laps = laps.dropna(subset=required)
+    frame = pd.concat([derived[group].loc[laps.index] if group in derived else _build_group(group, laps)
+                       for group in groups], axis=1)
+
+    # Gap strings that cannot be parsed come out as NaN and are dropped as well
+    valid = frame.notna().all(axis=1).to_numpy()
+    frame, laps = frame[valid], laps[valid]
+    X = np.ascontiguousarray(frame.to_numpy(dtype=np.float64))
+    y = laps[target].to_numpy(dtype=np.float64)
+    meta = laps[[col for col in META_COLS if col in laps.columns]].reset_index(drop=True)
+    return X, y, list(frame.columns), meta
+
+
+def as_frames(X, y, columns, meta, target='LapTime'):
+    """build_features output as (X DataFrame, y Series, meta), the form walk_forward_backtest takes."""
+    return pd.DataFrame(X, columns=columns, copy=False), pd.Series(y, name=target), meta
+
+
+class FeatureStore:
+    """
+    Disk cache of feature sets, keyed by dataset hash and feature-set name.
+
+    Each entry is <cache_dir>/<dataset hash>/<feature set>_<target>_v<FEATURE_VERSION>/ with X.npy, y.npy, meta.pkl and
+    columns.json. Arrays are loaded memory-mapped, so training, backtesting and simulation
+    can all read the same features without rebuilding them or copying them per process.
+    Only the columns a feature set is built from are hashed, unless dataset_version is given.
+    """
+
+    def __init__(self, cache_dir=FEATURE_CACHE_FOLDER, mmap=True):
+        self.cache_dir = Path(cache_dir)
+        self.mmap = mmap
+        self._memory = {}
+        self.hits = 0
+        self.misses = 0
+
+    def _entry_path(self, version, feature_set):
+        return self.cache_dir / version / feature_set
+
+    def get(self, laps, feature_set='base', target='LapTime', dataset_version=None):
+        """Return (X, y, columns, meta) for laps, building and caching it on first use."""
+        if feature_set not in FEATURE_SETS:
+            raise ValueError(f"Unknown feature set '{feature_set}'. Choose from {list(FEATURE_SETS)}.")
+        if dataset_version is None:
+            inputs = [target] + META_COLS + [col for group in FEATURE_SETS[feature_set] for col in GROUP_INPUTS[group]]
+            dataset_version = content_hash(laps, inputs)
+
+        key = (dataset_version, feature_set, target)
+        if key in self._memory:
+            self.hits += 1
+            return self._memory[key]
+
+        path = self._entry_path(dataset_version, f"{feature_set}_{target}_v{FEATURE_VERSION}")
+        if path.exists():
+            self.hits += 1
+            features = self._load(path)
+        else:
+            self.misses += 1
+            features = build_features(laps, feature_set, target)
+            self._save(path, *features)
+
+        self._memory[key] = features
+        return features
+
+    def frames(self, laps, feature_set='base', target='LapTime', dataset_version=None):
+        """Same features as (X DataFrame, y Series, meta), the form walk_forward_backtest takes."""
+        return as_frames(*self.get(laps, feature_set, target, dataset_version), target=target)
+
+    def _save(self, path, X, y, columns, meta):
+        # exist_ok: another process may write the same entry first
+        with atomic_directory(path, exist_ok=True) as staging:
+            np.save(staging / "X.npy", X)
+            np.save(staging / "y.npy", y)
+            meta.to_pickle(staging / "meta.pkl")
+            with open(staging / "columns.json", 'w') as f:
+                json.dump(columns, f)
+
+    def _load(self, path):
+        mode = 'r' if self.mmap else None
+        with open(path / "columns.json") as f:
+            columns = json.load(f)
+        return (np.load(path / "X.npy", mmap_mode=mode), np.load(path / "y.npy", mmap_mode=mode),
+                columns, pd.read_pickle(path / "meta.pkl"))
+
+    def clear(self, dataset_version=None):
+        """Remove cached entries (all, or those of one dataset version) from memory and disk."""
+        self._memory = {key: value for key, value in self._memory.items()
+                        if dataset_version is not None and key[0] != dataset_version}
+        target = self.cache_dir if dataset_version is None else self.cache_dir / dataset_version
+        shutil.rmtree(target, ignore_errors=True)
+
+
+# --- Race result form features ------------------------------------------------
+
+RACE_RESULTS_PATH = Path(__file__).parents[1] / "data" / "processed" / "race_results_clean.csv"
+RACE_COLS = ['season', 'round']
+FORM_WINDOW = 5
+FORM_METRICS = ['finish', 'points', 'dnf', 'grid_delta']
+# Classified finishers; any other status (Collision, Engine, Disqualified, ...) counts as a DNF
+CLASSIFIED_STATUS = r'^(?:Finished|\+\d+ Laps?)$'
+
+
+def prepare_race_results(results):
+    """Sort by race and add the per-race form metrics (finish, points, dnf, grid_delta)."""
+    results = results.sort_values(RACE_COLS + ['position_order'], kind='stable').reset_index(drop=True)
+    field_size = results.groupby(RACE_COLS)['driver_id'].transform('size')
+
+    results['finish'] = results['position_order'].astype(float)
+    results['dnf'] = (~results['status'].astype(str).str.match(CLASSIFIED_STATUS)).astype(float)
+    # Grid 0 is a pit-lane start, i.e. behind the whole field
+    grid = results['grid'].where(results['grid'] > 0, field_size).astype(float)
+    results['grid_delta'] = grid - results['finish']
+    results['race_index'] = results.groupby(RACE_COLS, sort=True).ngroup()
+    return results
+
+
+def _constructor_races(results):
+    """One row per (race, constructor): mean finish/dnf/grid delta of its cars, summed points."""
+    per_race = results.groupby(['race_index', 'constructor'], sort=True).agg(
+        finish=('finish', 'mean'), points=('points', 'sum'), dnf=('dnf', 'mean'), grid_delta=('grid_delta', 'mean'))
+    return per_race.reset_index()
+
+
+def _prior_rolling_mean(frame, key, window):
+    """
+    Mean of each metric over the entity's previous `window` rows, excluding the current row.
+    frame must be sorted by race; shifting by one inside each entity is what rules out lookahead.
+    """
+    grouped = frame.groupby(key, sort=False)
+    previous = grouped[FORM_METRICS].shift(1)
+    rolled = previous.groupby(frame[key], sort=False).rolling(window, min_periods=1).mean()
+    rolled = rolled.reset_index(level=0, drop=True).reindex(frame.index)
+    rolled['races'] = grouped.cumcount().clip(upper=window)
+    return rolled
+
+
+def rolling_form(results, window=FORM_WINDOW):
+    """
+    Rolling driver and constructor form for every row of race_results_clean.csv.
+
+    For each driver result in race r, driver_form_* and constructor_form_* average the
+    last `window` races strictly before r (finish position, points, DNF rate and grid-to-finish
+    delta), so a race's own result never leaks into its features. The first race of an
+    entity has NaN form and *_races = 0.
+    """
+    results = prepare_race_results(results)
+
+    driver = _prior_rolling_mean(results, 'driver_id', window)
+    driver.columns = [f'driver_form_{col}' for col in driver.columns]
+
+    constructors = _constructor_races(results)
+    constructor = _prior_rolling_mean(constructors, 'constructor', window)
+    constructor.columns = [f'constructor_form_{col}' for col in constructor.columns]
+    constructor = pd.concat([constructors[['race_index', 'constructor']], constructor], axis=1)
+
+    features = pd.concat([results, driver], axis=1)
+    return features.merge(constructor, on=['race_index', 'constructor'], how='left').drop(columns='race_index')
+
+
+class RollingFormState:
+    """
+    Incremental version of rolling_form: keeps the last `window` races of every driver and
+    constructor, so a new race costs O(entries × window) instead of recomputing all seasons.
+    append_race gives the same feature values rolling_form would for that race.
+    """
+
+    def __init__(self, window=FORM_WINDOW):
+        self.window = window
+        self.history = {'driver': {}, 'constructor': {}}
+        self.last_race = None
+
+    @classmethod
+    def from_results(cls, results, window=FORM_WINDOW):
+        state = cls(window)
+        results = prepare_race_results(results)
+        for _, race in results.groupby('race_index', sort=True):
+            state._update(race)
+        return state
+
+    def _form(self, kind, key):
+        past = self.history[kind].get(key)
+        if not past:
+            return [np.nan] * len(FORM_METRICS) + [0]
+        values = np.array(past, dtype=np.float64)
+        observed = ~np.isnan(values)
+        sums = np.where(observed, values, 0.0).sum(axis=0)
+        counts = observed.sum(axis=0)
+        means = np.divide(sums, counts, out=np.full(len(FORM_METRICS), np.nan), where=counts > 0)
+        return list(means) + [len(past)]
+
+    def _update(self, race):
+        for _, row in race.iterrows():
+            self.history['driver'].setdefault(row['driver_id'], deque(maxlen=self.window)).append(
+                tuple(row[FORM_METRICS]))
+        for _, row in _constructor_races(race).iterrows():
+            self.history['constructor'].setdefault(row['constructor'], deque(maxlen=self.window)).append(
+                tuple(row[FORM_METRICS]))
+        self.last_race = tuple(race[RACE_COLS].iloc[0])
+
+    def append_race(self, race_results):
+        """Form features for one new race (computed before it), then absorb its results."""
+        race = prepare_race_results(race_results)
+        if race[RACE_COLS].drop_duplicates().shape[0] != 1:
+            raise ValueError("append_race expects the results of exactly one race.")
+        if self.last_race is not None and tuple(race[RACE_COLS].iloc[0]) <= self.last_race:
+            raise ValueError(f"Race {tuple(race[RACE_COLS].iloc[0])} is not after the last absorbed race {self.last_race}.")
+
+        names = FORM_METRICS + ['races']
+        driver = pd.DataFrame([self._form('driver', key) for key in race['driver_id']],
+                              columns=[f'driver_form_{col}' for col in names], index=race.index)
+        constructor = pd.DataFrame([self._form('constructor', key) for key in race['constructor']],
+                                   columns=[f'constructor_form_{col}' for col in names], index=race.index)
+
+        self._update(race)
+        return pd.concat([race.drop(columns='race_index'), driver, constructor], axis=1)
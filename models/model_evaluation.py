@@ -0,0 +1,193 @@
+# models/model_evaluation.py
+
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+import numpy as np
+import pandas as pd
+from models.monaco_simulation.tire_model import TirePerformanceModel
+from models.feature_engineering import FeatureStore, as_frames, build_features
+from models.monaco_simulation.data_utils import SESSION_COLS, WEATHER_FEATURES, compound_of_column
+from models.monaco_simulation.monaco_test_simulator import simulate_strategies_batch
+
+LAPS_PATH = "/Users/nooralindeflaten/f1_ML_predictor/data/processed/laps_with_weather_monaco.pkl"
+
+# Laps grouped like this are ranked against each other for stint pace ranking accuracy
+RANKING_COLS = ['Driver', 'Stint']
+# Sessions where drivers' whole-race strategies are ranked
+RACE_SESSIONS = ['R']
+
+
+def build_feature_matrix(laps, feature_set='base', target='LapTime'):
+    """
+    Uncached build_features(laps, feature_set) as (X, y, meta): float feature frame, target
+    and the session/driver/stint columns of each row.
+    """
+    return as_frames(*build_features(laps, feature_set, target), target=target)
+
+
+def _order_agreement(actual, predicted):
+    """Share of pairs ordered the same way by predicted as by actual (ties in actual are skipped)."""
+    actual = np.asarray(actual, dtype=float)
+    predicted = np.asarray(predicted, dtype=float)
+    if len(actual) < 2:
+        return np.nan
+    upper = np.triu_indices(len(actual), k=1)
+    actual_order = np.sign(actual[:, None] - actual[None, :])[upper]
+    predicted_order = np.sign(predicted[:, None] - predicted[None, :])[upper]
+    compared = actual_order != 0
+    return float((actual_order[compared] == predicted_order[compared]).mean()) if compared.any() else np.nan
+
+
+def stint_pace_ranking_accuracy(meta, y_true, y_pred, group_cols=RANKING_COLS):
+    """
+    Share of pairs of driver stints within a session whose order by mean lap time
+    is the same in the predictions as in reality. This ranks stint pace, not whole strategies
+    (see strategy_ranking_accuracy).
+    """
+    group_cols = [col for col in group_cols if col in meta.columns]
+    if not group_cols:
+        return np.nan
+
+    frame = meta.assign(actual=np.asarray(y_true), predicted=np.asarray(y_pred))
+    means = frame.groupby(group_cols)[['actual', 'predicted']].mean()
+    return _order_agreement(means['actual'], means['predicted'])
+
+
+def strategy_ranking_accuracy(meta, y_true, compounds, model, weather_inputs, pit_loss=20):
+    """
+    Share of pairs of drivers in one race whose order by the simulated total time of their
+    real strategy (their stint plan, run through simulate_strategies_batch) is the same as
+    their order by actual total time.
+
+    meta: Driver and Stint of each lap; compounds: compound name of each lap
+    Only drivers with the most recorded laps in the race are compared, so every total
+    covers the same distance.
+    """
+    if not {'Driver', 'Stint'} <= set(meta.columns):
+        return np.nan
+    frame = meta[['Driver', 'Stint']].assign(actual=np.asarray(y_true, dtype=float), compound=np.asarray(compounds))
+    laps_per_driver = frame.groupby('Driver').size()
+    frame = frame[frame['Driver'].isin(laps_per_driver.index[laps_per_driver == laps_per_driver.max()])]
+
+    stints = frame.groupby(['Driver', 'Stint'], sort=True).agg(compound=('compound', 'first'), laps=('actual', 'size'))
+    strategies = [list(zip(plan['compound'], plan['laps'].astype(int)))
+                  for _, plan in stints.groupby(level='Driver', sort=True)]
+    if len(strategies) < 2:
+        return np.nan
+
+    simulated = simulate_strategies_batch(strategies, model, weather_inputs, pit_loss=pit_loss).sort_index()
+    actual = frame.groupby('Driver', sort=True)['actual'].sum()
+    return _order_agreement(actual, simulated['simulated_time'])
+
+
+def _run_fold(test_year, feature_names, X_train, y_train, X_test, y_test, meta_test, degree):
+    """Fit on earlier seasons, evaluate every session of test_year. Runs in a worker process."""
+    start = time.perf_counter()
+
+    model = TirePerformanceModel(degree=degree)
+    model.fit(pd.DataFrame(X_train, columns=feature_names), y_train)
+    predicted = model.predict_array(X_test)
+
+    # Compound of each test lap and the weather columns, for simulating the races' strategies
+    compound_cols = [j for j, col in enumerate(feature_names) if compound_of_column(col) is not None]
+    lap_compounds = np.array([compound_of_column(feature_names[j]) for j in compound_cols])
+    lap_compounds = lap_compounds[X_test[:, compound_cols].argmax(axis=1)] if compound_cols else None
+    weather_cols = {col: feature_names.index(col) for col in WEATHER_FEATURES if col in feature_names}
+
+    sessions = []
+    session_cols = [col for col in SESSION_COLS if col in meta_test.columns]
+    for key, idx in meta_test.groupby(session_cols).indices.items():
+        session = dict(zip(session_cols, key if isinstance(key, tuple) else (key,)))
+        errors = predicted[idx] - y_test[idx]
+        strategy_accuracy = np.nan
+        if lap_compounds is not None and session.get('session_type') in RACE_SESSIONS:
+            weather = {col: float(X_test[idx, j].mean()) for col, j in weather_cols.items()}
+            strategy_accuracy = strategy_ranking_accuracy(meta_test.iloc[idx], y_test[idx], lap_compounds[idx],
+                                                          model, weather)
+        sessions.append({
+            **session,
+            'test_year': test_year,
+            'laps': len(idx),
+            'mae': float(np.abs(errors).mean()),
+            'rmse': float(np.sqrt((errors ** 2).mean())),
+            'bias': float(errors.mean()),
+            'stint_pace_ranking_accuracy': stint_pace_ranking_accuracy(meta_test.iloc[idx], y_test[idx], predicted[idx]),
+            'strategy_ranking_accuracy': strategy_accuracy,
+        })
+
+    fold = {
+        'test_year': test_year,
+        'train_laps': len(y_train),
+        'test_laps': len(y_test),
+        'mae': float(np.abs(predicted - y_test).mean()),
+        'seconds': time.perf_counter() - start,
+    }
+    return fold, sessions
+
+
+def walk_forward_backtest(laps, seasons=None, min_train_seasons=1, degree=2, feature_set='base',
+                          n_workers=None, features=None):
+    """
+    Walk-forward backtest of the tire model: for each season Y, train on seasons before Y
+    and evaluate on every circuit and session of season Y. Folds run in a process pool.
+
+    The feature matrix is built once (or passed in as `features` = (X, y, meta)) and sliced
+    per fold, so folds never rebuild it.
+
+    Returns a dict of DataFrames:
+        sessions: MAE/RMSE/bias per lap and stint pace ranking accuracy for every evaluated session,
+                  plus strategy ranking accuracy for races (NaN for other sessions)
+        folds: one row per test season with train/test size, MAE and wall-clock seconds
+        overall: lap-weighted MAE and mean stint pace / strategy ranking accuracy across all sessions
+    """
+    X, y, meta = features if features is not None else build_feature_matrix(laps, feature_set)
+    years = meta['year'].to_numpy()
+    seasons = sorted(np.unique(years)) if seasons is None else sorted(seasons)
+
+    X_values = X.to_numpy(dtype=float)
+    y_values = y.to_numpy(dtype=float)
+    feature_names = list(X.columns)
+
+    folds = []
+    for test_year in seasons[min_train_seasons:]:
+        train = years < test_year
+        test = years == test_year
+        if not train.any() or not test.any():
+            continue
+        folds.append((test_year, feature_names, X_values[train], y_values[train], X_values[test],
+                      y_values[test], meta[test].reset_index(drop=True), degree))
+
+    start = time.perf_counter()
+    n_workers = n_workers or os.cpu_count() or 1
+    if n_workers == 1 or len(folds) <= 1:
+        outputs = [_run_fold(*fold) for fold in folds]
+    else:
+        with ProcessPoolExecutor(max_workers=min(n_workers, len(folds))) as pool:
+            outputs = list(pool.map(_run_fold, *zip(*folds)))
+    wall_seconds = time.perf_counter() - start
+
+    fold_report = pd.DataFrame([fold for fold, _ in outputs])
+    session_report = pd.DataFrame([row for _, rows in outputs for row in rows])
+
+    overall = pd.DataFrame([{
+        'folds': len(fold_report),
+        'sessions': len(session_report),
+        'mae': float(np.average(session_report['mae'], weights=session_report['laps'])) if len(session_report) else np.nan,
+        'stint_pace_ranking_accuracy': (float(session_report['stint_pace_ranking_accuracy'].mean())
+                                        if len(session_report) else np.nan),
+        'strategy_ranking_accuracy': (float(session_report['strategy_ranking_accuracy'].mean())
+                                      if len(session_report) else np.nan),
+        'wall_seconds': wall_seconds,
+    }])
+
+    return {'sessions': session_report, 'folds': fold_report, 'overall': overall}
+
+
+if __name__ == "__main__":
+    laps = pd.read_pickle(LAPS_PATH)
+    # Features come from the shared cache, so repeated backtests skip the rebuild
+    report = walk_forward_backtest(laps, features=FeatureStore().frames(laps, 'base'))
+    print(report['folds'].to_string(index=False))
+    print(report['sessions'].to_string(index=False))
+    print(report['overall'].to_string(index=False))
@@ -1,48 +1,17 @@
 # baby_strategist_simulation.py
 
 import pandas as pd
-import joblib
-from pathlib import Path
-from sklearn.preprocessing import StandardScaler
-from sklearn.cluster import KMeans
+from .train_cluster_tire_models import load_cluster_bundle
 import fastf1
 # Enable cache for fastf1
 fastf1.Cache.enable_cache('/Users/nooralindeflaten/f1_ML_predictor/data/cache')  # Enable cache for faster data loading
-# 📂 Load paths
-LAPS_PATH = Path("/Users/nooralindeflaten/f1_ML_predictor/data/processed/monaco_and_test/laps_with_weather_gaps_monaco.pkl")
-MODELS_FOLDER = Path("/Users/nooralindeflaten/f1_ML_predictor/models/monaco_simulation/cluster_tire_models/")
-
-# 📚 Load Monaco laps
-laps = pd.read_pickle(LAPS_PATH)
-
-# ✅ Clean GapToLeader
-def clean_gap_value(val):
-    if isinstance(val, str):
-        if 'L' in val:
-            return 90.0
-        val = val.replace('+', '')
-    try:
-        return float(val)
-    except:
-        return None
-
-laps['GapToLeader'] = laps['GapToLeader'].apply(clean_gap_value)
-laps['IntervalToPositionAhead'] = laps['IntervalToPositionAhead'].apply(clean_gap_value)
-
-# 🛞 Clustering Setup
-features_for_clustering = laps[['TyreLife', 'GapToLeader', 'IntervalToPositionAhead', 'TrackTemp', 'Pressure', 'Rainfall']].fillna(0)
-scaler = StandardScaler()
-X_scaled = scaler.fit_transform(features_for_clustering)
-kmeans = KMeans(n_clusters=4, random_state=42)
-laps['EnhancedCluster'] = kmeans.fit_predict(X_scaled)
-
-# 🛞 Load cluster tire models
-cluster_models = {}
-for cluster_id in sorted(laps['EnhancedCluster'].unique()):
-    model_path = MODELS_FOLDER / f"tire_model_cluster{cluster_id}.pkl"
-    if model_path.exists():
-        cluster_models[cluster_id] = joblib.load(model_path)
-        print(f"✅ Loaded Tire Model for Cluster {cluster_id}")
+
+# 🛞 Load the latest cluster bundle: the clustering and the tire models trained on its clusters
+# (train it first with: python -m models.monaco_simulation.train_cluster_tire_models)
+manifest, clustering, bundle_models = load_cluster_bundle()
+scaler, kmeans = clustering[None]['scaler'], clustering[None]['kmeans']
+cluster_models = {cluster_id: model for (group, cluster_id), model in bundle_models.items() if group is None}
+print(f"✅ Loaded {len(cluster_models)} cluster tire models from bundle {manifest['version']}")
 
 # 🔥 Simple Feature Mapping
 def map_compound(compound):
@@ -69,9 +38,10 @@ def predict_laptime(tyre_life, track_temp, air_temp, pressure, rainfall, compoun
     clustering_features_scaled = scaler.transform(clustering_features)
     predicted_cluster = kmeans.predict(clustering_features_scaled)[0]
 
-    model_data = cluster_models.get(predicted_cluster)
-    model = model_data['model']
-    feature_names = model_data['feature_names']
+    model = cluster_models.get(predicted_cluster)
+    if model is None:
+        raise ValueError(f"Bundle {manifest['version']} has no tire model for cluster {predicted_cluster}.")
+    feature_names = model.feature_names
 
     compound = map_compound(compound)
 
@@ -1,13 +1,13 @@
-import pandas as pd
-from .monaco_test_simulator import simulate_strategy
+from .result_cache import cached_strategies_batch
 
-def evaluate_real_vs_simulated(real_data, strategies, model):
+def evaluate_real_vs_simulated(real_data, strategies, model, cache=None):
     """
     Compare actual lap time vs. predicted strategy outcomes.
     
     real_data: DataFrame with actual laps (LapTime, Stint)
     strategies: list of strategies like [("Soft", 12), ("Medium", 30)]
     model: TirePerformanceModel
+    cache: optional ResultCache; repeated comparisons with the same strategies, weather and model reuse the result
 
     Assumes weather is constant for the session (can be improved later).
     """
@@ -18,14 +18,9 @@ def evaluate_real_vs_simulated(real_data, strategies, model):
         'Pressure': real_data['Pressure'].median()
     }
 
-    results = []
-    for strat in strategies:
-        sim_time = simulate_strategy(strat, model, weather_inputs)
-        results.append({
-            'strategy': strat,
-            'simulated_time': sim_time
-        })
+    # All strategies are simulated with one model prediction
+    results = cached_strategies_batch(strategies, model, weather_inputs, cache=cache)
 
     real_time = real_data['LapTime'].sum() + 20 * (real_data['Stint'].nunique() - 1)
 
-    return pd.DataFrame(results).sort_values('simulated_time'), real_time
+    return results, real_time
@@ -0,0 +1,196 @@
+# models/monaco_simulation/compiled_tire_model.py
+
+import time
+import numpy as np
+
+
+class CompiledTireModel:
+    """
+    Coefficient-only version of a fitted TirePerformanceModel.
+
+    The PolynomialFeatures + LinearRegression pipeline is flattened into its
+    monomial powers and coefficients, so predictions are plain NumPy on 2D arrays
+    (columns in `feature_names` order). Only NumPy is needed to load and run it.
+
+    For degree <= 2 the polynomial is stored as c + X·b + xᵀQx, which avoids
+    building the full monomial matrix.
+
+    input_offset/input_scale (optional) standardise inputs before the polynomial,
+    for models fitted on scaled features such as IncrementalTireModel.
+    """
+
+    def __init__(self, feature_names, powers, coef, intercept, degree=2, input_offset=None, input_scale=None):
+        self.feature_names = list(feature_names)
+        self.powers = np.asarray(powers, dtype=np.int64)
+        self.coef = np.asarray(coef, dtype=np.float64).ravel()
+        self.intercept = float(intercept)
+        self.degree = int(degree)
+        n_features = len(self.feature_names)
+        self.input_offset = np.zeros(n_features) if input_offset is None else np.asarray(input_offset, dtype=np.float64)
+        self.input_scale = np.ones(n_features) if input_scale is None else np.asarray(input_scale, dtype=np.float64)
+        self._scaled = bool(np.any(self.input_offset != 0) or np.any(self.input_scale != 1))
+
+        if self.powers.shape != (len(self.coef), len(self.feature_names)):
+            raise ValueError(
+                f"powers shape {self.powers.shape} does not match "
+                f"{len(self.coef)} coefficients x {len(self.feature_names)} features."
+            )
+
+        self._quadratic = int(self.powers.sum(axis=1).max(initial=0)) <= 2
+        if self._quadratic:
+            self._build_quadratic_form()
+
+    def _build_quadratic_form(self):
+        n_features = len(self.feature_names)
+        const = self.intercept
+        linear = np.zeros(n_features)
+        quad = np.zeros((n_features, n_features))
+
+        for row, weight in zip(self.powers, self.coef):
+            nonzero = np.flatnonzero(row)
+            order = row.sum()
+            if order == 0:
+                const += weight
+            elif order == 1:
+                linear[nonzero[0]] += weight
+            elif len(nonzero) == 1:
+                # x_i ** 2
+                quad[nonzero[0], nonzero[0]] += weight
+            else:
+                # x_i * x_j
+                quad[nonzero[0], nonzero[1]] += weight
+
+        self.const = const
+        self.linear = linear
+        self.quad = quad
+
+    @classmethod
+    def from_pipeline(cls, pipeline, feature_names, degree=None):
+        """Flatten a fitted Pipeline(poly, linreg) into a CompiledTireModel."""
+        poly = pipeline.named_steps['poly']
+        linreg = pipeline.named_steps['linreg']
+        return cls(
+            feature_names=feature_names,
+            powers=poly.powers_,
+            coef=linreg.coef_,
+            intercept=linreg.intercept_,
+            degree=degree if degree is not None else poly.degree,
+        )
+
+    @classmethod
+    def from_model(cls, model):
+        """Flatten a fitted TirePerformanceModel."""
+        if model.feature_names is None:
+            raise ValueError("Model must be fitted before it can be compiled.")
+        return cls.from_pipeline(model.pipeline, model.feature_names, degree=model.degree)
+
+    def predict(self, X):
+        """Predict lap times for a 2D array whose columns follow `feature_names`."""
+        X = np.asarray(X, dtype=np.float64)
+        if X.ndim == 1:
+            X = X.reshape(1, -1)
+        if X.shape[1] != len(self.feature_names):
+            raise ValueError(f"Expected {len(self.feature_names)} columns, got {X.shape[1]}.")
+        if self._scaled:
+            X = (X - self.input_offset) / self.input_scale
+
+        if self._quadratic:
+            return self.const + X @ self.linear + ((X @ self.quad) * X).sum(axis=1)
+
+        monomials = np.prod(X[:, None, :] ** self.powers[None, :, :], axis=2)
+        return self.intercept + monomials @ self.coef
+
+    def predict_array(self, X, schema=None):
+        """Same entry point as TirePerformanceModel.predict_array, for a bound schema or ordered array."""
+        if schema is not None:
+            X = schema.to_array(X)
+        return self.predict(X)
+
+    def predict_one(self, x):
+        """Predict a single lap from a 1D feature vector; returns a float."""
+        x = np.asarray(x, dtype=np.float64)
+        if not self._quadratic:
+            return float(self.predict(x)[0])
+        if self._scaled:
+            x = (x - self.input_offset) / self.input_scale
+        return float(self.const + self.linear @ x + x @ self.quad @ x)
+
+    def save(self, path: str):
+        np.savez(
+            path,
+            feature_names=np.array(self.feature_names),
+            powers=self.powers,
+            coef=self.coef,
+            intercept=np.array(self.intercept),
+            degree=np.array(self.degree),
+            input_offset=self.input_offset,
+            input_scale=self.input_scale,
+        )
+        print(f"✅ Compiled model saved to {path}")
+
+    @classmethod
+    def load(cls, path: str):
+        with np.load(path, allow_pickle=False) as data:
+            model = cls(
+                feature_names=[str(name) for name in data['feature_names']],
+                powers=data['powers'],
+                coef=data['coef'],
+                intercept=float(data['intercept']),
+                degree=int(data['degree']),
+                input_offset=data['input_offset'] if 'input_offset' in data else None,
+                input_scale=data['input_scale'] if 'input_scale' in data else None,
+            )
+        print(f"✅ Compiled model loaded from {path}")
+        return model
+
+
+def check_compiled_matches(model, compiled, X, atol=1e-6):
+    """
+    Compare the compiled predictor with the sklearn pipeline on the DataFrame X.
+    Raises ValueError when any prediction differs by more than `atol` seconds.
+    Returns the largest absolute difference.
+    """
+    expected = model.predict(X)
+    actual = compiled.predict(X[model.feature_names].to_numpy(dtype=np.float64))
+    max_error = float(np.max(np.abs(expected - actual))) if len(expected) else 0.0
+    if max_error > atol:
+        raise ValueError(f"Compiled model differs from pipeline by {max_error:.3e}s (atol={atol}).")
+    return max_error
+
+
+def measure_compiled_latency(compiled, n_rows=1_000_000, repeats=1000, seed=42):
+    """
+    Rough timing of the compiled predictor on random inputs.
+    Returns single-row latency in microseconds and batch throughput in rows per second.
+    """
+    rng = np.random.default_rng(seed)
+    X = rng.random((n_rows, len(compiled.feature_names)))
+    row = X[0].copy()
+
+    start = time.perf_counter()
+    for _ in range(repeats):
+        compiled.predict_one(row)
+    single_row_us = (time.perf_counter() - start) / repeats * 1e6
+
+    start = time.perf_counter()
+    compiled.predict(X)
+    batch_seconds = time.perf_counter() - start
+
+    return {
+        'single_row_us': single_row_us,
+        'batch_rows_per_sec': n_rows / batch_seconds,
+    }
+
+
+if __name__ == "__main__":
+    from pathlib import Path
+    from tire_model import TirePerformanceModel
+
+    model_path = Path(__file__).parent / "tire_model_poly2.pkl"
+    model = TirePerformanceModel.load(str(model_path))
+    compiled = CompiledTireModel.from_model(model)
+    compiled.save(str(model_path.with_suffix('.npz')))
+
+    timings = measure_compiled_latency(compiled)
+    print(f"Single row: {timings['single_row_us']:.1f} µs, "
+          f"batch: {timings['batch_rows_per_sec'] / 1e6:.1f}M rows/s")
@@ -0,0 +1,127 @@
+# models/monaco_simulation/data_utils.py
+
+import os
+import hashlib
+import shutil
+import tempfile
+from contextlib import contextmanager
+from pathlib import Path
+import numpy as np
+import pandas as pd
+
+# Lap columns shared by the training, feature and evaluation code
+WEATHER_FEATURES = ['TrackTemp', 'AirTemp', 'Pressure']
+GAP_FEATURES = ['GapToLeader', 'IntervalToPositionAhead']
+SESSION_COLS = ['year', 'round', 'session_type']
+
+
+def clean_gap_value(val):
+    """Scalar gap cleaning (the original row-by-row version of clean_gap_column)."""
+    if isinstance(val, str):
+        if 'L' in val:
+            return 90.0
+        val = val.replace('+', '')
+    try:
+        return float(val)
+    except (TypeError, ValueError):
+        return None
+
+
+def clean_gap_column(values):
+    """
+    clean_gap_value over a whole Series: '+1.234' -> 1.234, lapped ('1L') -> 90.0, unparsable -> NaN.
+    Each distinct value is parsed once (timing data repeats '1L', '' and many gaps), which is
+    faster than both .apply and pandas string methods + to_numeric.
+    """
+    codes, uniques = pd.factorize(values)
+    # Missing values get code -1, which picks the trailing NaN
+    cleaned = np.array([clean_gap_value(value) for value in uniques] + [np.nan], dtype=float)
+    return pd.Series(cleaned[codes], index=values.index, name=values.name)
+
+
+def compound_of_column(col):
+    """Return the compound name of a one-hot column like 'Compound_SOFT' or 'MappedCompound_SOFT', else None."""
+    if 'Compound_' not in col:
+        return None
+    return col.split('Compound_', 1)[1].lower()
+
+
+def build_lap_features(feature_names, compound, tyre_life, weather_inputs):
+    """
+    Build a 2D feature array (one row per TyreLife value) in `feature_names` order.
+
+    compound: compound name like "Soft"; its one-hot column is set, the others are 0
+              (None leaves every compound column at 0)
+    tyre_life: scalar or array of TyreLife values
+    weather_inputs: dict with keys: 'TrackTemp', 'AirTemp', 'Pressure'
+    Features not given (e.g. gaps or Rainfall) are set to 0.
+
+    Raises ValueError if the model has no one-hot column for compound.
+    """
+    tyre_life = np.atleast_1d(np.asarray(tyre_life, dtype=float))
+    X = np.zeros((len(tyre_life), len(feature_names)))
+    matched = compound is None
+
+    for j, col in enumerate(feature_names):
+        if col == 'TyreLife':
+            X[:, j] = tyre_life
+        elif col in weather_inputs:
+            X[:, j] = weather_inputs[col]
+        elif compound is not None and compound_of_column(col) == compound.lower():
+            X[:, j] = 1
+            matched = True
+
+    if not matched:
+        raise ValueError(f"Model has no compound feature for {compound!r}.")
+    return X
+
+
+def content_hash(data, columns=None):
+    """
+    Short content hash of a DataFrame/Series (or the given columns of it) or of an array.
+    Used to version feature caches, model metadata and cluster bundles.
+    """
+    if isinstance(data, pd.DataFrame) and columns is not None:
+        data = data[[col for col in columns if col in data.columns]]
+    if isinstance(data, (pd.DataFrame, pd.Series)):
+        raw = pd.util.hash_pandas_object(data, index=False).to_numpy().tobytes()
+    else:
+        raw = memoryview(data).tobytes()
+    return hashlib.sha256(raw).hexdigest()[:16]
+
+
+@contextmanager
+def atomic_directory(target, exist_ok=False):
+    """
+    Yield a staging folder next to target and rename it into place when the block succeeds,
+    so readers never see a half-written folder. On error the staging folder is removed.
+
+    exist_ok: if another process already wrote target, keep theirs instead of failing
+    """
+    target = Path(target)
+    target.parent.mkdir(parents=True, exist_ok=True)
+    staging = Path(tempfile.mkdtemp(prefix='.staging_', dir=target.parent))
+    try:
+        yield staging
+        os.replace(staging, target)
+    except OSError:
+        shutil.rmtree(staging, ignore_errors=True)
+        if not (exist_ok and target.exists()):
+            raise
+    except BaseException:
+        shutil.rmtree(staging, ignore_errors=True)
+        raise
+
+
+@contextmanager
+def atomic_file(target):
+    """Yield a staging file path next to target and rename it over target when the block succeeds."""
+    target = Path(target)
+    fd, staging = tempfile.mkstemp(prefix='.staging_', dir=target.parent)
+    os.close(fd)
+    try:
+        yield Path(staging)
+        os.replace(staging, target)
+    except BaseException:
+        Path(staging).unlink(missing_ok=True)
+        raise
@@ -0,0 +1,119 @@
+# models/monaco_simulation/incremental_tire_model.py
+
+import numpy as np
+import pandas as pd
+from sklearn.preprocessing import PolynomialFeatures
+from .compiled_tire_model import CompiledTireModel
+
+
+class IncrementalTireModel:
+    """
+    Polynomial least-squares tire model that is retrained from sufficient statistics.
+
+    For every key (e.g. (circuit, compound)) it keeps XᵀX and Xᵀy of the polynomial
+    features, so absorbing a new session costs O(new rows) and solving is independent
+    of how much history has been seen. With forgetting < 1 the existing statistics of a
+    key are scaled by `forgetting` before each update, so older sessions count less.
+    With forgetting = 1 and ridge = 0 it solves the same least-squares problem as a full
+    TirePerformanceModel refit on all history.
+
+    Inputs are shifted and scaled with the first batch's mean/std before the polynomial
+    expansion to keep XᵀX well conditioned; the fitted polynomial is the same. (On raw
+    Monaco weather columns, e.g. Pressure² ~ 1e6, the sklearn pipeline itself loses a few
+    digits, so compare against a refit on the same scaled features when checking.)
+    """
+
+    def __init__(self, degree=2, forgetting=1.0, ridge=0.0):
+        if not 0 < forgetting <= 1:
+            raise ValueError("forgetting must be in (0, 1].")
+        self.degree = degree
+        self.forgetting = forgetting
+        self.ridge = ridge
+        self.poly = PolynomialFeatures(degree=degree)
+        self.feature_names = None
+        self.input_offset = None
+        self.input_scale = None
+        self.stats = {}
+        self._coef = {}
+
+    def _expand(self, X):
+        X = (np.asarray(X, dtype=np.float64) - self.input_offset) / self.input_scale
+        return self.poly.transform(X)
+
+    def partial_fit(self, X, y, key=None):
+        """Add a batch of laps (DataFrame X, target y) to the statistics of `key`."""
+        if not isinstance(X, pd.DataFrame):
+            raise ValueError("X must be a pandas DataFrame with named columns.")
+
+        if self.feature_names is None:
+            self.feature_names = list(X.columns)
+            values = X.to_numpy(dtype=np.float64)
+            self.input_offset = values.mean(axis=0)
+            std = values.std(axis=0)
+            # Columns constant within the first batch are only shifted
+            self.input_scale = np.where(std > 1e-6 * np.maximum(np.abs(self.input_offset), 1.0), std, 1.0)
+            self.poly.fit(np.zeros((1, len(self.feature_names))))
+        elif list(X.columns) != self.feature_names:
+            raise ValueError(f"Input features {list(X.columns)} do not match training features {self.feature_names}.")
+
+        Z = self._expand(X.to_numpy(dtype=np.float64))
+        y = np.asarray(y, dtype=np.float64)
+
+        stats = self.stats.get(key)
+        if stats is None:
+            n_terms = Z.shape[1]
+            stats = {'xtx': np.zeros((n_terms, n_terms)), 'xty': np.zeros(n_terms), 'n': 0.0}
+            self.stats[key] = stats
+        elif self.forgetting < 1:
+            stats['xtx'] *= self.forgetting
+            stats['xty'] *= self.forgetting
+            stats['n'] *= self.forgetting
+
+        stats['xtx'] += Z.T @ Z
+        stats['xty'] += Z.T @ y
+        stats['n'] += len(y)
+        self._coef.pop(key, None)
+        return self
+
+    def absorb_session(self, laps, feature_cols, target='LapTime', key_cols=None):
+        """
+        Add one session's laps, split into keys by key_cols (e.g. ['round', 'Compound']).
+        Each key present in the session gets one forgetting step.
+        """
+        if not key_cols:
+            return self.partial_fit(laps[feature_cols], laps[target])
+        for key, group in laps.groupby(list(key_cols)):
+            self.partial_fit(group[feature_cols], group[target], key=key)
+        return self
+
+    def coefficients(self, key=None):
+        """Least-squares solution of the key's normal equations (minimum norm if rank deficient)."""
+        if key not in self._coef:
+            stats = self.stats[key]
+            xtx = stats['xtx']
+            if self.ridge:
+                # Penalise everything except the bias term
+                penalty = np.eye(len(xtx)) * self.ridge
+                penalty[0, 0] = 0
+                xtx = xtx + penalty
+            self._coef[key] = np.linalg.lstsq(xtx, stats['xty'], rcond=None)[0]
+        return self._coef[key]
+
+    def predict(self, X, key=None):
+        if isinstance(X, pd.DataFrame):
+            if list(X.columns) != self.feature_names:
+                raise ValueError(f"Input features {list(X.columns)} do not match training features {self.feature_names}.")
+            X = X.to_numpy(dtype=np.float64)
+        return self._expand(X) @ self.coefficients(key)
+
+    def to_compiled(self, key=None):
+        """CompiledTireModel for one key, usable anywhere a tire model is expected."""
+        return CompiledTireModel(
+            feature_names=self.feature_names,
+            powers=self.poly.powers_,
+            coef=self.coefficients(key),
+            intercept=0.0,
+            degree=self.degree,
+            input_offset=self.input_offset,
+            input_scale=self.input_scale,
+        )
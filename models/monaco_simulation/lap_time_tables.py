@@ -0,0 +1,134 @@
+# models/monaco_simulation/lap_time_tables.py
+
+from collections import OrderedDict
+import numpy as np
+from .data_utils import build_lap_features, compound_of_column
+
+# Weather is rounded to these steps before building a table, so nearby conditions share one table
+DEFAULT_WEATHER_QUANTUM = {
+    'TrackTemp': 0.5,
+    'AirTemp': 0.5,
+    'Pressure': 1.0,
+}
+
+
+def supported_compounds(model, compounds):
+    """The compounds (in order) that have a one-hot column among model.feature_names."""
+    available = {compound_of_column(col) for col in model.feature_names}
+    return [compound for compound in compounds if compound.lower() in available]
+
+
+class LapTimeTable:
+    """
+    Predicted lap times for every (compound, tyre life) at one weather bucket.
+
+    lap_times[i, life] is the lap time on compounds[i] at TyreLife `life` (column 0 is unused),
+    stint_times[i, n] is the total time of an n-lap stint on fresh tyres.
+    """
+
+    def __init__(self, compounds, lap_times, weather_inputs):
+        self.compounds = list(compounds)
+        self.lap_times = lap_times
+        self.weather_inputs = dict(weather_inputs)
+        self.max_tyre_life = lap_times.shape[1] - 1
+
+        self.stint_times = np.zeros_like(lap_times)
+        self.stint_times[:, 1:] = np.cumsum(lap_times[:, 1:], axis=1)
+        self._index = {compound.lower(): i for i, compound in enumerate(self.compounds)}
+
+    def compound_index(self, compound):
+        try:
+            return self._index[compound.lower()]
+        except KeyError:
+            raise ValueError(f"Compound {compound} not in table compounds {self.compounds}.")
+
+    def lap_time(self, compound, tyre_life):
+        return self.lap_times[self.compound_index(compound), int(tyre_life)]
+
+    def stint_time(self, compound, stint_laps):
+        return self.stint_times[self.compound_index(compound), int(stint_laps)]
+
+
+class LapTimeTableCache:
+    """
+    LRU cache of LapTimeTables keyed by quantised TrackTemp/AirTemp/Pressure.
+
+    model: TirePerformanceModel or CompiledTireModel (anything with feature_names and predict_array)
+    compounds: compounds to tabulate, e.g. ["Soft", "Medium", "Hard"]
+    max_tyre_life: largest TyreLife in each table
+    maxsize: number of weather buckets kept before the least recently used one is dropped
+
+    Raises ValueError for a compound the model has no one-hot column for: its laps would be
+    predicted with every compound column at 0 instead of failing.
+    """
+
+    def __init__(self, model, compounds, max_tyre_life=80, maxsize=32, quantum=None):
+        supported = supported_compounds(model, compounds)
+        unsupported = [c for c in compounds if c not in supported]
+        if unsupported:
+            raise ValueError(f"Model has no compound feature for {unsupported}; "
+                             f"its compound columns are {[col for col in model.feature_names if compound_of_column(col)]}.")
+        self.model = model
+        self.compounds = list(compounds)
+        self.max_tyre_life = max_tyre_life
+        self.maxsize = maxsize
+        self.quantum = dict(DEFAULT_WEATHER_QUANTUM if quantum is None else quantum)
+
+        self._tables = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def weather_key(self, weather_inputs):
+        return tuple(
+            round(round(weather_inputs[name] / step) * step, 6)
+            for name, step in self.quantum.items()
+        )
+
+    def _build_table(self, key):
+        weather_inputs = dict(zip(self.quantum, key))
+        tyre_life = np.arange(1, self.max_tyre_life + 1)
+
+        # One prediction covering every compound x tyre life
+        X = np.vstack([
+            build_lap_features(self.model.feature_names, compound, tyre_life, weather_inputs)
+            for compound in self.compounds
+        ])
+        predicted = self.model.predict_array(X).reshape(len(self.compounds), self.max_tyre_life)
+
+        lap_times = np.full((len(self.compounds), self.max_tyre_life + 1), np.nan)
+        lap_times[:, 1:] = predicted
+        return LapTimeTable(self.compounds, lap_times, weather_inputs)
+
+    def get_table(self, weather_inputs):
+        key = self.weather_key(weather_inputs)
+        table = self._tables.get(key)
+
+        if table is not None:
+            self.hits += 1
+            self._tables.move_to_end(key)
+            return table
+
+        self.misses += 1
+        table = self._build_table(key)
+        self._tables[key] = table
+        if len(self._tables) > self.maxsize:
+            self._tables.popitem(last=False)
+        return table
+
+    def lap_time(self, compound, tyre_life, weather_inputs):
+        return self.get_table(weather_inputs).lap_time(compound, tyre_life)
+
+    def stats(self):
+        lookups = self.hits + self.misses
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'hit_rate': self.hits / lookups if lookups else 0.0,
+            'tables': len(self._tables),
+            'maxsize': self.maxsize,
+        }
+
+    def clear(self):
+        self._tables.clear()
+        self.hits = 0
+        self.misses = 0
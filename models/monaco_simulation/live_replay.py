@@ -0,0 +1,250 @@
+# models/monaco_simulation/live_replay.py
+
+import asyncio
+import time
+from pathlib import Path
+import numpy as np
+import pandas as pd
+from .tire_degradation import FUEL_EFFECT_PER_LAP
+
+SPRINT_FOLDER = Path(__file__).parents[2] / "data" / "raw" / "sprint"
+
+LAP_FIELDS = ['LapNumber', 'LapTime', 'Stint', 'Compound', 'TyreLife', 'Position', 'PitInTime', 'PitOutTime']
+WEATHER_FIELDS = ['TrackTemp', 'AirTemp', 'Pressure', 'Rainfall']
+GAP_FIELDS = ['GapToLeader', 'IntervalToPositionAhead']
+# FastF1 track status codes
+SAFETY_CAR_STATUS = {'4'}
+VIRTUAL_SAFETY_CAR_STATUS = {'6', '7'}
+
+DEFAULT_STRATEGIST_PARAMS = {
+    'degradation_threshold': 1.5,  # fuel-corrected seconds over the stint's best lap
+    'degradation_smoothing': 0.5,  # EWMA weight of the newest lap
+    'max_tyre_life': 25,           # laps before old tyres trigger a stop
+    'min_laps_for_cheap_stop': 8,  # tyre age worth a stop under SC/VSC
+}
+
+
+def _seconds(values):
+    return pd.to_timedelta(values).dt.total_seconds()
+
+
+def load_session_events(year, rnd, folder=SPRINT_FOLDER):
+    """
+    Recorded session as a time-ordered list of events, like a live timing feed would send them.
+
+    Each event is a dict with time (session seconds), kind ('lap', 'gap', 'weather' or
+    'track_status'), driver (None for session-wide events) and data. Gap events are derived
+    from the lap end times: gap to the leader and to the car ahead on the same lap.
+    """
+    folder = Path(folder) / str(year)
+    laps = pd.read_csv(folder / f"laps_{year}_{rnd}.csv")
+    weather = pd.read_csv(folder / f"weather_data_{year}_{rnd}.csv")
+    status = pd.read_csv(folder / f"track_status_{year}_{rnd}.csv", dtype={'Status': str})
+
+    laps['time'] = _seconds(laps['Time'])
+    laps = laps.dropna(subset=['time', 'LapNumber'])
+    laps['LapTime'] = _seconds(laps['LapTime'])
+    for col in ['PitInTime', 'PitOutTime']:
+        laps[col] = laps[col].notna()
+
+    by_lap = laps.sort_values(['LapNumber', 'time'])
+    gaps = pd.DataFrame({
+        'time': by_lap['time'],
+        'Driver': by_lap['Driver'],
+        'LapNumber': by_lap['LapNumber'],
+        'GapToLeader': by_lap['time'] - by_lap.groupby('LapNumber')['time'].transform('min'),
+        'IntervalToPositionAhead': by_lap.groupby('LapNumber')['time'].diff().fillna(0.0),
+    })
+
+    weather['time'] = _seconds(weather['Time'])
+    weather['Rainfall'] = weather['Rainfall'].astype(float)
+    status['time'] = _seconds(status['Time'])
+
+    def records(frame, kind, fields, driver_col=None):
+        return [
+            {'time': row['time'], 'kind': kind, 'driver': row[driver_col] if driver_col else None,
+             'data': {field: row[field] for field in fields}}
+            for row in frame.to_dict('records')
+        ]
+
+    events = (records(gaps, 'gap', ['LapNumber'] + GAP_FIELDS, 'Driver')
+              + records(laps, 'lap', LAP_FIELDS, 'Driver')
+              + records(weather, 'weather', WEATHER_FIELDS)
+              + records(status, 'track_status', ['Status', 'Message']))
+    # Stable sort keeps a gap record before the lap that shares its timestamp
+    events.sort(key=lambda event: event['time'])
+    return events
+
+
+class ReplayFeed:
+    """
+    Stand-in for live timing: puts recorded events on an asyncio queue in timestamp order.
+
+    speed: session seconds per wall-clock second (10 = ten times real time); None sends as
+    fast as possible. Every event is stamped with `sent` (perf_counter) when it is queued,
+    and a final None marks the end of the session.
+    """
+
+    def __init__(self, events, speed=10.0):
+        self.events = events
+        self.speed = speed
+
+    async def run(self, queue):
+        start_wall = time.perf_counter()
+        start_time = self.events[0]['time'] if self.events else 0.0
+        for event in self.events:
+            if self.speed:
+                delay = (event['time'] - start_time) / self.speed - (time.perf_counter() - start_wall)
+                if delay > 0:
+                    await asyncio.sleep(delay)
+            await queue.put(dict(event, sent=time.perf_counter()))
+        await queue.put(None)
+
+
+class DriverState:
+    """Per-driver running state; every field is updated in O(1) per lap."""
+
+    __slots__ = ('stint', 'compound', 'tyre_life', 'lap_number', 'stint_best', 'excess', 'gap', 'interval', 'recommended')
+
+    def __init__(self):
+        self.stint = None
+        self.compound = None
+        self.tyre_life = 0
+        self.lap_number = 0
+        self.stint_best = np.inf
+        self.excess = 0.0
+        self.gap = np.nan
+        self.interval = np.nan
+        self.recommended = False
+
+
+class IncrementalStrategist:
+    """
+    Streaming version of the baby strategist rules.
+
+    Consumes one event at a time and keeps only the latest weather/track status plus a
+    DriverState per driver, so each lap costs O(1) regardless of how long the session is.
+    A lap can return a pit recommendation (once per stint) for:
+        degradation: smoothed fuel-corrected lap time over the stint best > degradation_threshold
+        rain: rain on slick tyres
+        old_tyres: TyreLife above max_tyre_life
+        cheap_stop: SC/VSC active and the tyres are at least min_laps_for_cheap_stop old
+    """
+
+    def __init__(self, params=None, fuel_effect=FUEL_EFFECT_PER_LAP):
+        self.p = dict(DEFAULT_STRATEGIST_PARAMS, **(params or {}))
+        self.fuel_effect = fuel_effect
+        self.drivers = {}
+        self.weather = {}
+        self.track_status = '1'
+
+    def on_event(self, event):
+        kind = event['kind']
+        if kind == 'lap':
+            return self._on_lap(event['driver'], event['data'], event['time'])
+        if kind == 'gap':
+            state = self.drivers.setdefault(event['driver'], DriverState())
+            state.gap = event['data']['GapToLeader']
+            state.interval = event['data']['IntervalToPositionAhead']
+        elif kind == 'weather':
+            self.weather = event['data']
+        elif kind == 'track_status':
+            self.track_status = str(event['data']['Status'])
+        return None
+
+    def _on_lap(self, driver, lap, session_time):
+        state = self.drivers.setdefault(driver, DriverState())
+        if lap['Stint'] != state.stint:
+            state.stint = lap['Stint']
+            state.stint_best = np.inf
+            state.excess = 0.0
+            state.recommended = False
+        state.compound = lap['Compound']
+        state.tyre_life = lap['TyreLife']
+        state.lap_number = lap['LapNumber']
+
+        # In/out laps and laps without a time say nothing about tyre wear
+        lap_time = lap['LapTime']
+        if pd.isna(lap_time) or lap['PitInTime'] or lap['PitOutTime']:
+            return None
+
+        corrected = lap_time + self.fuel_effect * (lap['LapNumber'] - 1)
+        state.stint_best = min(state.stint_best, corrected)
+        alpha = self.p['degradation_smoothing']
+        state.excess = alpha * (corrected - state.stint_best) + (1 - alpha) * state.excess
+
+        if state.recommended:
+            return None
+        reason = self._reason(state)
+        if reason is None:
+            return None
+
+        state.recommended = True
+        return {
+            'time': session_time,
+            'driver': driver,
+            'lap': state.lap_number,
+            'reason': reason,
+            'compound': state.compound,
+            'tyre_life': state.tyre_life,
+            'gap_to_leader': state.gap,
+            'interval': state.interval,
+        }
+
+    def _reason(self, state):
+        slick = str(state.compound).upper() not in {'INTERMEDIATE', 'WET'}
+        if slick and self.weather.get('Rainfall', 0) > 0:
+            return 'rain'
+        if (self.track_status in SAFETY_CAR_STATUS | VIRTUAL_SAFETY_CAR_STATUS
+                and state.tyre_life >= self.p['min_laps_for_cheap_stop']):
+            return 'cheap_stop'
+        if state.excess > self.p['degradation_threshold']:
+            return 'degradation'
+        if state.tyre_life > self.p['max_tyre_life']:
+            return 'old_tyres'
+        return None
+
+
+async def run_strategist(queue, strategist):
+    """Consume events until the end-of-session marker. Returns (recommendations, latencies in ms)."""
+    recommendations, latencies = [], []
+    while True:
+        event = await queue.get()
+        if event is None:
+            break
+        recommendation = strategist.on_event(event)
+        latency = (time.perf_counter() - event['sent']) * 1000
+        latencies.append(latency)
+        if recommendation is not None:
+            recommendations.append(dict(recommendation, latency_ms=latency))
+    return recommendations, np.array(latencies)
+
+
+def replay_session(year, rnd, speed=10.0, folder=SPRINT_FOLDER, params=None):
+    """
+    Replay a recorded session through the incremental strategist.
+    Returns (recommendations DataFrame, latency summary dict with per-event end-to-end latency).
+    """
+    events = load_session_events(year, rnd, folder)
+
+    async def main():
+        queue = asyncio.Queue()
+        strategist = IncrementalStrategist(params)
+        _, (recommendations, latencies) = await asyncio.gather(ReplayFeed(events, speed).run(queue),
+                                                                run_strategist(queue, strategist))
+        return recommendations, latencies
+
+    recommendations, latencies = asyncio.run(main())
+    latency = {
+        'events': len(latencies),
+        'p50_ms': float(np.percentile(latencies, 50)) if len(latencies) else np.nan,
+        'p99_ms': float(np.percentile(latencies, 99)) if len(latencies) else np.nan,
+        'max_ms': float(latencies.max()) if len(latencies) else np.nan,
+    }
+    return pd.DataFrame(recommendations), latency
+
+
+if __name__ == "__main__":
+    recommendations, latency = replay_session(2023, 4, speed=None)
+    print(recommendations.to_string(index=False))
+    print(latency)
@@ -0,0 +1,147 @@
+# models/monaco_simulation/model_registry.py
+
+import json
+import threading
+from collections import OrderedDict
+from datetime import datetime, timezone
+from pathlib import Path
+import joblib
+from .data_utils import atomic_directory, content_hash
+
+REGISTRY_FOLDER = Path(__file__).parent / "model_registry"
+
+
+class ModelRegistry:
+    """
+    Versioned store of model bundles with lazy, shared loading.
+
+    Each version lives in <root>/<name>/v<N>/ with model.joblib and metadata.json
+    (training data hash, feature names, degree, metrics, ...). Models are loaded on first
+    use, with NumPy arrays memory-mapped where joblib can, and kept in an in-process LRU.
+    When the resident models exceed memory_budget_mb the least recently used are dropped.
+    """
+
+    def __init__(self, root=REGISTRY_FOLDER, memory_budget_mb=512, mmap=True):
+        self.root = Path(root)
+        self.memory_budget = memory_budget_mb * 1024 * 1024
+        self.mmap = mmap
+
+        self._loaded = OrderedDict()  # (name, version) -> (model, size_bytes)
+        self._resident_bytes = 0
+        self._lock = threading.RLock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def _version_path(self, name, version):
+        return self.root / name / f"v{version}"
+
+    def list_versions(self, name):
+        folder = self.root / name
+        if not folder.exists():
+            return []
+        return sorted(int(path.name[1:]) for path in folder.iterdir() if path.name.startswith('v') and path.name[1:].isdigit())
+
+    def latest_version(self, name):
+        versions = self.list_versions(name)
+        if not versions:
+            raise KeyError(f"No versions registered for model '{name}'.")
+        return versions[-1]
+
+    def register(self, name, model, training_data=None, metrics=None, **extra):
+        """
+        Store a fitted model as the next version of `name`. Returns the new version number.
+        The bundle is written to a staging folder and renamed into place.
+        """
+        with self._lock:
+            version = (self.list_versions(name) or [0])[-1] + 1
+            target = self._version_path(name, version)
+
+            with atomic_directory(target) as staging:
+                # Uncompressed so the arrays can be memory-mapped on load
+                joblib.dump(model, staging / "model.joblib")
+                metadata = {
+                    'name': name,
+                    'version': version,
+                    'created': datetime.now(timezone.utc).isoformat(),
+                    'model_class': type(model).__name__,
+                    'feature_names': list(getattr(model, 'feature_names', None) or []),
+                    'degree': getattr(model, 'degree', None),
+                    'training_data_hash': content_hash(training_data) if training_data is not None else None,
+                    'metrics': metrics or {},
+                    'size_bytes': (staging / "model.joblib").stat().st_size,
+                    **extra,
+                }
+                with open(staging / "metadata.json", 'w') as f:
+                    json.dump(metadata, f, indent=4, default=str)
+
+        print(f"✅ Registered {name} v{version} in {target}")
+        return version
+
+    def import_legacy(self, name, path, **extra):
+        """Register a pickle saved by TirePerformanceModel.save (e.g. tire_model_poly2.pkl)."""
+        from .tire_model import TirePerformanceModel
+        return self.register(name, TirePerformanceModel.load(str(path)), source_path=str(path), **extra)
+
+    def metadata(self, name, version=None):
+        version = self.latest_version(name) if version is None else version
+        with open(self._version_path(name, version) / "metadata.json") as f:
+            return json.load(f)
+
+    def get(self, name, version=None):
+        """Return the model, loading it on first use and keeping it in the LRU."""
+        with self._lock:
+            version = self.latest_version(name) if version is None else version
+            key = (name, version)
+
+            if key in self._loaded:
+                self.hits += 1
+                self._loaded.move_to_end(key)
+                return self._loaded[key][0]
+
+            self.misses += 1
+            path = self._version_path(name, version) / "model.joblib"
+            model = joblib.load(path, mmap_mode='r' if self.mmap else None)
+            size = path.stat().st_size
+
+            self._loaded[key] = (model, size)
+            self._resident_bytes += size
+            self._evict()
+            return model
+
+    def _evict(self):
+        # Always keep the most recently used model, even if it alone exceeds the budget
+        while self._resident_bytes > self.memory_budget and len(self._loaded) > 1:
+            _, (_, size) = self._loaded.popitem(last=False)
+            self._resident_bytes -= size
+            self.evictions += 1
+
+    def unload(self, name=None):
+        """Drop resident models (all, or every version of `name`)."""
+        with self._lock:
+            for key in [key for key in self._loaded if name is None or key[0] == name]:
+                self._resident_bytes -= self._loaded.pop(key)[1]
+
+    def stats(self):
+        with self._lock:
+            return {
+                'hits': self.hits,
+                'misses': self.misses,
+                'evictions': self.evictions,
+                'resident_models': [f"{name}:v{version}" for name, version in self._loaded],
+                'resident_mb': self._resident_bytes / (1024 * 1024),
+                'budget_mb': self.memory_budget / (1024 * 1024),
+            }
+
+
+_shared_registries = {}
+_shared_lock = threading.Lock()
+
+
+def get_registry(root=REGISTRY_FOLDER, memory_budget_mb=512):
+    """Process-wide registry per root folder, so every caller shares the same hot models."""
+    root = Path(root).resolve()
+    with _shared_lock:
+        if root not in _shared_registries:
+            _shared_registries[root] = ModelRegistry(root, memory_budget_mb=memory_budget_mb)
+        return _shared_registries[root]
@@ -39,7 +39,7 @@ def load_all_quicklaps(years, session_types):
 
 
 def build_tire_baseline(quicklaps: pd.DataFrame):
-    grouped,_ = quicklaps.groupby(["Compound", "Stint"])
+    grouped = quicklaps.groupby(["Compound", "Stint"])
     
     baseline = grouped.agg({
         "LapTime": "mean",
@@ -1,6 +1,8 @@
+import numpy as np
 import pandas as pd
-import fastf1
-fastf1.Cache.enable_cache('/Users/nooralindeflaten/f1_ML_predictor/data/cache')  # Enable cache for faster data loading
+from .data_utils import build_lap_features, compound_of_column
+
+
 def simulate_strategy(strategy, model, weather_inputs, pit_loss=20):
     """
     Simulate total race time for a strategy using full regression-based tire model.
@@ -11,23 +13,66 @@ def simulate_strategy(strategy, model, weather_inputs, pit_loss=20):
     pit_loss: time lost per pit stop in seconds
     """
     total_time = 0
-    compound_onehots = [col for col in model.feature_names if col.startswith("Compound_")]
 
     for idx, (compound, stint_laps) in enumerate(strategy):
-        for lap_life in range(1, stint_laps + 1):
-            input_data = {
-                'TyreLife': lap_life,
-                **weather_inputs
-            }
-
-            # Add one-hot compound features
-            for col in compound_onehots:
-                input_data[col] = 1 if col.lower().endswith(compound.lower()) else 0
-
-            input_df = pd.DataFrame([input_data])
-            total_time += model.predict(input_df)[0]
+        # One prediction per stint, TyreLife 1..stint_laps
+        stint_features = build_lap_features(model.feature_names, compound, np.arange(1, stint_laps + 1), weather_inputs)
+        total_time += model.predict_array(stint_features).sum()
 
         if idx < len(strategy) - 1:
             total_time += pit_loss
 
     return total_time
+
+
+def simulate_strategies_batch(strategies, model, weather_inputs, pit_loss=20):
+    """
+    Simulate every strategy with a single model prediction.
+
+    All laps of all strategies are laid out in one design matrix, predicted once and
+    summed per strategy, plus pit_loss for each stop.
+
+    strategies: list of strategies like [("Soft", 12), ("Medium", 30)], e.g. from generate_stint_sequences
+    model: TirePerformanceModel or CompiledTireModel
+    weather_inputs: dict with keys: 'TrackTemp', 'AirTemp', 'Pressure'
+
+    Returns a DataFrame with strategy, simulated_time and rank, sorted fastest first.
+    """
+    if not strategies:
+        return pd.DataFrame(columns=['strategy', 'simulated_time', 'rank'])
+
+    stint_strategy = np.array([k for k, strat in enumerate(strategies) for _ in strat])
+    stint_laps = np.array([laps for strat in strategies for _, laps in strat])
+    stint_compound = np.array([compound.lower() for strat in strategies for compound, _ in strat])
+
+    # TyreLife 1..stint_laps for every stint, laid out back to back
+    lap_stint = np.repeat(np.arange(len(stint_laps)), stint_laps)
+    stint_start = np.cumsum(stint_laps) - stint_laps
+    tyre_life = np.arange(len(lap_stint)) - stint_start[lap_stint] + 1
+    lap_compound = stint_compound[lap_stint]
+
+    X = build_lap_features(model.feature_names, None, tyre_life, weather_inputs)
+    model_compounds = set()
+    for j, col in enumerate(model.feature_names):
+        compound = compound_of_column(col)
+        if compound is not None:
+            X[:, j] = lap_compound == compound
+            model_compounds.add(compound)
+
+    unknown = sorted(set(stint_compound.tolist()) - model_compounds)
+    if unknown:
+        raise ValueError(f"Model has no compound feature for {unknown}.")
+
+    lap_times = model.predict_array(X)
+
+    n_strategies = len(strategies)
+    total_time = np.bincount(stint_strategy[lap_stint], weights=lap_times, minlength=n_strategies)
+    n_stops = np.bincount(stint_strategy, minlength=n_strategies) - 1
+    total_time += pit_loss * n_stops
+
+    results = pd.DataFrame({
+        'strategy': strategies,
+        'simulated_time': total_time,
+    }).sort_values('simulated_time')
+    results['rank'] = np.arange(1, n_strategies + 1)
+    return results
@@ -0,0 +1,188 @@
+# models/monaco_simulation/monte_carlo_simulator.py
+
+import os
+from concurrent.futures import ProcessPoolExecutor
+import numpy as np
+import pandas as pd
+from .lap_time_tables import LapTimeTableCache
+from .weather_rules import is_crossover_to_inters, should_stay_out_on_softs
+
+# Default scenario settings (per race probabilities, seconds, laps)
+DEFAULT_SCENARIO_PARAMS = {
+    'sc_prob': 0.6,             # Monaco sees a safety car in most races
+    'sc_laps': (3, 6),          # SC length, low inclusive / high exclusive
+    'sc_lap_factor': 1.4,       # lap time multiplier behind the SC
+    'sc_pit_factor': 0.5,       # share of pit_loss paid when stopping under SC
+    'vsc_prob': 0.3,
+    'vsc_laps': (1, 4),
+    'vsc_lap_factor': 1.3,
+    'vsc_pit_factor': 0.7,
+    'rain_prob': 0.15,
+    'rain_ramp_laps': 5,        # laps from first drops to peak intensity
+    'slick_rain_penalty': 10.0, # seconds per lap on slicks at full intensity past the crossover
+    'damp_rain_penalty': 3.0,   # seconds per lap on slicks in light rain
+    'track_temp_std': 3.0,      # per-race TrackTemp shift
+    'lap_noise_std': 0.3,       # per-lap lap time noise
+}
+
+WET_COMPOUNDS = {'intermediate', 'wet'}
+
+
+def strategy_plan(strategy, table, total_laps):
+    """
+    Lap-by-lap arrays for a strategy: compound index, TyreLife and whether the car pits at the end of the lap.
+    """
+    laps = sum(stint_laps for _, stint_laps in strategy)
+    if laps != total_laps:
+        raise ValueError(f"Strategy {strategy} covers {laps} laps, expected {total_laps}.")
+
+    compound_idx = np.concatenate([np.full(n, table.compound_index(c)) for c, n in strategy])
+    tyre_life = np.concatenate([np.arange(1, n + 1) for _, n in strategy])
+    pit_after = np.zeros(total_laps, dtype=bool)
+    pit_after[np.cumsum([n for _, n in strategy])[:-1] - 1] = True
+    return compound_idx, tyre_life, pit_after
+
+
+def sample_scenarios(n_scenarios, total_laps, rng, track_temp, temp_offsets, params=None):
+    """
+    Sample race scenarios as (n_scenarios, total_laps) arrays.
+
+    temp_offsets: allowed TrackTemp shifts; each scenario draws one (nearest to a normal sample)
+    Returns a dict with sc, vsc (bool), rain (intensity 0..1), noise (seconds),
+    temp_bucket (index into temp_offsets, per scenario) and track_temp (per scenario).
+    """
+    p = dict(DEFAULT_SCENARIO_PARAMS, **(params or {}))
+    lap = np.arange(1, total_laps + 1)[None, :]
+
+    def neutralisation(prob, lengths):
+        active = rng.random(n_scenarios) < prob
+        start = rng.integers(1, total_laps + 1, n_scenarios)
+        length = rng.integers(lengths[0], lengths[1], n_scenarios)
+        return active[:, None] & (lap >= start[:, None]) & (lap < (start + length)[:, None])
+
+    sc = neutralisation(p['sc_prob'], p['sc_laps'])
+    vsc = neutralisation(p['vsc_prob'], p['vsc_laps']) & ~sc
+
+    raining = rng.random(n_scenarios) < p['rain_prob']
+    onset = rng.integers(1, total_laps + 1, n_scenarios)
+    peak = rng.uniform(0.2, 1.0, n_scenarios)
+    ramp = np.clip((lap - onset[:, None] + 1) / p['rain_ramp_laps'], 0, 1)
+    rain = np.where(raining[:, None], ramp * peak[:, None], 0.0)
+
+    shift = rng.normal(0, p['track_temp_std'], n_scenarios)
+    temp_bucket = np.abs(shift[:, None] - np.asarray(temp_offsets)[None, :]).argmin(axis=1)
+
+    return {
+        'sc': sc,
+        'vsc': vsc,
+        'rain': rain,
+        'noise': rng.normal(0, p['lap_noise_std'], (n_scenarios, total_laps)),
+        'temp_bucket': temp_bucket,
+        'track_temp': track_temp + np.asarray(temp_offsets)[temp_bucket],
+    }
+
+
+def _simulate_chunk(seed, n_scenarios, base_times, pit_after, slick, track_temp, temp_offsets, pit_loss, params):
+    """
+    Finishing times of every strategy in one chunk of scenarios.
+
+    base_times: (n_buckets, n_strategies, total_laps) lap times per TrackTemp bucket
+    Returns an (n_strategies, n_scenarios) array.
+    """
+    p = dict(DEFAULT_SCENARIO_PARAMS, **(params or {}))
+    rng = np.random.default_rng(seed)
+    total_laps = base_times.shape[2]
+    s = sample_scenarios(n_scenarios, total_laps, rng, track_temp, temp_offsets, p)
+
+    lap_factor = np.where(s['sc'], p['sc_lap_factor'], np.where(s['vsc'], p['vsc_lap_factor'], 1.0))
+    pit_cost = pit_loss * np.where(s['sc'], p['sc_pit_factor'], np.where(s['vsc'], p['vsc_pit_factor'], 1.0))
+
+    # Slick penalty in the rain, following the weather_rules crossover
+    scenario_temp = s['track_temp'][:, None]
+    crossover = is_crossover_to_inters(scenario_temp, s['rain'])
+    damp = (s['rain'] > 0) & ~should_stay_out_on_softs(s['rain'])
+    rain_penalty = s['rain'] * np.where(crossover, p['slick_rain_penalty'], np.where(damp, p['damp_rain_penalty'], 0.0))
+
+    totals = np.empty((base_times.shape[1], n_scenarios))
+    for bucket in np.unique(s['temp_bucket']):
+        in_bucket = s['temp_bucket'] == bucket
+        totals[:, in_bucket] = base_times[bucket] @ lap_factor[in_bucket].T
+
+    totals += pit_after @ pit_cost.T
+    totals += slick @ rain_penalty.T
+    totals += s['noise'].sum(axis=1)[None, :]
+    return totals
+
+
+def simulate_monte_carlo(strategies, model, weather_inputs, total_laps, n_scenarios=10_000, pit_loss=20,
+                         params=None, n_workers=None, chunk_size=2_000, seed=42, table_cache=None):
+    """
+    Evaluate candidate strategies against many sampled race scenarios at once.
+
+    Scenarios vary safety car / VSC timing, rain onset and intensity, TrackTemp and lap time noise.
+    All strategies see the same scenarios, so their finishing times are directly comparable.
+    Scenario chunks are spread over a process pool (n_workers=1 runs in-process).
+
+    strategies: list of strategies like [("Soft", 30), ("Medium", 48)]
+    model: TirePerformanceModel or CompiledTireModel
+    weather_inputs: dict with keys: 'TrackTemp', 'AirTemp', 'Pressure'
+    params: overrides for DEFAULT_SCENARIO_PARAMS
+    table_cache: optional LapTimeTableCache to reuse lap time tables between calls
+
+    Returns (summary, finishing_times): a DataFrame with mean/std/percentiles and the share of
+    scenarios each strategy wins, and the raw (n_strategies, n_scenarios) array.
+    """
+    p = dict(DEFAULT_SCENARIO_PARAMS, **(params or {}))
+    compounds = sorted({compound.lower() for strat in strategies for compound, _ in strat})
+    if table_cache is None:
+        table_cache = LapTimeTableCache(model, compounds, max_tyre_life=total_laps, maxsize=64)
+
+    # TrackTemp shifts are snapped to the table quantum so each bucket is one cached table
+    step = table_cache.quantum.get('TrackTemp', 1.0)
+    max_shift = 3 * p['track_temp_std']
+    temp_offsets = np.arange(-max_shift, max_shift + step, step) if max_shift > 0 else np.zeros(1)
+
+    tables = [
+        table_cache.get_table(dict(weather_inputs, TrackTemp=weather_inputs['TrackTemp'] + offset))
+        for offset in temp_offsets
+    ]
+    plans = [strategy_plan(strat, tables[0], total_laps) for strat in strategies]
+    compound_idx = np.array([plan[0] for plan in plans])
+    tyre_life = np.array([plan[1] for plan in plans])
+    pit_after = np.array([plan[2] for plan in plans], dtype=float)
+    is_slick = np.array([c.lower() not in WET_COMPOUNDS for c in tables[0].compounds])
+    slick = is_slick[compound_idx].astype(float)
+
+    # (n_buckets, n_strategies, total_laps) lap times, gathered from each bucket's table
+    base_times = np.array([table.lap_times[compound_idx, tyre_life] for table in tables])
+
+    chunks = [chunk_size] * (n_scenarios // chunk_size)
+    if n_scenarios % chunk_size:
+        chunks.append(n_scenarios % chunk_size)
+    seeds = np.random.SeedSequence(seed).spawn(len(chunks))
+    args = [
+        (chunk_seed, n, base_times, pit_after, slick, weather_inputs['TrackTemp'], temp_offsets, pit_loss, p)
+        for chunk_seed, n in zip(seeds, chunks)
+    ]
+
+    n_workers = n_workers or os.cpu_count() or 1
+    if n_workers == 1 or len(chunks) == 1:
+        parts = [_simulate_chunk(*a) for a in args]
+    else:
+        with ProcessPoolExecutor(max_workers=min(n_workers, len(chunks))) as pool:
+            parts = list(pool.map(_simulate_chunk, *zip(*args)))
+
+    finishing_times = np.concatenate(parts, axis=1)
+    winners = np.bincount(finishing_times.argmin(axis=0), minlength=len(strategies))
+
+    summary = pd.DataFrame({
+        'strategy': strategies,
+        'mean_time': finishing_times.mean(axis=1),
+        'std_time': finishing_times.std(axis=1),
+        'p05_time': np.percentile(finishing_times, 5, axis=1),
+        'p50_time': np.percentile(finishing_times, 50, axis=1),
+        'p95_time': np.percentile(finishing_times, 95, axis=1),
+        'win_share': winners / finishing_times.shape[1],
+    }).sort_values('mean_time')
+
+    return summary, finishing_times
@@ -0,0 +1,194 @@
+# models/monaco_simulation/pit_strategy_env.py
+
+import numpy as np
+from .lap_time_tables import LapTimeTableCache, supported_compounds
+from .monte_carlo_simulator import DEFAULT_SCENARIO_PARAMS, WET_COMPOUNDS, strategy_plan
+from .weather_rules import is_crossover_to_inters, should_stay_out_on_softs
+
+DEFAULT_COMPOUNDS = ['Soft', 'Medium', 'Hard', 'Intermediate', 'Wet']
+
+DEFAULT_ENV_PARAMS = dict(
+    DEFAULT_SCENARIO_PARAMS,
+    wet_dry_penalty=4.0,        # seconds per lap on wets/inters on a dry track
+    compound_rule_penalty=60.0, # dry race finished without using two different dry compounds
+)
+
+# Observation columns, in order
+OBS_NAMES = ['lap_fraction', 'tyre_life', 'compound', 'track_temp', 'rain', 'gap']
+
+
+class PitStrategyEnv:
+    """
+    Gym-style pit strategy environment that steps n_envs independent races in lockstep.
+
+    Every step is one lap for all races. Action 0 stays out, action k pits for compounds[k-1];
+    on the first step an action only picks the starting tyre (no pit loss). Reward is minus
+    the lap time including pit loss, so the episode return is minus the race time.
+
+    Lap times come from LapTimeTables of the tire model (one per TrackTemp bucket), plus the
+    same rain penalties as the Monte Carlo simulator and lap time noise. All per-race randomness
+    (TrackTemp shift, rain onset and intensity, noise) is drawn in reset(), so vectorized=False
+    runs the same races lap by lap in plain Python as a reference for checking correctness.
+
+    The gap observation is own race time minus that of a rival on rival_strategy
+    (by default half the race on each of the first two compounds) in dry conditions.
+    """
+
+    def __init__(self, model, weather_inputs, total_laps, n_envs=1024, compounds=None, pit_loss=20,
+                 params=None, rival_strategy=None, seed=None, vectorized=True, table_cache=None):
+        self.p = dict(DEFAULT_ENV_PARAMS, **(params or {}))
+        self.total_laps = total_laps
+        self.n_envs = n_envs
+        # By default every compound of DEFAULT_COMPOUNDS the model was trained on
+        self.compounds = list(compounds) if compounds is not None else supported_compounds(model, DEFAULT_COMPOUNDS)
+        self.pit_loss = pit_loss
+        self.vectorized = vectorized
+        self.rng = np.random.default_rng(seed)
+        self.weather_inputs = dict(weather_inputs)
+
+        if table_cache is None:
+            table_cache = LapTimeTableCache(model, self.compounds, max_tyre_life=total_laps, maxsize=64)
+        step = table_cache.quantum.get('TrackTemp', 1.0)
+        max_shift = 3 * self.p['track_temp_std']
+        self.temp_offsets = np.arange(-max_shift, max_shift + step, step) if max_shift > 0 else np.zeros(1)
+        tables = [table_cache.get_table(dict(weather_inputs, TrackTemp=weather_inputs['TrackTemp'] + offset))
+                  for offset in self.temp_offsets]
+
+        # (n_buckets, n_compounds, total_laps + 1) lap times, indexed by TyreLife
+        self.lap_times = np.stack([[table.lap_times[table.compound_index(c)] for c in self.compounds] for table in tables])
+        self.is_slick = np.array([c.lower() not in WET_COMPOUNDS for c in self.compounds])
+
+        if rival_strategy is None:
+            rival_strategy = [(self.compounds[0], total_laps // 2), (self.compounds[1], total_laps - total_laps // 2)]
+        compound_idx, tyre_life, pit_after = strategy_plan(rival_strategy, tables[0], total_laps)
+        rival_laps = tables[0].lap_times[compound_idx, tyre_life] + np.r_[0, pit_after[:-1]] * pit_loss
+        self.rival_times = np.r_[0.0, np.cumsum(rival_laps)]
+
+        self.n_actions = len(self.compounds) + 1
+        self.reset()
+
+    def reset(self, start_compound=0):
+        """Draw new races and return the first observation, (n_envs, len(OBS_NAMES))."""
+        n, laps, p = self.n_envs, self.total_laps, self.p
+
+        shift = self.rng.normal(0, p['track_temp_std'], n)
+        self.temp_bucket = np.abs(shift[:, None] - self.temp_offsets[None, :]).argmin(axis=1)
+        self.track_temp = self.weather_inputs['TrackTemp'] + self.temp_offsets[self.temp_bucket]
+
+        lap = np.arange(1, laps + 1)[None, :]
+        raining = self.rng.random(n) < p['rain_prob']
+        onset = self.rng.integers(1, laps + 1, n)
+        peak = self.rng.uniform(0.2, 1.0, n)
+        ramp = np.clip((lap - onset[:, None] + 1) / p['rain_ramp_laps'], 0, 1)
+        self.rain = np.where(raining[:, None], ramp * peak[:, None], 0.0)
+        self.noise = self.rng.normal(0, p['lap_noise_std'], (n, laps))
+        self.dry_race = ~raining
+
+        self.lap = 0
+        self.tyre_life = np.zeros(n, dtype=np.int64)
+        self.compound = np.full(n, start_compound, dtype=np.int64)
+        self.used = np.zeros((n, len(self.compounds)), dtype=bool)
+        self.race_time = np.zeros(n)
+        return self._observe()
+
+    def _observe(self):
+        rain_now = self.rain[:, max(self.lap - 1, 0)]
+        return np.column_stack([
+            np.full(self.n_envs, self.lap / self.total_laps),
+            self.tyre_life,
+            self.compound,
+            self.track_temp,
+            rain_now,
+            self.race_time - self.rival_times[self.lap],
+        ]).astype(np.float32)
+
+    def step(self, actions):
+        """Run one lap for every race. Returns (obs, reward, done, info) with per-env arrays."""
+        if self.lap >= self.total_laps:
+            raise ValueError("Episode finished; call reset() first.")
+        actions = np.asarray(actions, dtype=np.int64)
+        if actions.shape != (self.n_envs,) or actions.min() < 0 or actions.max() >= self.n_actions:
+            raise ValueError(f"actions must be {self.n_envs} integers in [0, {self.n_actions}).")
+
+        lap_time = self._step_vectorized(actions) if self.vectorized else self._step_scalar(actions)
+        self.race_time += lap_time
+        self.lap += 1
+
+        done = self.lap == self.total_laps
+        reward = -lap_time
+        if done:
+            # Dry races must use at least two different dry compounds
+            dry_compounds_used = (self.used & self.is_slick[None, :]).sum(axis=1)
+            broken_rule = self.dry_race & (dry_compounds_used < 2)
+            reward = reward - broken_rule * self.p['compound_rule_penalty']
+            self.race_time += broken_rule * self.p['compound_rule_penalty']
+
+        return self._observe(), reward, np.full(self.n_envs, done), {'race_time': self.race_time.copy()}
+
+    def _step_vectorized(self, actions):
+        pit = actions > 0
+        self.compound = np.where(pit, actions - 1, self.compound)
+        self.tyre_life = np.where(pit, 1, self.tyre_life + 1)
+        self.used[np.arange(self.n_envs), self.compound] = True
+
+        life = np.minimum(self.tyre_life, self.total_laps)
+        lap_time = self.lap_times[self.temp_bucket, self.compound, life] + self.noise[:, self.lap]
+        if self.lap > 0:
+            lap_time = lap_time + pit * self.pit_loss
+
+        rain = self.rain[:, self.lap]
+        slick = self.is_slick[self.compound]
+        crossover = is_crossover_to_inters(self.track_temp, rain)
+        damp = (rain > 0) & ~should_stay_out_on_softs(rain)
+        slick_penalty = rain * np.where(crossover, self.p['slick_rain_penalty'], np.where(damp, self.p['damp_rain_penalty'], 0.0))
+        return lap_time + np.where(slick, slick_penalty, (rain == 0) * self.p['wet_dry_penalty'])
+
+    def _step_scalar(self, actions):
+        lap_time = np.empty(self.n_envs)
+        for i in range(self.n_envs):
+            action = int(actions[i])
+            if action > 0:
+                self.compound[i] = action - 1
+                self.tyre_life[i] = 1
+            else:
+                self.tyre_life[i] += 1
+            compound = int(self.compound[i])
+            self.used[i, compound] = True
+
+            time = self.lap_times[self.temp_bucket[i], compound, min(int(self.tyre_life[i]), self.total_laps)]
+            time += self.noise[i, self.lap]
+            if action > 0 and self.lap > 0:
+                time += self.pit_loss
+
+            rain = self.rain[i, self.lap]
+            if self.is_slick[compound]:
+                if is_crossover_to_inters(self.track_temp[i], rain):
+                    time += rain * self.p['slick_rain_penalty']
+                elif rain > 0 and not should_stay_out_on_softs(rain):
+                    time += rain * self.p['damp_rain_penalty']
+            elif rain == 0:
+                time += self.p['wet_dry_penalty']
+            lap_time[i] = time
+        return lap_time
+
+
+def check_reference_mode(model, weather_inputs, total_laps, n_envs=64, seed=0, atol=1e-9, **kwargs):
+    """
+    Run random actions through the vectorized and scalar environments on the same races and
+    raise ValueError if any observation or reward differs. Returns the largest difference.
+    """
+    vector_env = PitStrategyEnv(model, weather_inputs, total_laps, n_envs, seed=seed, vectorized=True, **kwargs)
+    scalar_env = PitStrategyEnv(model, weather_inputs, total_laps, n_envs, seed=seed, vectorized=False, **kwargs)
+    policy = np.random.default_rng(seed + 1)
+
+    worst = 0.0
+    for _ in range(total_laps):
+        # Mostly stay out, sometimes pit for a random compound
+        actions = np.where(policy.random(n_envs) < 0.05, policy.integers(1, vector_env.n_actions, n_envs), 0)
+        vector_obs, vector_reward, _, _ = vector_env.step(actions)
+        scalar_obs, scalar_reward, _, _ = scalar_env.step(actions)
+        worst = max(worst, np.abs(vector_obs - scalar_obs).max(), np.abs(vector_reward - scalar_reward).max())
+
+    if worst > atol:
+        raise ValueError(f"Vectorized and scalar environments differ by up to {worst:.3g}.")
+    return worst
@@ -0,0 +1,199 @@
+# models/monaco_simulation/race_simulator.py
+
+import heapq
+import numpy as np
+import pandas as pd
+
+# Default traffic settings, tuned for Monaco where passing is rare
+DEFAULT_TRAFFIC_PARAMS = {
+    'grid_gap': 0.25,             # seconds between grid slots crossing the line on lap 0
+    'dirty_air_window': 1.0,      # following closer than this (s) costs lap time
+    'dirty_air_penalty': 0.5,     # seconds lost per lap when right on the gearbox
+    'min_gap': 0.3,               # closest a car can cross the line behind the car it failed to pass
+    'overtake_base_prob': 0.03,   # chance of a pass with equal pace
+    'overtake_pace_scale': 0.08,  # extra chance per second of pace advantage
+    'lap_noise_std': 0.2,
+}
+
+
+def simulate_race(cars, table, total_laps, pit_loss=20, params=None, seed=None):
+    """
+    Event-driven simulation of the full field with traffic.
+
+    Each lap completion is an event in a priority queue ordered by time. When a car crosses
+    the line its next lap is scheduled from the tire table plus dirty-air penalty and noise;
+    if that would take it past the car ahead on the road it needs an overtake roll, otherwise
+    it is held min_gap behind. Cars a lap or more down are passed under blue flags without a
+    roll (and without counting as an overtake). Pit stops add pit_loss to the out-lap, so the rejoin position
+    follows from where the car comes out in the queue.
+
+    cars: list of dicts in grid order with keys 'driver', 'strategy' (list of (compound, laps))
+          and optional 'pace_offset' (seconds per lap relative to the table)
+    table: LapTimeTable covering the compounds used
+
+    Returns a dict with:
+        results: DataFrame of driver, position, finish_time, gap_to_winner, stops, overtakes
+        lap_positions: (n_cars, total_laps) array of positions at the end of each lap
+        pit_stops: DataFrame of driver, lap, compound and rejoin_position
+    """
+    p = dict(DEFAULT_TRAFFIC_PARAMS, **(params or {}))
+    rng = np.random.default_rng(seed)
+    n_cars = len(cars)
+
+    # Random draws are made up front so the event loop stays in plain Python
+    noise = rng.normal(0, p['lap_noise_std'], (n_cars, total_laps + 1))
+    overtake_roll = rng.random((n_cars, total_laps + 1))
+
+    # Lap on which each car pits (end of each stint but the last) and the compound it fits
+    pit_plan = []
+    for car in cars:
+        stops, lap = {}, 0
+        for (_, stint_laps), (next_compound, _) in zip(car['strategy'][:-1], car['strategy'][1:]):
+            lap += stint_laps
+            stops[lap] = next_compound
+        pit_plan.append(stops)
+
+    compound = [table.compound_index(car['strategy'][0][0]) for car in cars]
+    tyre_life = [0] * n_cars
+    pace_offset = [car.get('pace_offset', 0.0) for car in cars]
+    lap_times = table.lap_times
+    max_life = table.max_tyre_life
+
+    last_crossing_time = [0.0] * n_cars
+    next_cross = [0.0] * n_cars
+    laps_done = [0] * n_cars
+    in_pit = [False] * n_cars
+    finished = [False] * n_cars
+    finish_time = [np.nan] * n_cars
+    overtakes = [0] * n_cars
+    lap_positions = np.zeros((n_cars, total_laps), dtype=int)
+    crossings_per_lap = [0] * (total_laps + 1)
+    pit_stops = []
+    pending_rejoin = {}
+
+    # Road order at the line: the last car to cross and when
+    last_car, last_time = None, -np.inf
+
+    events = []
+    for i in range(n_cars):
+        # Lap 0 crossing puts the grid in order
+        heapq.heappush(events, (i * p['grid_gap'], i, 0))
+
+    while events:
+        t, i, lap = heapq.heappop(events)
+
+        if lap > 0:
+            crossings_per_lap[lap] += 1
+            position = crossings_per_lap[lap]
+            lap_positions[i, lap - 1] = position
+            if i in pending_rejoin:
+                pit_stops[pending_rejoin.pop(i)]['rejoin_position'] = position
+
+        laps_done[i] = lap
+        interval = t - last_time
+        car_ahead = last_car
+        last_car, last_time = i, t
+
+        if lap == total_laps:
+            finished[i] = True
+            finish_time[i] = t
+            continue
+
+        # Pit at the end of this lap: new tyres, pit_loss on the out-lap
+        pitting = lap in pit_plan[i]
+        if pitting:
+            compound[i] = table.compound_index(pit_plan[i][lap])
+            tyre_life[i] = 0
+            pending_rejoin[i] = len(pit_stops)
+            pit_stops.append({'driver': cars[i]['driver'], 'lap': lap, 'compound': pit_plan[i][lap], 'rejoin_position': None})
+        in_pit[i] = pitting
+
+        tyre_life[i] += 1
+        lap_time = lap_times[compound[i], min(tyre_life[i], max_life)] + pace_offset[i] + noise[i, lap]
+        if car_ahead is not None and interval < p['dirty_air_window']:
+            lap_time += p['dirty_air_penalty'] * (1 - interval / p['dirty_air_window'])
+        if pitting:
+            lap_time += pit_loss
+
+        proposed = t + lap_time
+
+        # Catching the car ahead on the road: pass or stay behind it
+        if car_ahead is not None and not pitting and not finished[car_ahead]:
+            ahead_next = next_cross[car_ahead]
+            if proposed < ahead_next + p['min_gap']:
+                # Blue flags: a car a lap or more down lets the faster car through
+                lapped = laps_done[car_ahead] < lap
+                if in_pit[car_ahead] or lapped:
+                    pass_made = True
+                else:
+                    pace_gain = (ahead_next - last_crossing_time[car_ahead]) - lap_time
+                    pass_prob = p['overtake_base_prob'] + p['overtake_pace_scale'] * max(pace_gain, 0.0)
+                    pass_made = overtake_roll[i, lap] < pass_prob
+                if pass_made:
+                    overtakes[i] += int(proposed < ahead_next and not lapped)
+                else:
+                    proposed = ahead_next + p['min_gap']
+
+        last_crossing_time[i] = t
+        next_cross[i] = proposed
+        heapq.heappush(events, (proposed, i, lap + 1))
+
+    finish_time = np.array(finish_time)
+    order = np.argsort(finish_time, kind='stable')
+    positions = np.empty(n_cars, dtype=int)
+    positions[order] = np.arange(1, n_cars + 1)
+
+    results = pd.DataFrame({
+        'driver': [car['driver'] for car in cars],
+        'position': positions,
+        'finish_time': finish_time,
+        'gap_to_winner': finish_time - finish_time.min(),
+        'stops': [len(plan) for plan in pit_plan],
+        'overtakes': overtakes,
+    }).sort_values('position').reset_index(drop=True)
+
+    return {
+        'results': results,
+        'lap_positions': lap_positions,
+        'pit_stops': pd.DataFrame(pit_stops, columns=['driver', 'lap', 'compound', 'rejoin_position']),
+    }
+
+
+def shift_first_stop(strategy, laps):
+    """Move the first stop `laps` laps later (negative = earlier), keeping the race distance."""
+    (first_compound, first_laps), (second_compound, second_laps) = strategy[0], strategy[1]
+    return [(first_compound, first_laps + laps), (second_compound, second_laps - laps)] + list(strategy[2:])
+
+
+def compare_pit_laps(cars, table, total_laps, driver, shifts=range(-5, 6), n_runs=200, pit_loss=20, params=None, seed=42):
+    """
+    Undercut/overcut what-ifs: rerun the race with `driver`'s first stop moved by each shift.
+
+    Every shift is run with the same n_runs seeds so differences come from the strategy only.
+    Returns a DataFrame with the mean and spread of the driver's finishing position and time per shift.
+    """
+    driver_idx = next(i for i, car in enumerate(cars) if car['driver'] == driver)
+    seeds = np.random.SeedSequence(seed).generate_state(n_runs)
+
+    rows = []
+    for shift in shifts:
+        variant = list(cars)
+        variant[driver_idx] = dict(cars[driver_idx], strategy=shift_first_stop(cars[driver_idx]['strategy'], shift))
+
+        positions, times = [], []
+        for run_seed in seeds:
+            results = simulate_race(variant, table, total_laps, pit_loss, params, seed=int(run_seed))['results']
+            row = results[results['driver'] == driver].iloc[0]
+            positions.append(row['position'])
+            times.append(row['finish_time'])
+
+        rows.append({
+            'shift': shift,
+            'first_stop_lap': variant[driver_idx]['strategy'][0][1],
+            'mean_position': np.mean(positions),
+            'best_position': np.min(positions),
+            'worst_position': np.max(positions),
+            'mean_finish_time': np.mean(times),
+        })
+
+    return pd.DataFrame(rows)
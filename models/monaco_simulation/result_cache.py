@@ -0,0 +1,240 @@
+# models/monaco_simulation/result_cache.py
+
+import os
+import json
+import time
+import hashlib
+import threading
+from collections import OrderedDict
+from pathlib import Path
+import joblib
+import numpy as np
+from .data_utils import atomic_file, build_lap_features
+from .monaco_test_simulator import simulate_strategies_batch
+
+RESULT_CACHE_FOLDER = Path(__file__).parent / "result_cache"
+
+
+def model_fingerprint(model):
+    """
+    Content hash of a fitted model's state (its public attributes: pipeline, feature_names,
+    degree, or the CompiledTireModel arrays). Private attributes are lazily filled caches,
+    such as the schema bound on the first predict_array, and are left out so predicting
+    never changes the key. Computed on every call (well under a millisecond for the tire
+    models), so a model that is refitted in place, or a re-registered bundle, never reuses
+    the previous model's results.
+    """
+    state = getattr(model, '__dict__', None)
+    if state is None:
+        return joblib.hash(model)
+    return joblib.hash((type(model).__qualname__, {key: value for key, value in state.items() if not key.startswith('_')}))
+
+
+def _canonical(value):
+    """JSON-ready form of value where equal inputs always serialise the same way."""
+    if isinstance(value, dict):
+        return {str(key): _canonical(value[key]) for key in sorted(value, key=str)}
+    if isinstance(value, (list, tuple)):
+        return [_canonical(item) for item in value]
+    if isinstance(value, np.ndarray):
+        return {'shape': list(value.shape), 'data': _canonical(value.ravel().tolist())}
+    if isinstance(value, np.generic):
+        return _canonical(value.item())
+    if isinstance(value, int) and not isinstance(value, bool):
+        # 40 and 40.0 are the same input
+        value = float(value)
+    if isinstance(value, float):
+        # -0.0 == 0.0 and NaN != NaN would otherwise give different keys for the same input
+        return 'nan' if value != value else repr(value + 0.0)
+    if value is None or isinstance(value, (bool, str)):
+        return value
+    raise ValueError(f"Cannot build a cache key from {type(value).__name__}.")
+
+
+def input_hash(namespace, model_version, inputs):
+    """sha256 of (namespace, model version, canonicalised inputs)."""
+    payload = json.dumps([namespace, model_version, _canonical(inputs)], separators=(',', ':'))
+    return hashlib.sha256(payload.encode()).hexdigest()
+
+
+class ResultCache:
+    """
+    Two-tier cache of simulation and prediction results keyed by model version + input hash.
+
+    Memory tier: LRU of up to maxsize results. Disk tier (when cache_dir is given): one joblib
+    file per result, shared between processes and runs, trimmed to max_disk_mb by dropping
+    the least recently used files. Results older than ttl seconds (None = never) count as
+    misses and are removed. Disk hits are promoted to the memory tier.
+
+    The model version in the key is the model's current content fingerprint (or an explicit
+    model_version such as "tire_model_poly2:v3"), so a changed model never sees old results.
+    """
+
+    def __init__(self, maxsize=256, ttl=None, cache_dir=None, max_disk_mb=256):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.cache_dir = Path(cache_dir) if cache_dir is not None else None
+        self.max_disk_bytes = max_disk_mb * 1024 * 1024
+        if self.cache_dir is not None:
+            self.cache_dir.mkdir(parents=True, exist_ok=True)
+
+        self._memory = OrderedDict()  # key -> (stored_at, value)
+        self._lock = threading.RLock()
+        self.memory_hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+
+    def _expired(self, stored_at):
+        return self.ttl is not None and time.time() - stored_at > self.ttl
+
+    def _disk_path(self, key):
+        return self.cache_dir / f"{key}.joblib"
+
+    def _get_memory(self, key):
+        entry = self._memory.get(key)
+        if entry is None:
+            return None
+        if self._expired(entry[0]):
+            del self._memory[key]
+            self.expirations += 1
+            return None
+        self._memory.move_to_end(key)
+        return entry
+
+    def _get_disk(self, key):
+        if self.cache_dir is None:
+            return None
+        path = self._disk_path(key)
+        try:
+            stored_at, value = joblib.load(path)
+        except FileNotFoundError:
+            return None
+        except Exception:
+            # Truncated or unreadable file: treat as a miss and let the next put rewrite it
+            path.unlink(missing_ok=True)
+            return None
+        if self._expired(stored_at):
+            path.unlink(missing_ok=True)
+            self.expirations += 1
+            return None
+        # The access time drives LRU trimming of the disk tier
+        os.utime(path)
+        return stored_at, value
+
+    def _put_memory(self, key, stored_at, value):
+        self._memory[key] = (stored_at, value)
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.maxsize:
+            self._memory.popitem(last=False)
+            self.evictions += 1
+
+    def _put_disk(self, key, stored_at, value):
+        if self.cache_dir is None:
+            return
+        with atomic_file(self._disk_path(key)) as staging:
+            joblib.dump((stored_at, value), staging)
+        self._trim_disk()
+
+    def _trim_disk(self):
+        files = []
+        for path in self.cache_dir.glob("*.joblib"):
+            try:
+                stat = path.stat()
+            except FileNotFoundError:
+                continue
+            files.append((stat.st_mtime, stat.st_size, path))
+        total = sum(size for _, size, _ in files)
+        for _, size, path in sorted(files):
+            if total <= self.max_disk_bytes:
+                break
+            path.unlink(missing_ok=True)
+            total -= size
+            self.evictions += 1
+
+    def key(self, namespace, model, inputs, model_version=None):
+        version = model_version if model_version is not None else model_fingerprint(model)
+        return input_hash(namespace, version, inputs)
+
+    def get(self, key):
+        """Cached value for key, or None (expired entries are dropped)."""
+        with self._lock:
+            entry = self._get_memory(key)
+            if entry is not None:
+                self.memory_hits += 1
+                return entry[1]
+            entry = self._get_disk(key)
+            if entry is not None:
+                self.disk_hits += 1
+                self._put_memory(key, *entry)
+                return entry[1]
+            self.misses += 1
+            return None
+
+    def put(self, key, value):
+        with self._lock:
+            stored_at = time.time()
+            self._put_memory(key, stored_at, value)
+            self._put_disk(key, stored_at, value)
+
+    def get_or_compute(self, namespace, model, inputs, compute, model_version=None):
+        """
+        Return the cached result of compute() for (namespace, model, inputs), running it on a miss.
+        inputs must hold everything compute depends on apart from the model.
+        """
+        key = self.key(namespace, model, inputs, model_version)
+        value = self.get(key)
+        if value is None:
+            value = compute()
+            self.put(key, value)
+        return value
+
+    def invalidate(self):
+        """Drop every cached result from both tiers."""
+        with self._lock:
+            self._memory.clear()
+            if self.cache_dir is not None:
+                for path in self.cache_dir.glob("*.joblib"):
+                    path.unlink(missing_ok=True)
+
+    def stats(self):
+        with self._lock:
+            lookups = self.memory_hits + self.disk_hits + self.misses
+            disk_files = list(self.cache_dir.glob("*.joblib")) if self.cache_dir is not None else []
+            return {
+                'memory_hits': self.memory_hits,
+                'disk_hits': self.disk_hits,
+                'misses': self.misses,
+                'hit_rate': (self.memory_hits + self.disk_hits) / lookups if lookups else 0.0,
+                'evictions': self.evictions,
+                'expirations': self.expirations,
+                'memory_entries': len(self._memory),
+                'disk_entries': len(disk_files),
+                'disk_mb': sum(path.stat().st_size for path in disk_files) / (1024 * 1024),
+            }
+
+
+def cached_strategies_batch(strategies, model, weather_inputs, pit_loss=20, cache=None, model_version=None):
+    """simulate_strategies_batch through a ResultCache (no caching when cache is None)."""
+    if cache is None:
+        return simulate_strategies_batch(strategies, model, weather_inputs, pit_loss=pit_loss)
+    inputs = {'strategies': strategies, 'weather': weather_inputs, 'pit_loss': pit_loss}
+    result = cache.get_or_compute('strategies_batch', model, inputs,
+                                  lambda: simulate_strategies_batch(strategies, model, weather_inputs, pit_loss=pit_loss),
+                                  model_version)
+    # Callers may modify the returned frame; keep the cached one intact
+    return result.copy()
+
+
+def cached_lap_times(model, compound, tyre_life, weather_inputs, cache=None, model_version=None):
+    """Predicted lap times for one compound over tyre_life values, through a ResultCache."""
+    tyre_life = np.atleast_1d(np.asarray(tyre_life, dtype=float))
+
+    def compute():
+        return model.predict_array(build_lap_features(model.feature_names, compound, tyre_life, weather_inputs))
+
+    if cache is None:
+        return compute()
+    inputs = {'compound': compound.lower(), 'tyre_life': tyre_life, 'weather': weather_inputs}
+    return cache.get_or_compute('lap_times', model, inputs, compute, model_version).copy()
@@ -0,0 +1,134 @@
+# models/monaco_simulation/strategy_optimizer.py
+
+import numpy as np
+import pandas as pd
+
+
+def find_optimal_strategies(table, total_laps, pit_loss=20, min_stint=5, max_stint=None, top_k=5, distinct=True):
+    """
+    Best stint plans with any number of stops, by dynamic programming over a LapTimeTable.
+
+    Every plan uses at least two different compounds (mandatory compound rule), every stint
+    is between min_stint and max_stint laps, and each stop costs pit_loss seconds.
+
+    State is (laps completed, current compound, two-compounds-used flag); each state keeps its
+    top_k partial plans. With max_stint fixed the work grows linearly with total_laps.
+
+    Stint times depend only on compound and tyre life, so reordering the stints of a plan gives
+    exactly the same total. With distinct=True (default) each state keeps top_k plans with
+    different stint multisets, so the result is the top_k distinct plans, each in its fastest
+    order. distinct=False returns every ordering separately.
+
+    table: LapTimeTable, e.g. LapTimeTableCache(model, compounds, max_tyre_life=total_laps).get_table(weather)
+    max_stint: longest stint allowed, defaults to the table's max tyre life (capped at total_laps)
+
+    Returns a DataFrame with strategy (list of (compound, laps) like generate_stint_sequences),
+    total_time, n_stops and rank, fastest first.
+    """
+    stint_times = table.stint_times
+    n_compounds = len(table.compounds)
+    if max_stint is None:
+        max_stint = table.max_tyre_life
+    max_stint = min(max_stint, total_laps)
+    if max_stint > table.max_tyre_life:
+        raise ValueError(f"max_stint {max_stint} is longer than the table's max tyre life {table.max_tyre_life}.")
+
+    shape = (total_laps + 1, n_compounds, 2, top_k)
+    best = np.full(shape, np.inf)
+    # Back pointers to the previous state; prev_t == -1 marks the first stint
+    prev_t = np.full(shape, -1)
+    prev_c = np.full(shape, -1)
+    prev_d = np.full(shape, -1)
+    prev_k = np.full(shape, -1)
+
+    # Sorted (compound, laps) stints of each kept partial plan, keyed by state (t, c, d, k)
+    plan_keys = {}
+
+    compound_ids = np.arange(n_compounds)
+
+    for t in range(min_stint, total_laps + 1):
+        stint_lengths = np.arange(min_stint, min(max_stint, t - min_stint) + 1)
+
+        for c_new in range(n_compounds):
+            # Which previous (compound, flag) states may continue into (c_new, flag) states
+            same = compound_ids == c_new
+            valid = {
+                0: np.stack([same, np.zeros(n_compounds, dtype=bool)], axis=1),
+                1: np.stack([~same, np.ones(n_compounds, dtype=bool)], axis=1),
+            }
+
+            for d_new in (0, 1):
+                costs = (best[t - stint_lengths]
+                         + (stint_times[c_new, stint_lengths] + pit_loss)[:, None, None, None])
+                costs[:, ~valid[d_new], :] = np.inf
+                costs = costs.ravel()
+
+                # A first stint covering laps 1..t
+                first_stint = np.inf
+                if d_new == 0 and t <= max_stint:
+                    first_stint = stint_times[c_new, t]
+
+                candidates = np.append(costs, first_stint)
+                if distinct:
+                    # Duplicates are skipped, so more than top_k candidates may be needed
+                    order = np.argsort(candidates, kind='stable')
+                else:
+                    n_keep = min(top_k, len(candidates))
+                    order = np.argpartition(candidates, n_keep - 1)[:n_keep]
+                    order = order[np.argsort(candidates[order], kind='stable')]
+
+                seen = set()
+                k = 0
+                for flat in order:
+                    if k == top_k or not np.isfinite(candidates[flat]):
+                        break
+                    if flat == len(costs):
+                        state, stint = None, (c_new, t)
+                    else:
+                        n_idx, c, d, rank = np.unravel_index(flat, (len(stint_lengths), n_compounds, 2, top_k))
+                        state, stint = (t - stint_lengths[n_idx], c, d, rank), (c_new, int(stint_lengths[n_idx]))
+                    if distinct:
+                        key = tuple(sorted(plan_keys[state] + (stint,))) if state is not None else (stint,)
+                        if key in seen:
+                            continue
+                        seen.add(key)
+                        plan_keys[t, c_new, d_new, k] = key
+
+                    best[t, c_new, d_new, k] = candidates[flat]
+                    if state is not None:
+                        for pointers, value in zip((prev_t, prev_c, prev_d, prev_k), state):
+                            pointers[t, c_new, d_new, k] = value
+                    k += 1
+
+    # Finished plans must have used two compounds
+    final = best[total_laps, :, 1, :].ravel()
+    seen = set()
+    results = []
+    for flat in np.argsort(final, kind='stable'):
+        if len(results) == top_k or not np.isfinite(final[flat]):
+            break
+        c, k = np.unravel_index(flat, (n_compounds, top_k))
+        # The same plan can end on different compounds
+        if distinct:
+            if plan_keys[total_laps, c, 1, k] in seen:
+                continue
+            seen.add(plan_keys[total_laps, c, 1, k])
+        t, d = total_laps, 1
+        stints = []
+        while True:
+            pt = prev_t[t, c, d, k]
+            stints.append((table.compounds[c], int(t - max(pt, 0))))
+            if pt < 0:
+                break
+            t, c, d, k = pt, prev_c[t, c, d, k], prev_d[t, c, d, k], prev_k[t, c, d, k]
+
+        strategy = stints[::-1]
+        results.append({
+            'strategy': strategy,
+            'total_time': float(final[flat]),
+            'n_stops': len(strategy) - 1,
+        })
+
+    results = pd.DataFrame(results, columns=['strategy', 'total_time', 'n_stops'])
+    results['rank'] = np.arange(1, len(results) + 1)
+    return results
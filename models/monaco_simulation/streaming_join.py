@@ -0,0 +1,140 @@
+# models/monaco_simulation/streaming_join.py
+
+import heapq
+import numpy as np
+from .live_replay import GAP_FIELDS, WEATHER_FIELDS
+
+# Sample streams joined onto laps: kind -> (whether samples are per driver, fields joined onto each lap)
+SIDE_STREAMS = {'weather': (False, WEATHER_FIELDS), 'gap': (True, GAP_FIELDS)}
+
+
+class RingBuffer:
+    """
+    Fixed-capacity buffer of (time, values) samples that may arrive out of order.
+    When full, a new sample replaces the oldest one, so memory stays constant.
+    """
+
+    def __init__(self, capacity, fields):
+        self.fields = list(fields)
+        self.times = np.full(capacity, np.nan)
+        self.values = np.full((capacity, len(self.fields)), np.nan)
+
+    def insert(self, t, data):
+        """Store a sample; returns False if the buffer is full and the sample is older than all of it."""
+        empty = np.flatnonzero(np.isnan(self.times))
+        if len(empty):
+            slot = empty[0]
+        else:
+            slot = int(np.argmin(self.times))
+            if t < self.times[slot]:
+                return False
+        self.times[slot] = t
+        self.values[slot] = [data.get(field, np.nan) for field in self.fields]
+        return True
+
+    def nearest(self, t, tolerance, direction='nearest'):
+        """Values and time offset of the sample matching t like merge_asof, or None."""
+        delta = self.times - t
+        if direction == 'backward':
+            delta = np.where(delta <= 0, -delta, np.nan)
+        elif direction == 'forward':
+            delta = np.where(delta >= 0, delta, np.nan)
+        else:
+            delta = np.abs(delta)
+        if np.all(np.isnan(delta)):
+            return None
+        slot = int(np.nanargmin(delta))
+        if delta[slot] > tolerance:
+            return None
+        return self.values[slot], self.times[slot] - t
+
+
+class StreamingAsOfJoin:
+    """
+    Streaming counterpart of pd.merge_asof for live lap, weather and gap events.
+
+    Weather and gap samples go into ring buffers (one session-wide buffer for weather, one per
+    driver for gaps) of buffer_size samples each. Completed laps wait in a heap until the
+    watermark (latest event time seen minus allowed_lateness) has passed the lap time plus the
+    tolerance, so every sample that can still match has arrived as long as events are at
+    most allowed_lateness seconds out of order. The lap is then emitted with the nearest sample
+    of each stream within tolerance attached (NaN when there is none).
+
+    Events use the live_replay format: {'time', 'kind', 'driver', 'data'}.
+    """
+
+    def __init__(self, tolerance=60.0, allowed_lateness=5.0, buffer_size=16, direction='nearest',
+                 side_streams=SIDE_STREAMS):
+        if direction not in ('nearest', 'backward', 'forward'):
+            raise ValueError(f"Unknown direction '{direction}'.")
+        self.tolerance = tolerance
+        self.allowed_lateness = allowed_lateness
+        self.buffer_size = buffer_size
+        self.direction = direction
+        self.side_streams = {kind: (per_driver, list(fields)) for kind, (per_driver, fields) in side_streams.items()}
+
+        # Backward matches only look at earlier samples, so laps need not wait for later ones
+        self.horizon = 0.0 if direction == 'backward' else tolerance
+        self.buffers = {}
+        self.pending = []
+        self._seq = 0
+        self.max_time = -np.inf
+        self.late_laps = 0
+        self.dropped_samples = 0
+
+    @property
+    def watermark(self):
+        return self.max_time - self.allowed_lateness
+
+    def _buffer(self, kind, driver):
+        per_driver, fields = self.side_streams[kind]
+        key = (kind, driver if per_driver else None)
+        if key not in self.buffers:
+            self.buffers[key] = RingBuffer(self.buffer_size, fields)
+        return self.buffers[key]
+
+    def process(self, event):
+        """Add one event; returns the laps (possibly none) that became complete."""
+        kind = event['kind']
+        self.max_time = max(self.max_time, event['time'])
+
+        if kind in self.side_streams:
+            if not self._buffer(kind, event['driver']).insert(event['time'], event['data']):
+                self.dropped_samples += 1
+        elif kind == 'lap':
+            if event['time'] + self.horizon < self.watermark:
+                # Later than the lateness bound allows; joined with whatever is still buffered
+                self.late_laps += 1
+            heapq.heappush(self.pending, (event['time'], self._seq, event))
+            self._seq += 1
+
+        return self._emit(self.watermark)
+
+    def flush(self):
+        """Emit every pending lap (end of session)."""
+        return self._emit(np.inf)
+
+    def _emit(self, watermark):
+        ready = []
+        while self.pending and self.pending[0][0] + self.horizon <= watermark:
+            _, _, event = heapq.heappop(self.pending)
+            ready.append(self._join(event))
+        return ready
+
+    def _join(self, event):
+        joined = {'time': event['time'], 'driver': event['driver'], **event['data']}
+        for kind, (per_driver, fields) in self.side_streams.items():
+            buffer = self.buffers.get((kind, event['driver'] if per_driver else None))
+            match = buffer.nearest(event['time'], self.tolerance, self.direction) if buffer is not None else None
+            joined.update(zip(fields, match[0] if match else [np.nan] * len(fields)))
+            joined[f'{kind}_offset'] = match[1] if match else np.nan
+        return joined
+
+    def stats(self):
+        return {
+            'pending_laps': len(self.pending),
+            'buffers': len(self.buffers),
+            'late_laps': self.late_laps,
+            'dropped_samples': self.dropped_samples,
+            'watermark': self.watermark,
+        }
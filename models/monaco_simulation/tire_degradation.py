@@ -0,0 +1,97 @@
+# models/monaco_simulation/tire_degradation.py
+
+import numpy as np
+from .data_utils import SESSION_COLS
+
+STINT_COLS = ['Driver', 'Stint']
+
+# Lap time gained per lap as fuel burns off (~1.7 kg/lap at ~0.035 s/kg)
+FUEL_EFFECT_PER_LAP = 0.06
+
+
+def fuel_corrected_lap_times(laps, fuel_effect=FUEL_EFFECT_PER_LAP):
+    """
+    Lap times corrected to the fuel load at the start of the session.
+    Later laps run lighter, so they get fuel_effect seconds added per lap already run.
+    """
+    return laps['LapTime'].to_numpy(dtype=np.float64) + fuel_effect * (laps['LapNumber'].to_numpy(dtype=np.float64) - 1)
+
+
+def filter_representative_laps(laps, max_ratio=1.07):
+    """Drop in/out laps and laps slower than max_ratio × the session's fastest lap (like pick_quicklaps)."""
+    laps = laps.dropna(subset=['LapTime', 'TyreLife', 'LapNumber'])
+    for col in ['PitInTime', 'PitOutTime']:
+        if col in laps.columns:
+            laps = laps[laps[col].isna()]
+
+    keys = [col for col in SESSION_COLS if col in laps.columns]
+    fastest = laps.groupby(keys)['LapTime'].transform('min') if keys else laps['LapTime'].min()
+    return laps[laps['LapTime'] <= fastest * max_ratio]
+
+
+def stint_degradation(laps, fuel_effect=FUEL_EFFECT_PER_LAP, min_laps=3, filter_laps=True, max_ratio=1.07):
+    """
+    Fuel-corrected degradation of every (session, driver, stint) in one pass.
+
+    Fits corrected LapTime = intercept + slope × TyreLife per stint with closed-form least
+    squares: the per-stint sums are accumulated with np.bincount over integer stint codes,
+    so there is no per-stint model or Python loop.
+
+    Returns one row per stint with its key columns, Compound, laps, tyre life range,
+    slope (s per lap of tyre age), intercept (corrected pace on new tyres), mean corrected
+    pace and residual RMSE. Stints shorter than min_laps, or with a single tyre age, get NaN slopes.
+    """
+    if filter_laps:
+        laps = filter_representative_laps(laps, max_ratio)
+    keys = [col for col in SESSION_COLS if col in laps.columns] + STINT_COLS
+    laps = laps.dropna(subset=['LapTime', 'TyreLife', 'LapNumber'] + STINT_COLS)
+    if laps.empty:
+        raise ValueError("No laps left after filtering.")
+
+    codes = laps.groupby(keys, sort=True, dropna=False).ngroup().to_numpy()
+    n_stints = codes.max() + 1
+    x = laps['TyreLife'].to_numpy(dtype=np.float64)
+    y = fuel_corrected_lap_times(laps, fuel_effect)
+
+    n = np.bincount(codes, minlength=n_stints).astype(np.float64)
+    x_mean = np.bincount(codes, weights=x, minlength=n_stints) / n
+    y_mean = np.bincount(codes, weights=y, minlength=n_stints) / n
+
+    # Centred sums keep the solve stable whatever the tyre ages and lap times are
+    dx = x - x_mean[codes]
+    dy = y - y_mean[codes]
+    sxx = np.bincount(codes, weights=dx * dx, minlength=n_stints)
+    sxy = np.bincount(codes, weights=dx * dy, minlength=n_stints)
+
+    fitted = (n >= min_laps) & (sxx > 1e-12)
+    slope = np.divide(sxy, sxx, out=np.full(n_stints, np.nan), where=fitted)
+    intercept = y_mean - slope * x_mean
+
+    residual = dy - np.nan_to_num(slope)[codes] * dx
+    rmse = np.sqrt(np.bincount(codes, weights=residual * residual, minlength=n_stints) / n)
+    rmse[~fitted] = np.nan
+
+    # Rows sorted by stint code: each stint is one contiguous segment starting at `bounds`
+    order = np.argsort(codes, kind='stable')
+    bounds = np.searchsorted(codes[order], np.arange(n_stints))
+
+    stints = laps.iloc[order[bounds]][keys + (['Compound'] if 'Compound' in laps.columns else [])].reset_index(drop=True)
+    stints['laps'] = n.astype(int)
+    stints['tyre_life_start'] = np.minimum.reduceat(x[order], bounds)
+    stints['tyre_life_end'] = np.maximum.reduceat(x[order], bounds)
+    stints['slope'] = slope
+    stints['intercept'] = intercept
+    stints['corrected_pace'] = y_mean
+    stints['rmse'] = rmse
+    return stints
+
+
+def compound_degradation(stints, by=('Compound',)):
+    """Average degradation rate per compound (or other columns), weighting stints by laps."""
+    fitted = stints.dropna(subset=['slope'])
+    weighted = fitted.assign(weighted_slope=fitted['slope'] * fitted['laps'])
+    summary = weighted.groupby(list(by)).agg(stints=('slope', 'size'), laps=('laps', 'sum'),
+                                            weighted_slope=('weighted_slope', 'sum'),
+                                            median_slope=('slope', 'median'))
+    summary['degradation_per_lap'] = summary.pop('weighted_slope') / summary['laps']
+    return summary.reset_index()
@@ -1,12 +1,44 @@
 # models/monaco_simulation/tire_model.py
 
+import warnings
+import numpy as np
 import pandas as pd
 import joblib
 from sklearn.pipeline import Pipeline
 from sklearn.preprocessing import PolynomialFeatures
 from sklearn.linear_model import LinearRegression
-import fastf1
-fastf1.Cache.enable_cache('/Users/nooralindeflaten/f1_ML_predictor/data/cache')  # Enable cache for faster data loading
+
+class BoundInputSchema:
+    """
+    Column order of raw inputs, validated once against a model's feature names.
+
+    Bind it once (e.g. before a simulation loop) and pass it to `predict_array`,
+    which then only reorders columns instead of re-validating names on each call.
+    """
+
+    def __init__(self, feature_names, columns=None):
+        self.feature_names = list(feature_names)
+        self.columns = list(self.feature_names if columns is None else columns)
+
+        missing = [name for name in self.feature_names if name not in self.columns]
+        if missing:
+            raise ValueError(f"Input columns {self.columns} are missing training features {missing}.")
+
+        self.column_index = np.array([self.columns.index(name) for name in self.feature_names])
+        self.is_identity = self.columns == self.feature_names
+
+    def to_array(self, X):
+        """Return a float 2D array in training feature order from an array or dict of arrays."""
+        if isinstance(X, dict):
+            return np.column_stack([np.atleast_1d(np.asarray(X[name], dtype=float)) for name in self.feature_names])
+
+        X = np.asarray(X, dtype=float)
+        if X.ndim == 1:
+            X = X.reshape(1, -1)
+        if X.shape[1] != len(self.columns):
+            raise ValueError(f"Expected {len(self.columns)} columns {self.columns}, got {X.shape[1]}.")
+        return X if self.is_identity else X[:, self.column_index]
+
 
 class TirePerformanceModel:
     def __init__(self, degree=2):
@@ -16,6 +48,7 @@ class TirePerformanceModel:
             ('linreg', LinearRegression())
         ])
         self.feature_names = None
+        self._identity_schema = None
 
     def fit(self, X, y):
         if not isinstance(X, pd.DataFrame):
@@ -30,6 +63,30 @@ class TirePerformanceModel:
             raise ValueError(f"Input features {list(X.columns)} do not match training features {self.feature_names}.")
         return self.pipeline.predict(X)
 
+    def bind_schema(self, columns=None):
+        """Validate an input column order once and return a reusable BoundInputSchema."""
+        if self.feature_names is None:
+            raise ValueError("Model must be fitted before binding an input schema.")
+        if columns is not None:
+            return BoundInputSchema(self.feature_names, columns)
+        # Inputs already in training order: reuse one schema until the features change
+        if self._identity_schema is None or self._identity_schema.feature_names != self.feature_names:
+            self._identity_schema = BoundInputSchema(self.feature_names)
+        return self._identity_schema
+
+    def predict_array(self, X, schema=None):
+        """
+        Predict from a 2D NumPy array (or dict of arrays) without building a DataFrame.
+        Without a schema, array columns must already be in `feature_names` order.
+        """
+        if schema is None:
+            schema = self.bind_schema()
+        X = schema.to_array(X)
+        # The pipeline was fitted on a DataFrame; column order is guaranteed by the schema
+        with warnings.catch_warnings():
+            warnings.filterwarnings('ignore', message='X does not have valid feature names')
+            return self.pipeline.predict(X)
+
     def save(self, path: str):
         joblib.dump({
             'model': self.pipeline,
@@ -0,0 +1,156 @@
+# models/monaco_simulation/train_cluster_tire_models.py
+
+import os
+import json
+from datetime import datetime, timezone
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+import joblib
+import pandas as pd
+from sklearn.preprocessing import StandardScaler
+from sklearn.cluster import KMeans
+from sklearn.model_selection import train_test_split
+from .tire_model import TirePerformanceModel
+from .data_utils import atomic_directory, atomic_file, clean_gap_column, content_hash
+
+LAPS_PATH = Path("/Users/nooralindeflaten/f1_ML_predictor/data/processed/monaco_and_test/laps_with_weather_gaps_monaco.pkl")
+MODELS_FOLDER = Path(__file__).parent / "cluster_tire_models"
+
+# Same clustering inputs as baby_strategist_ai.py
+CLUSTERING_FEATURES = ['TyreLife', 'GapToLeader', 'IntervalToPositionAhead', 'TrackTemp', 'Pressure', 'Rainfall']
+MODEL_FEATURES = ['TyreLife', 'TrackTemp', 'AirTemp', 'Pressure', 'Rainfall']
+MAPPED_COMPOUNDS = ['HARD', 'INTERMEDIATE', 'MEDIUM', 'SOFT', 'WET']
+SOFT_FAMILY = ['HYPERSOFT', 'ULTRASOFT', 'SUPERSOFT', 'SOFT']
+
+
+def prepare_laps(laps):
+    """Clean gaps and add MappedCompound_* one-hots (soft family folded into SOFT)."""
+    laps = laps.copy()
+    laps['GapToLeader'] = clean_gap_column(laps['GapToLeader'])
+    laps['IntervalToPositionAhead'] = clean_gap_column(laps['IntervalToPositionAhead'])
+    laps['Rainfall'] = laps['Rainfall'].astype(float)
+
+    mapped = laps['Compound'].where(~laps['Compound'].isin(SOFT_FAMILY), 'SOFT')
+    for compound in MAPPED_COMPOUNDS:
+        laps[f'MappedCompound_{compound}'] = (mapped == compound).astype(int)
+    return laps
+
+
+def _fit_cluster_model(key, X, y, degree, seed):
+    """Train one TirePerformanceModel on a cluster's laps. Runs in a worker process."""
+    X_train, X_val, y_train, y_val = train_test_split(X, y, test_size=0.2, random_state=seed)
+    model = TirePerformanceModel(degree=degree)
+    model.fit(X_train, y_train)
+    return key, model, float(model.pipeline.score(X_val, y_val)), len(X)
+
+
+def train_cluster_bundle(laps, n_clusters=4, group_col=None, degree=2, min_laps=30, seed=42,
+                         n_workers=None, output_folder=MODELS_FOLDER):
+    """
+    Fit the lap clustering, train one TirePerformanceModel per cluster in parallel and
+    write everything as one versioned bundle.
+
+    group_col: optional column (e.g. circuit) to cluster and train each group separately
+    The bundle is written to a temporary folder and renamed into place, then LATEST is
+    updated, so readers never see a half-written set of models.
+
+    Returns the bundle path.
+    """
+    laps = prepare_laps(laps)
+    model_cols = MODEL_FEATURES + [f'MappedCompound_{c}' for c in MAPPED_COMPOUNDS]
+    laps = laps.dropna(subset=['LapTime'] + MODEL_FEATURES)
+    groups = [(None, laps)] if group_col is None else list(laps.groupby(group_col))
+
+    clustering, tasks, skipped = {}, [], []
+    for group, group_laps in groups:
+        scaler = StandardScaler()
+        X_scaled = scaler.fit_transform(group_laps[CLUSTERING_FEATURES].fillna(0))
+        kmeans = KMeans(n_clusters=n_clusters, random_state=seed)
+        labels = kmeans.fit_predict(X_scaled)
+        clustering[group] = {'scaler': scaler, 'kmeans': kmeans}
+
+        for cluster_id in range(n_clusters):
+            cluster_laps = group_laps[labels == cluster_id]
+            key = (group, cluster_id)
+            if len(cluster_laps) < min_laps:
+                skipped.append(key)
+                continue
+            tasks.append((key, cluster_laps[model_cols], cluster_laps['LapTime'], degree, seed))
+
+    n_workers = n_workers or os.cpu_count() or 1
+    if n_workers == 1:
+        fitted = [_fit_cluster_model(*task) for task in tasks]
+    else:
+        with ProcessPoolExecutor(max_workers=min(n_workers, max(len(tasks), 1))) as pool:
+            fitted = list(pool.map(_fit_cluster_model, *zip(*tasks)))
+
+    created = datetime.now(timezone.utc)
+    version = f"{created:%Y%m%dT%H%M%S%f}_{content_hash(laps, ['LapTime'] + MODEL_FEATURES)}"
+    output_folder = Path(output_folder)
+    bundle_path = output_folder / f"bundle_{version}"
+
+    with atomic_directory(bundle_path) as staging:
+        models_manifest = []
+        for (group, cluster_id), model, val_r2, n_laps in fitted:
+            relative = Path(str(group)) if group is not None else Path()
+            (staging / relative).mkdir(parents=True, exist_ok=True)
+            model_path = relative / f"tire_model_cluster{cluster_id}.pkl"
+            model.save(str(staging / model_path))
+            models_manifest.append({
+                'group': None if group is None else str(group),
+                'cluster': cluster_id,
+                'path': str(model_path),
+                'n_laps': n_laps,
+                'val_r2': val_r2,
+            })
+
+        joblib.dump({str(group) if group is not None else None: parts for group, parts in clustering.items()},
+                    staging / "clustering.pkl")
+
+        manifest = {
+            'version': version,
+            'created': created.isoformat(),
+            'n_clusters': n_clusters,
+            'group_col': group_col,
+            'degree': degree,
+            'clustering_features': CLUSTERING_FEATURES,
+            'model_features': model_cols,
+            'models': models_manifest,
+            'skipped': [{'group': None if g is None else str(g), 'cluster': c} for g, c in skipped],
+        }
+        with open(staging / "manifest.json", 'w') as f:
+            json.dump(manifest, f, indent=4)
+
+    # Point LATEST at the new bundle with an atomic rename
+    with atomic_file(output_folder / "LATEST") as latest:
+        latest.write_text(bundle_path.name)
+
+    print(f"✅ Saved {len(models_manifest)} cluster models to {bundle_path}")
+    return bundle_path
+
+
+def load_cluster_bundle(output_folder=MODELS_FOLDER, version=None):
+    """
+    Load a bundle written by train_cluster_bundle (LATEST by default).
+    Returns (manifest, clustering, models) with models keyed by (group, cluster).
+    """
+    output_folder = Path(output_folder)
+    if version is None and not (output_folder / "LATEST").exists():
+        raise FileNotFoundError(f"No cluster bundle in {output_folder}; train one with "
+                                "python -m models.monaco_simulation.train_cluster_tire_models")
+    name = f"bundle_{version}" if version else (output_folder / "LATEST").read_text().strip()
+    bundle_path = output_folder / name
+
+    with open(bundle_path / "manifest.json") as f:
+        manifest = json.load(f)
+    clustering = joblib.load(bundle_path / "clustering.pkl")
+    models = {
+        (entry['group'], entry['cluster']): TirePerformanceModel.load(str(bundle_path / entry['path']))
+        for entry in manifest['models']
+    }
+    return manifest, clustering, models
+
+
+if __name__ == "__main__":
+    laps = pd.read_pickle(LAPS_PATH)
+    train_cluster_bundle(laps)
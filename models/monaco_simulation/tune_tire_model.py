@@ -0,0 +1,150 @@
+# models/monaco_simulation/tune_tire_model.py
+
+import os
+import itertools
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+import numpy as np
+import pandas as pd
+from sklearn.pipeline import Pipeline
+from sklearn.preprocessing import PolynomialFeatures
+from sklearn.linear_model import LinearRegression, Ridge
+from sklearn.model_selection import KFold
+from .data_utils import WEATHER_FEATURES, GAP_FEATURES, clean_gap_column
+
+LAPS_PATH = "/Users/nooralindeflaten/f1_ML_predictor/data/processed/laps_with_weather_gaps_monaco.pkl"
+
+DEGREES = [1, 2, 3]
+ALPHAS = [0.0, 0.1, 1.0, 10.0]  # 0.0 = plain LinearRegression, otherwise Ridge
+
+
+def prepare_design_matrix(df):
+    """
+    Filter and encode laps the same way as the training scripts, keeping every candidate column.
+    Returns (X, y, column_names) with X as one C-contiguous float64 array.
+    """
+    df = df[(df['year'] < 2023) & (df['session_type'].isin(['FP1', 'FP2', 'FP3', 'Q']))].copy()
+    for col in GAP_FEATURES:
+        if col in df.columns:
+            df[col] = clean_gap_column(df[col])
+
+    required = ['LapTime', 'TyreLife', 'Compound'] + [col for col in WEATHER_FEATURES + GAP_FEATURES if col in df.columns]
+    df = pd.get_dummies(df.dropna(subset=required), columns=['Compound'])
+
+    columns = [col for col in ['TyreLife'] + WEATHER_FEATURES + GAP_FEATURES if col in df.columns] + \
+              [col for col in df.columns if col.startswith("Compound_")]
+    X = np.ascontiguousarray(df[columns].to_numpy(dtype=np.float64))
+    y = df['LapTime'].to_numpy(dtype=np.float64)
+    return X, y, columns
+
+
+def feature_subsets(columns):
+    """TyreLife plus every on/off combination of the weather, gap and compound groups."""
+    groups = {
+        'weather': [col for col in columns if col in WEATHER_FEATURES],
+        'gaps': [col for col in columns if col in GAP_FEATURES],
+        'compounds': [col for col in columns if col.startswith("Compound_")],
+    }
+    groups = {name: cols for name, cols in groups.items() if cols}
+
+    subsets = {}
+    for flags in itertools.product([False, True], repeat=len(groups)):
+        chosen = [name for name, on in zip(groups, flags) if on]
+        subsets['+'.join(['TyreLife'] + chosen)] = ['TyreLife'] + [col for name in chosen for col in groups[name]]
+    return subsets
+
+
+def build_pipeline(degree, alpha):
+    return Pipeline([
+        ('poly', PolynomialFeatures(degree=degree)),
+        ('linreg', LinearRegression() if alpha == 0 else Ridge(alpha=alpha))
+    ])
+
+
+def _evaluate_config(matrix_path, target_path, subset_name, column_idx, degree, alpha, n_splits, seed):
+    """Cross-validate one configuration and time its predictions. Runs in a worker process."""
+    # The design matrix is memory-mapped read-only, shared by all workers
+    X_all = np.load(matrix_path, mmap_mode='r')
+    y = np.load(target_path, mmap_mode='r')
+    X = np.ascontiguousarray(X_all[:, column_idx])
+
+    rmse, mae, r2 = [], [], []
+    for train_idx, val_idx in KFold(n_splits=n_splits, shuffle=True, random_state=seed).split(X):
+        pipeline = build_pipeline(degree, alpha).fit(X[train_idx], y[train_idx])
+        predicted = pipeline.predict(X[val_idx])
+        errors = predicted - y[val_idx]
+        rmse.append(np.sqrt(np.mean(errors ** 2)))
+        mae.append(np.mean(np.abs(errors)))
+        r2.append(pipeline.score(X[val_idx], y[val_idx]))
+
+    pipeline = build_pipeline(degree, alpha).fit(X, y)
+    row = X[:1]
+    repeats = 200
+    start = time.perf_counter()
+    for _ in range(repeats):
+        pipeline.predict(row)
+    single_row_us = (time.perf_counter() - start) / repeats * 1e6
+
+    start = time.perf_counter()
+    pipeline.predict(X)
+    batch_row_us = (time.perf_counter() - start) / len(X) * 1e6
+
+    return {
+        'features': subset_name,
+        'n_features': len(column_idx),
+        'degree': degree,
+        'alpha': alpha,
+        'cv_rmse': float(np.mean(rmse)),
+        'cv_rmse_std': float(np.std(rmse)),
+        'cv_mae': float(np.mean(mae)),
+        'cv_r2': float(np.mean(r2)),
+        'single_row_us': single_row_us,
+        'batch_row_us': batch_row_us,
+    }
+
+
+def sweep_tire_models(X, y, columns, degrees=DEGREES, alphas=ALPHAS, subsets=None, n_splits=5, seed=42, n_workers=None):
+    """
+    Cross-validate every (feature subset, degree, alpha) combination in parallel.
+
+    X is written once to a temporary .npy file and memory-mapped by the workers, so it is
+    not copied into each task. Returns a leaderboard sorted by cv_rmse; `pareto` marks
+    configurations that no other configuration beats on both error and single-row latency.
+    """
+    subsets = feature_subsets(columns) if subsets is None else subsets
+    configs = [(name, [columns.index(col) for col in cols], degree, alpha)
+               for name, cols in subsets.items() for degree in degrees for alpha in alphas]
+
+    with tempfile.TemporaryDirectory() as tmp:
+        matrix_path = os.path.join(tmp, 'X.npy')
+        target_path = os.path.join(tmp, 'y.npy')
+        np.save(matrix_path, np.ascontiguousarray(X, dtype=np.float64))
+        np.save(target_path, np.asarray(y, dtype=np.float64))
+
+        args = [(matrix_path, target_path, name, idx, degree, alpha, n_splits, seed)
+                for name, idx, degree, alpha in configs]
+        n_workers = n_workers or os.cpu_count() or 1
+        if n_workers == 1:
+            rows = [_evaluate_config(*a) for a in args]
+        else:
+            with ProcessPoolExecutor(max_workers=n_workers) as pool:
+                rows = list(pool.map(_evaluate_config, *zip(*args)))
+
+    leaderboard = pd.DataFrame(rows).sort_values(['cv_rmse', 'single_row_us']).reset_index(drop=True)
+
+    # Sorted by error, a config is on the front if it is faster than everything more accurate
+    fastest_so_far = leaderboard['single_row_us'].cummin().shift(fill_value=np.inf)
+    leaderboard['pareto'] = leaderboard['single_row_us'] < fastest_so_far
+    return leaderboard
+
+
+if __name__ == "__main__":
+    df = pd.read_pickle(LAPS_PATH)
+    X, y, columns = prepare_design_matrix(df)
+    print(f"✅ Design matrix: {X.shape}, columns: {columns}")
+
+    leaderboard = sweep_tire_models(X, y, columns)
+    print(leaderboard.head(20).to_string())
+    print("\n🏁 Pareto front (error vs latency):")
+    print(leaderboard[leaderboard['pareto']].to_string())
@@ -0,0 +1,117 @@
+# models/race_outcome_simulator.py
+
+import os
+from concurrent.futures import ProcessPoolExecutor
+import numpy as np
+import pandas as pd
+
+# Points for P1..P10 (no fastest-lap or sprint points)
+RACE_POINTS = np.array([25, 18, 15, 12, 10, 8, 6, 4, 2, 1], dtype=np.float64)
+
+
+def strengths_from_ratings(ratings, scale=400.0):
+    """
+    Convert Elo ratings (e.g. DriverRatings.as_of) to Plackett-Luce log-strengths, so that
+    the head-to-head probability of two drivers matches the Elo expected score.
+    """
+    return pd.Series(ratings, dtype=float) * np.log(10.0) / scale
+
+
+def _sample_chunk(seed, log_strengths, n_samples, points):
+    """
+    Sample n_samples finishing orders with the Gumbel-max trick and count them.
+    Runs in a worker process. Returns (position_counts, points_sum, ahead_counts).
+    """
+    rng = np.random.default_rng(seed)
+    n_drivers = len(log_strengths)
+
+    # Sorting strength + Gumbel noise gives an exact Plackett-Luce sample of the whole order
+    perturbed = log_strengths[None, :] + rng.gumbel(size=(n_samples, n_drivers))
+    order = np.argsort(-perturbed, axis=1)
+    positions = np.empty_like(order)
+    np.put_along_axis(positions, order, np.arange(n_drivers)[None, :], axis=1)
+
+    position_counts = np.bincount((positions * n_drivers + np.arange(n_drivers)[None, :]).ravel(),
+                                  minlength=n_drivers * n_drivers).reshape(n_drivers, n_drivers)
+    points_table = np.zeros(n_drivers)
+    points_table[:min(len(points), n_drivers)] = points[:n_drivers]
+    points_sum = points_table[positions].sum(axis=0)
+
+    # Pairwise "i finishes ahead of j", in blocks to bound the (block, n, n) temporary
+    ahead_counts = np.zeros((n_drivers, n_drivers), dtype=np.int64)
+    compact = positions.astype(np.min_scalar_type(n_drivers))
+    block = max(1, 2_000_000 // (n_drivers * n_drivers))
+    for start in range(0, n_samples, block):
+        part = compact[start:start + block]
+        ahead_counts += (part[:, :, None] < part[:, None, :]).sum(axis=0)
+
+    return position_counts, points_sum, ahead_counts
+
+
+def simulate_finishing_orders(strengths, n_samples=200_000, points=RACE_POINTS, seed=42, n_workers=None,
+                              chunk_size=100_000):
+    """
+    Plackett-Luce probabilities of race outcomes from per-driver strength scores.
+
+    strengths: Series of log-strengths indexed by driver (any model's scores; higher is better,
+               see strengths_from_ratings for Elo ratings)
+    Orders are sampled in batches of chunk_size; with several chunks they are spread over a
+    process pool (n_workers=1 runs in-process). Each chunk gets its own spawned seed.
+
+    Returns a dict of DataFrames:
+        positions: P(driver finishes in position), positions (1-based) × drivers
+        head_to_head: P(row driver finishes ahead of column driver)
+        summary: win / podium / points probability, expected position and expected points per driver
+    """
+    strengths = pd.Series(strengths, dtype=float)
+    if strengths.isna().any():
+        raise ValueError("Strengths contain NaN values.")
+    drivers = list(strengths.index)
+    log_strengths = strengths.to_numpy()
+    n_drivers = len(drivers)
+
+    chunks = [chunk_size] * (n_samples // chunk_size)
+    if n_samples % chunk_size:
+        chunks.append(n_samples % chunk_size)
+    seeds = np.random.SeedSequence(seed).spawn(len(chunks))
+    args = [(chunk_seed, log_strengths, n, np.asarray(points, dtype=np.float64)) for chunk_seed, n in zip(seeds, chunks)]
+
+    n_workers = n_workers or os.cpu_count() or 1
+    if n_workers == 1 or len(chunks) == 1:
+        parts = [_sample_chunk(*a) for a in args]
+    else:
+        with ProcessPoolExecutor(max_workers=min(n_workers, len(chunks))) as pool:
+            parts = list(pool.map(_sample_chunk, *zip(*args)))
+
+    position_probs = sum(part[0] for part in parts) / n_samples
+    expected_points = sum(part[1] for part in parts) / n_samples
+    head_to_head = sum(part[2] for part in parts) / n_samples
+
+    positions = pd.DataFrame(position_probs, index=pd.RangeIndex(1, n_drivers + 1, name='position'), columns=drivers)
+    summary = pd.DataFrame({
+        'strength': log_strengths,
+        'win_prob': position_probs[0],
+        'podium_prob': position_probs[:3].sum(axis=0),
+        'points_prob': position_probs[:len(points)].sum(axis=0),
+        'expected_position': (np.arange(1, n_drivers + 1)[:, None] * position_probs).sum(axis=0),
+        'expected_points': expected_points,
+    }, index=pd.Index(drivers, name='driver')).sort_values('expected_position')
+
+    return {
+        'positions': positions,
+        'head_to_head': pd.DataFrame(head_to_head, index=drivers, columns=drivers),
+        'summary': summary,
+    }
+
+
+if __name__ == "__main__":
+    from models.driver_ratings import DriverRatings, INITIAL_RATING
+    from models.feature_engineering import RACE_RESULTS_PATH
+
+    results = pd.read_csv(RACE_RESULTS_PATH)
+    last_season, last_round = results[['season', 'round']].drop_duplicates().sort_values(['season', 'round']).iloc[-1]
+    grid = results[(results['season'] == last_season) & (results['round'] == last_round)]['driver_id']
+
+    ratings = DriverRatings.from_results(results).as_of(last_season, last_round, include_round=False)
+    report = simulate_finishing_orders(strengths_from_ratings(ratings.reindex(grid).fillna(INITIAL_RATING)))
+    print(report['summary'].round(3).to_string())
@@ -0,0 +1,83 @@
+# models/sequence_dataset.py
+
+import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
+from models.monaco_simulation.data_utils import WEATHER_FEATURES, SESSION_COLS
+
+SEQUENCE_KEYS = SESSION_COLS + ['Driver']
+SEQUENCE_FEATURES = ['TyreLife'] + WEATHER_FEATURES
+
+
+class LapSequenceDataset:
+    """
+    Fixed-length lap windows for sequence models (e.g. LSTMs), without materialising them.
+
+    Laps are sorted by (session, driver, LapNumber) into one contiguous float32 array, with
+    window - 1 zero rows in front of every (session, driver) sequence. Every window is then a
+    strided view into that array (sliding_window_view), so the dataset costs about one copy
+    of the features no matter how long the window is; only the requested batch is gathered.
+
+    Sample i is the window ending at lap i and its target is that lap's target value.
+    Its mask is False for padding rows and, with break_on_stint=True, for laps from an earlier
+    stint (before the last pit stop), whose features are zeroed in the returned batch.
+    """
+
+    def __init__(self, laps, feature_cols=SEQUENCE_FEATURES, target='LapTime', window=10,
+                 key_cols=SEQUENCE_KEYS, break_on_stint=True, dtype=np.float32):
+        if window < 1:
+            raise ValueError("window must be at least 1.")
+        key_cols = [col for col in key_cols if col in laps.columns]
+        stint_col = 'Stint' if break_on_stint and 'Stint' in laps.columns else None
+
+        laps = laps.dropna(subset=list(feature_cols) + [target, 'LapNumber'] + key_cols + ([stint_col] if stint_col else []))
+        laps = laps.sort_values(key_cols + ['LapNumber'], kind='stable')
+        if laps.empty:
+            raise ValueError("No laps left after dropping missing values.")
+
+        self.window = window
+        self.feature_names = list(feature_cols)
+        self.meta = laps[key_cols + ['LapNumber']].reset_index(drop=True)
+
+        group = laps.groupby(key_cols, sort=False).ngroup().to_numpy() if key_cols else np.zeros(len(laps), dtype=np.int64)
+        # Row i of the laps lands after (group + 1) blocks of padding
+        self.ends = np.arange(len(laps)) + (group + 1) * (window - 1)
+        n_rows = len(laps) + (group[-1] + 1) * (window - 1)
+
+        self.values = np.zeros((n_rows, len(self.feature_names)), dtype=dtype)
+        self.values[self.ends] = laps[self.feature_names].to_numpy(dtype=dtype)
+        self.targets = laps[target].to_numpy(dtype=dtype)
+
+        # Segment id of every row (-1 for padding); a window only keeps rows of its last lap's segment
+        segment = group if stint_col is None else laps.groupby(key_cols + [stint_col], sort=False).ngroup().to_numpy()
+        self.segments = np.full(n_rows, -1, dtype=np.int64)
+        self.segments[self.ends] = segment
+
+        self._windows = sliding_window_view(self.values, (window, self.values.shape[1]))[:, 0]
+        self._segment_windows = sliding_window_view(self.segments, window)
+
+    def __len__(self):
+        return len(self.ends)
+
+    def _gather(self, idx):
+        start = self.ends[idx] - self.window + 1
+        mask = self._segment_windows[start] == self.segments[self.ends[idx]][:, None]
+        X = np.where(mask[..., None], self._windows[start], 0)
+        return X, mask, self.targets[idx]
+
+    def __getitem__(self, i):
+        X, mask, y = self._gather(np.array([i]))
+        return X[0], mask[0], y[0]
+
+    def window_view(self, i):
+        """Zero-copy (window, n_features) view of sample i, before masking."""
+        return self._windows[self.ends[i] - self.window + 1]
+
+    def batches(self, batch_size=256, shuffle=True, seed=None, drop_last=False):
+        """
+        Lazily yield (X, mask, y) mini-batches: X is (batch, window, n_features), mask is
+        (batch, window) and y is (batch,). Only one batch is materialised at a time.
+        """
+        order = np.random.default_rng(seed).permutation(len(self)) if shuffle else np.arange(len(self))
+        stop = len(order) - len(order) % batch_size if drop_last else len(order)
+        for start in range(0, stop, batch_size):
+            yield self._gather(order[start:start + batch_size])
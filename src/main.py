@@ -0,0 +1,249 @@
+# src/main.py
+"""
+Command line entry point for the pipeline.
+
+    python src/main.py fetch results --start 2018 --end 2023
+    python src/main.py build features --laps laps.pkl --feature-set traffic
+    python src/main.py train tire --laps laps.pkl --register tire_model_poly2
+    python src/main.py simulate --model tire_model_poly2 --strategy Soft:30,Medium:48
+    python src/main.py backtest --laps laps.pkl
+    python src/main.py serve --models tire_model_poly2
+
+Each subcommand imports its heavy dependencies (pandas, sklearn, fastf1, ...) only when it
+runs, so --help and argument errors stay fast.
+"""
+
+import argparse
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+DATA_SCRIPTS = ROOT / "data" / "scripts"
+sys.path.insert(0, str(ROOT))
+
+
+def _data_script(name):
+    """Import a module from data/scripts (they are plain scripts, not a package)."""
+    import importlib
+    if str(DATA_SCRIPTS) not in sys.path:
+        sys.path.insert(0, str(DATA_SCRIPTS))
+    return importlib.import_module(name)
+
+
+def _load_laps(path):
+    import pandas as pd
+    path = Path(path)
+    return pd.read_csv(path) if path.suffix == '.csv' else pd.read_pickle(path)
+
+
+def _weather(args):
+    return {'TrackTemp': args.track_temp, 'AirTemp': args.air_temp, 'Pressure': args.pressure}
+
+
+def _parse_strategy(text):
+    """'Soft:30,Medium:48' -> [('Soft', 30), ('Medium', 48)]"""
+    try:
+        return [(compound, int(laps)) for compound, laps in (stint.split(':') for stint in text.split(','))]
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"Strategy '{text}' must look like Soft:30,Medium:48")
+
+
+def _load_model(args):
+    if args.model_path:
+        from models.monaco_simulation.tire_model import TirePerformanceModel
+        return TirePerformanceModel.load(args.model_path)
+    from models.monaco_simulation.model_registry import get_registry
+    return get_registry(args.registry).get(args.model, args.version)
+
+
+# --- Subcommands ----------------------------------------------------------------
+
+def cmd_fetch(args):
+    if args.what == 'results':
+        fetch_race_results = _data_script('fetch_race_results')
+        for year in range(args.start, args.end + 1):
+            fetch_race_results.fetch_race_results(year)
+    elif args.what == 'sessions':
+        _data_script('fetch_sessions').main(args.session_type.upper())
+    elif args.what == 'race':
+        if args.year is None or args.round is None:
+            raise SystemExit("fetch race needs --year and --round")
+        _data_script('fetch_data_from_cache').main(args.year, args.round)
+
+
+def cmd_build(args):
+    if args.what == 'results':
+        _data_script('preprocess_race_results').main()
+    elif args.what == 'laps':
+        _data_script('batch_monaco_tyre').batch_all_lap_data()
+    elif args.what == 'gaps':
+        _data_script('monaco_timing_add').batch_monaco_gaps()
+    elif args.what == 'merged':
+        _data_script('batch_pickles').batch_monaco_laps_with_gaps()
+    elif args.what == 'features':
+        from models.feature_engineering import FeatureStore
+        if args.laps is None:
+            raise SystemExit("build features needs --laps")
+        X, _, columns, _ = FeatureStore(args.cache_dir).get(_load_laps(args.laps), args.feature_set)
+        print(f"✅ Feature set '{args.feature_set}': {X.shape[0]} laps x {len(columns)} features {columns}")
+
+
+def cmd_train(args):
+    if args.kind == 'clusters':
+        from models.monaco_simulation.train_cluster_tire_models import train_cluster_bundle, LAPS_PATH
+        train_cluster_bundle(_load_laps(args.laps or LAPS_PATH), n_clusters=args.clusters, degree=args.degree,
+                             n_workers=args.workers)
+        return
+
+    if args.kind == 'sweep':
+        from models.monaco_simulation.tune_tire_model import LAPS_PATH, prepare_design_matrix, sweep_tire_models
+        X, y, columns = prepare_design_matrix(_load_laps(args.laps or LAPS_PATH))
+        leaderboard = sweep_tire_models(X, y, columns, n_workers=args.workers)
+        print(leaderboard.head(20).to_string())
+        return
+
+    import pandas as pd
+    from sklearn.model_selection import train_test_split
+    from models.feature_engineering import FeatureStore
+    from models.model_evaluation import LAPS_PATH
+    from models.monaco_simulation.tire_model import TirePerformanceModel
+
+    laps = _load_laps(args.laps or LAPS_PATH)
+    # Same filter as train_tire_model.py: practice and qualifying before the test season
+    laps = laps[(laps['year'] < args.before_year) & (laps['session_type'].isin(args.sessions))]
+    X, y, columns, _ = FeatureStore(args.cache_dir).get(laps, args.feature_set)
+
+    features = pd.DataFrame(X, columns=columns)
+    X_train, X_val, y_train, y_val = train_test_split(features, y, test_size=0.2, random_state=42)
+    model = TirePerformanceModel(degree=args.degree)
+    model.fit(X_train, y_train)
+    val_r2 = float(model.pipeline.score(X_val, y_val))
+    print(f"Model R² on validation set: {val_r2:.4f}")
+
+    if args.register:
+        from models.monaco_simulation.model_registry import get_registry
+        get_registry(args.registry).register(args.register, model, training_data=features.assign(LapTime=y),
+                                             metrics={'val_r2': val_r2}, feature_set=args.feature_set)
+    if args.output:
+        model.save(args.output)
+
+
+def cmd_simulate(args):
+    model = _load_model(args)
+    weather = _weather(args)
+
+    if args.strategy:
+        strategies = args.strategy
+    else:
+        from models.monaco_simulation.lap_time_tables import LapTimeTableCache
+        from models.monaco_simulation.strategy_optimizer import find_optimal_strategies
+        table = LapTimeTableCache(model, args.compounds, max_tyre_life=args.total_laps).get_table(weather)
+        best = find_optimal_strategies(table, args.total_laps, pit_loss=args.pit_loss, top_k=args.top_k)
+        print(best.to_string(index=False))
+        strategies = list(best['strategy'])
+
+    if args.scenarios:
+        from models.monaco_simulation.monte_carlo_simulator import simulate_monte_carlo
+        summary, _ = simulate_monte_carlo(strategies, model, weather, args.total_laps, n_scenarios=args.scenarios,
+                                          pit_loss=args.pit_loss, n_workers=args.workers)
+        print(summary.to_string(index=False))
+    elif args.strategy:
+        from models.monaco_simulation.monaco_test_simulator import simulate_strategies_batch
+        print(simulate_strategies_batch(strategies, model, weather, pit_loss=args.pit_loss).to_string(index=False))
+
+
+def cmd_backtest(args):
+    from models.feature_engineering import FeatureStore
+    from models.model_evaluation import LAPS_PATH, walk_forward_backtest
+
+    laps = _load_laps(args.laps or LAPS_PATH)
+    report = walk_forward_backtest(laps, degree=args.degree, n_workers=args.workers,
+                                   features=FeatureStore(args.cache_dir).frames(laps, args.feature_set))
+    print(report['folds'].to_string(index=False))
+    print(report['overall'].to_string(index=False))
+
+
+def cmd_serve(args):
+    from src.prediction import run_service
+    run_service(args.models, host=args.host, port=args.port, root=args.registry,
+                max_wait_ms=args.max_wait_ms, max_batch_size=args.max_batch_size)
+
+
+# --- Parser ---------------------------------------------------------------------
+
+def build_parser():
+    parser = argparse.ArgumentParser(prog='f1', description="F1 strategy prediction pipeline")
+    sub = parser.add_subparsers(dest='command', required=True)
+
+    # Shared option groups; defaults that need heavy imports are resolved inside the commands
+    registry = argparse.ArgumentParser(add_help=False)
+    registry.add_argument('--registry', default=str(ROOT / "models" / "monaco_simulation" / "model_registry"),
+                          help="model registry folder")
+    laps = argparse.ArgumentParser(add_help=False)
+    laps.add_argument('--laps', help="laps .pkl or .csv (defaults to the script's dataset)")
+    laps.add_argument('--cache-dir', default=str(ROOT / "models" / "feature_cache"), help="feature cache folder")
+    laps.add_argument('--feature-set', default='base', choices=['base', 'traffic', 'full'])
+    workers = argparse.ArgumentParser(add_help=False)
+    workers.add_argument('--workers', type=int, default=None, help="worker processes (default: all CPUs)")
+
+    fetch = sub.add_parser('fetch', help="download raw data")
+    fetch.add_argument('what', choices=['results', 'sessions', 'race'])
+    fetch.add_argument('--start', type=int, default=2018)
+    fetch.add_argument('--end', type=int, default=2023)
+    fetch.add_argument('--session-type', default='R', help="R, Q, S, FP1, FP2 or FP3")
+    fetch.add_argument('--year', type=int)
+    fetch.add_argument('--round', type=int)
+    fetch.set_defaults(func=cmd_fetch)
+
+    build = sub.add_parser('build', parents=[laps], help="build processed datasets and features")
+    build.add_argument('what', choices=['results', 'laps', 'gaps', 'merged', 'features'])
+    build.set_defaults(func=cmd_build)
+
+    train = sub.add_parser('train', parents=[laps, registry, workers], help="train tire models")
+    train.add_argument('kind', choices=['tire', 'clusters', 'sweep'])
+    train.add_argument('--degree', type=int, default=2)
+    train.add_argument('--clusters', type=int, default=4)
+    train.add_argument('--before-year', type=int, default=2023)
+    train.add_argument('--sessions', nargs='+', default=['FP1', 'FP2', 'FP3', 'Q'])
+    train.add_argument('--register', metavar='NAME', help="store the model in the registry under NAME")
+    train.add_argument('--output', help="also save the model to this .pkl path")
+    train.set_defaults(func=cmd_train)
+
+    simulate = sub.add_parser('simulate', parents=[registry, workers], help="simulate or optimise strategies")
+    simulate.add_argument('--model', default='tire_model_poly2', help="registry model name")
+    simulate.add_argument('--version', type=int, default=None, help="registry version (default: latest)")
+    simulate.add_argument('--model-path', help="load a TirePerformanceModel .pkl instead of the registry")
+    simulate.add_argument('--strategy', type=_parse_strategy, action='append',
+                          help="e.g. Soft:30,Medium:48 (repeatable); omit to search for the best strategies")
+    simulate.add_argument('--compounds', nargs='+', default=['Soft', 'Medium', 'Hard'])
+    simulate.add_argument('--total-laps', type=int, default=78)
+    simulate.add_argument('--pit-loss', type=float, default=20)
+    simulate.add_argument('--top-k', type=int, default=5)
+    simulate.add_argument('--scenarios', type=int, default=0, help="Monte Carlo scenarios (0 = deterministic)")
+    simulate.add_argument('--track-temp', type=float, default=40.0)
+    simulate.add_argument('--air-temp', type=float, default=25.0)
+    simulate.add_argument('--pressure', type=float, default=1010.0)
+    simulate.set_defaults(func=cmd_simulate)
+
+    backtest = sub.add_parser('backtest', parents=[laps, workers], help="walk-forward backtest of the tire model")
+    backtest.add_argument('--degree', type=int, default=2)
+    backtest.set_defaults(func=cmd_backtest)
+
+    serve = sub.add_parser('serve', parents=[registry], help="run the prediction service")
+    serve.add_argument('--models', nargs='+', default=['tire_model_poly2'], help="registry model names")
+    serve.add_argument('--host', default='127.0.0.1')
+    serve.add_argument('--port', type=int, default=8000)
+    serve.add_argument('--max-wait-ms', type=float, default=2.0)
+    serve.add_argument('--max-batch-size', type=int, default=256)
+    serve.set_defaults(func=cmd_serve)
+
+    return parser
+
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    args.func(args)
+
+
+if __name__ == "__main__":
+    main()
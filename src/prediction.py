@@ -0,0 +1,334 @@
+# src/prediction.py
+"""
+Long-lived local prediction service with micro-batching.
+
+Models are loaded once (from the model registry or passed in) and stay warm. Concurrent
+lap-time and strategy requests are queued and coalesced into micro-batches: a batch closes
+when max_batch_size requests are waiting or max_wait_ms after its first request, and is
+answered with one model call per (model, weather) group. Uses only asyncio and the
+standard library HTTP parsing below, so it runs fully offline.
+
+Endpoints (JSON):
+    POST /predict/lap_time  {"model": "tire", "rows": [{feature: value, ...}, ...]}
+                            or {"model": "tire", "compound": "Soft", "tyre_life": [1, 2], "weather": {...}}
+    POST /predict/strategy  {"model": "tire", "weather": {...}, "pit_loss": 20,
+                             "strategies": [[["Soft", 30], ["Medium", 48]], ...]}
+    GET  /metrics           request counts, p50/p99 latency and batch sizes per endpoint
+    GET  /health
+
+Run from the repository root with: python -m src.prediction
+"""
+
+import asyncio
+import json
+import time
+from collections import deque
+import numpy as np
+from models.monaco_simulation.lap_time_tables import LapTimeTableCache, supported_compounds
+from models.monaco_simulation.data_utils import build_lap_features
+from models.monaco_simulation.model_registry import get_registry, REGISTRY_FOLDER
+
+DEFAULT_MAX_WAIT_MS = 2.0
+DEFAULT_MAX_BATCH_SIZE = 256
+STRATEGY_COMPOUNDS = ['Soft', 'Medium', 'Hard', 'Intermediate', 'Wet']
+STRATEGY_MAX_TYRE_LIFE = 100
+
+
+class RequestError(Exception):
+    """Invalid request; answered with HTTP 400."""
+
+
+class LatencyStats:
+    """Rolling latency and batch-size samples of one endpoint."""
+
+    def __init__(self, maxlen=10_000):
+        self.latencies_ms = deque(maxlen=maxlen)
+        self.batch_sizes = deque(maxlen=maxlen)
+        self.requests = 0
+        self.errors = 0
+
+    def summary(self):
+        latencies = np.array(self.latencies_ms) if self.latencies_ms else np.array([np.nan])
+        batches = np.array(self.batch_sizes) if self.batch_sizes else np.array([np.nan])
+        return {
+            'requests': self.requests,
+            'errors': self.errors,
+            'p50_ms': float(np.percentile(latencies, 50)),
+            'p99_ms': float(np.percentile(latencies, 99)),
+            'batches': len(self.batch_sizes),
+            'mean_batch_size': float(batches.mean()),
+            'max_batch_size': float(batches.max()),
+        }
+
+
+class MicroBatcher:
+    """
+    Queue that hands requests to handler(items) -> results in batches.
+
+    A batch starts with the first waiting request and closes after max_wait_ms or at
+    max_batch_size requests, whichever comes first.
+    """
+
+    def __init__(self, handler, stats, max_wait_ms=DEFAULT_MAX_WAIT_MS, max_batch_size=DEFAULT_MAX_BATCH_SIZE):
+        self.handler = handler
+        self.stats = stats
+        self.max_wait = max_wait_ms / 1000
+        self.max_batch_size = max_batch_size
+        self.queue = asyncio.Queue()
+        self._task = None
+
+    def start(self):
+        self._task = asyncio.create_task(self._run())
+
+    async def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+
+    async def submit(self, item):
+        future = asyncio.get_running_loop().create_future()
+        await self.queue.put((item, future))
+        return await future
+
+    async def _run(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            batch = [await self.queue.get()]
+            deadline = loop.time() + self.max_wait
+            while len(batch) < self.max_batch_size:
+                remaining = deadline - loop.time()
+                if remaining <= 0:
+                    break
+                try:
+                    batch.append(await asyncio.wait_for(self.queue.get(), remaining))
+                except asyncio.TimeoutError:
+                    break
+
+            self.stats.batch_sizes.append(len(batch))
+            items = [item for item, _ in batch]
+            try:
+                results = self.handler(items)
+            except Exception as e:
+                results = [e] * len(batch)
+            for (_, future), result in zip(batch, results):
+                if future.done():
+                    continue
+                if isinstance(result, Exception):
+                    future.set_exception(result)
+                else:
+                    future.set_result(result)
+
+
+class PredictionService:
+    """
+    Warm models plus one micro-batcher per endpoint.
+
+    models: dict name -> model with feature_names and predict_array
+            (TirePerformanceModel, CompiledTireModel, cluster models, ...)
+    """
+
+    def __init__(self, models, max_wait_ms=DEFAULT_MAX_WAIT_MS, max_batch_size=DEFAULT_MAX_BATCH_SIZE,
+                 strategy_compounds=STRATEGY_COMPOUNDS):
+        if not models:
+            raise ValueError("PredictionService needs at least one model.")
+        self.models = dict(models)
+        self.table_caches = {
+            # Only the compounds each model was trained on; strategies on others are rejected per request
+            name: LapTimeTableCache(model, supported_compounds(model, strategy_compounds),
+                                    max_tyre_life=STRATEGY_MAX_TYRE_LIFE, maxsize=64)
+            for name, model in self.models.items()
+        }
+        self.stats = {'lap_time': LatencyStats(), 'strategy': LatencyStats()}
+        self.batchers = {
+            'lap_time': MicroBatcher(self._predict_lap_times, self.stats['lap_time'], max_wait_ms, max_batch_size),
+            'strategy': MicroBatcher(self._predict_strategies, self.stats['strategy'], max_wait_ms, max_batch_size),
+        }
+
+    @classmethod
+    def from_registry(cls, names, root=REGISTRY_FOLDER, **kwargs):
+        """names: model names in the registry, or a dict service name -> registry name."""
+        registry = get_registry(root)
+        names = names if isinstance(names, dict) else {name: name for name in names}
+        return cls({alias: registry.get(name) for alias, name in names.items()}, **kwargs)
+
+    def _model(self, request):
+        if not isinstance(request, dict):
+            raise RequestError("Request body must be a JSON object.")
+        name = request.get('model', next(iter(self.models)))
+        if name not in self.models:
+            raise RequestError(f"Unknown model '{name}'. Available: {list(self.models)}")
+        return name, self.models[name]
+
+    def _lap_rows(self, model, request):
+        try:
+            if 'rows' in request:
+                rows = [[float(row[name]) for name in model.feature_names] for row in request['rows']]
+                return np.array(rows, dtype=float).reshape(-1, len(model.feature_names))
+            tyre_life = np.atleast_1d(np.asarray(request['tyre_life'], dtype=float))
+            return build_lap_features(model.feature_names, str(request['compound']), tyre_life, request['weather'])
+        except KeyError as e:
+            if 'rows' in request:
+                raise RequestError(f"Missing feature {e} in rows; expected {model.feature_names}")
+            raise RequestError(f"Missing field {e}; send 'rows' or 'compound', 'tyre_life' and 'weather'")
+        except (ValueError, TypeError, AttributeError) as e:
+            raise RequestError(f"Bad lap_time request: {e}")
+
+    def _predict_lap_times(self, requests):
+        """One predict_array call per model for the whole batch."""
+        results = [None] * len(requests)
+        by_model = {}
+        for i, request in enumerate(requests):
+            try:
+                name, model = self._model(request)
+                rows = self._lap_rows(model, request)
+                by_model.setdefault(name, []).append((i, rows))
+            except RequestError as e:
+                results[i] = e
+
+        for name, parts in by_model.items():
+            model = self.models[name]
+            try:
+                predicted = model.predict_array(np.vstack([rows for _, rows in parts]))
+            except Exception:
+                # Predict each request on its own so one bad request cannot fail the rest of the batch
+                for i, rows in parts:
+                    try:
+                        results[i] = {'lap_times': model.predict_array(rows).tolist()}
+                    except ValueError as e:
+                        results[i] = RequestError(f"Prediction failed: {e}")
+                    except Exception as e:
+                        results[i] = e
+                continue
+            offsets = np.cumsum([0] + [len(rows) for _, rows in parts])
+            for (i, _), start, stop in zip(parts, offsets[:-1], offsets[1:]):
+                results[i] = {'lap_times': predicted[start:stop].tolist()}
+        return results
+
+    @staticmethod
+    def _stint_laps(table, laps):
+        # stint_time indexes the table directly, so out-of-range lengths would wrap around
+        if not 1 <= int(laps) <= table.max_tyre_life:
+            raise RequestError(f"Stint length {laps} must be between 1 and {table.max_tyre_life} laps.")
+        return int(laps)
+
+    def _predict_strategies(self, requests):
+        """Strategy totals from the cached lap time table of each request's weather."""
+        results = []
+        for request in requests:
+            try:
+                name, _ = self._model(request)
+                table = self.table_caches[name].get_table(request['weather'])
+                pit_loss = float(request.get('pit_loss', 20))
+                ranked = []
+                for strategy in request['strategies']:
+                    total = sum(table.stint_time(compound, self._stint_laps(table, laps)) for compound, laps in strategy)
+                    ranked.append({'strategy': strategy, 'simulated_time': float(total + pit_loss * (len(strategy) - 1))})
+                ranked.sort(key=lambda row: row['simulated_time'])
+                results.append({'ranking': ranked})
+            except (KeyError, TypeError, AttributeError) as e:
+                results.append(RequestError(f"Bad strategy request: {e}"))
+            except (RequestError, ValueError, IndexError) as e:
+                results.append(RequestError(str(e)))
+        return results
+
+    def metrics(self):
+        metrics = {endpoint: stats.summary() for endpoint, stats in self.stats.items()}
+        metrics['models'] = list(self.models)
+        metrics['table_caches'] = {name: cache.stats() for name, cache in self.table_caches.items()}
+        return metrics
+
+    async def predict(self, endpoint, request):
+        """Queue one request on an endpoint's batcher and wait for its result."""
+        stats = self.stats[endpoint]
+        start = time.perf_counter()
+        stats.requests += 1
+        try:
+            return await self.batchers[endpoint].submit(request)
+        except Exception:
+            stats.errors += 1
+            raise
+        finally:
+            stats.latencies_ms.append((time.perf_counter() - start) * 1000)
+
+    async def start(self):
+        for batcher in self.batchers.values():
+            batcher.start()
+
+    async def stop(self):
+        for batcher in self.batchers.values():
+            await batcher.stop()
+
+    # --- HTTP ------------------------------------------------------------------
+
+    async def _route(self, method, path, body):
+        if method == 'GET' and path == '/health':
+            return 200, {'status': 'ok', 'models': list(self.models)}
+        if method == 'GET' and path == '/metrics':
+            return 200, self.metrics()
+        if method == 'POST' and path in ('/predict/lap_time', '/predict/strategy'):
+            try:
+                request = json.loads(body or b'{}')
+            except json.JSONDecodeError as e:
+                return 400, {'error': f"Invalid JSON: {e}"}
+            try:
+                return 200, await self.predict(path.rsplit('/', 1)[1], request)
+            except RequestError as e:
+                return 400, {'error': str(e)}
+            except Exception as e:
+                return 500, {'error': f"{type(e).__name__}: {e}"}
+        return 404, {'error': f"No route for {method} {path}"}
+
+    async def handle_connection(self, reader, writer):
+        """Minimal HTTP/1.1 with keep-alive: one JSON request/response at a time per connection."""
+        try:
+            while True:
+                request_line = await reader.readline()
+                if not request_line:
+                    break
+                method, path, _ = request_line.decode('latin-1').split(' ', 2)
+
+                headers = {}
+                while True:
+                    line = await reader.readline()
+                    if line in (b'\r\n', b'\n', b''):
+                        break
+                    key, _, value = line.decode('latin-1').partition(':')
+                    headers[key.strip().lower()] = value.strip()
+
+                body = await reader.readexactly(int(headers.get('content-length', 0)))
+                status, payload = await self._route(method, path.split('?', 1)[0], body)
+
+                data = json.dumps(payload).encode()
+                reason = {200: 'OK', 400: 'Bad Request', 404: 'Not Found', 500: 'Internal Server Error'}[status]
+                writer.write(f"HTTP/1.1 {status} {reason}\r\nContent-Type: application/json\r\n"
+                             f"Content-Length: {len(data)}\r\n\r\n".encode() + data)
+                await writer.drain()
+                if headers.get('connection', '').lower() == 'close':
+                    break
+        except (ConnectionError, asyncio.IncompleteReadError, ValueError):
+            pass
+        finally:
+            writer.close()
+
+    async def serve(self, host='127.0.0.1', port=8000):
+        await self.start()
+        server = await asyncio.start_server(self.handle_connection, host, port)
+        print(f"✅ Serving {list(self.models)} on http://{host}:{port}")
+        try:
+            async with server:
+                await server.serve_forever()
+        finally:
+            await self.stop()
+
+
+def run_service(model_names, host='127.0.0.1', port=8000, root=REGISTRY_FOLDER, **kwargs):
+    """Load registry models once and serve them until interrupted."""
+    service = PredictionService.from_registry(model_names, root=root, **kwargs)
+    try:
+        asyncio.run(service.serve(host, port))
+    except KeyboardInterrupt:
+        print("🛑 Service stopped")
+
+
+if __name__ == "__main__":
+    run_service(['tire_model_poly2'])
@@ -0,0 +1,45 @@
+import numpy as np
+import pandas as pd
+from models.monaco_simulation.incremental_tire_model import IncrementalTireModel
+
+
+def laps(n, seed, drift=0.0):
+    rng = np.random.default_rng(seed)
+    soft = rng.integers(0, 2, n).astype(float)
+    X = pd.DataFrame({'TyreLife': rng.integers(1, 40, n).astype(float), 'TrackTemp': rng.uniform(30, 50, n),
+                      'AirTemp': rng.uniform(18, 28, n), 'Compound_SOFT': soft})
+    y = (75 + (0.08 + drift) * X['TyreLife'] + 0.002 * X['TyreLife'] ** 2 + 0.05 * X['TrackTemp']
+         - 0.6 * soft + rng.normal(0, 0.2, n))
+    return X, y
+
+
+def sessions():
+    return [laps(300, seed) for seed in range(4)]
+
+
+def test_chunked_partial_fit_matches_a_full_refit():
+    model = IncrementalTireModel(degree=2)
+    for X, y in sessions():
+        model.partial_fit(X, y)
+
+    X_all = pd.concat([X for X, _ in sessions()])
+    y_all = pd.concat([y for _, y in sessions()])
+    # Single least-squares fit on the same scaled polynomial features
+    full = np.linalg.lstsq(model._expand(X_all.to_numpy()), y_all.to_numpy(), rcond=None)[0]
+
+    np.testing.assert_allclose(model.coefficients(), full, rtol=0, atol=1e-9)
+    np.testing.assert_allclose(model.predict(X_all), model._expand(X_all.to_numpy()) @ full, atol=1e-9)
+
+
+def test_forgetting_weights_recent_sessions_more():
+    history = [laps(300, seed) for seed in range(3)] + [laps(300, 9, drift=0.05)]
+    plain, forgetful = IncrementalTireModel(degree=2), IncrementalTireModel(degree=2, forgetting=0.3)
+    for X, y in history:
+        plain.partial_fit(X, y)
+        forgetful.partial_fit(X, y)
+
+    X_new = pd.DataFrame({'TyreLife': [30.0], 'TrackTemp': [40.0], 'AirTemp': [23.0], 'Compound_SOFT': [0.0]})
+    recent_truth = 75 + 0.13 * 30 + 0.002 * 30 ** 2 + 0.05 * 40
+
+    assert not np.allclose(plain.coefficients(), forgetful.coefficients())
+    assert abs(forgetful.predict(X_new)[0] - recent_truth) < abs(plain.predict(X_new)[0] - recent_truth)
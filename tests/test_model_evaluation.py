@@ -0,0 +1,61 @@
+import numpy as np
+import pandas as pd
+from models.model_evaluation import strategy_ranking_accuracy, walk_forward_backtest
+
+WEATHER = {'TrackTemp': 40.0, 'AirTemp': 25.0, 'Pressure': 1010.0}
+# Per-lap time: base + wear per lap of tyre life
+COMPOUND_PACE = {'SOFT': (74.0, 0.20), 'MEDIUM': (74.8, 0.08)}
+PLANS = {'AAA': [('SOFT', 10), ('MEDIUM', 20)], 'BBB': [('MEDIUM', 20), ('SOFT', 10)],
+         'CCC': [('SOFT', 15), ('MEDIUM', 15)], 'DDD': [('MEDIUM', 30)]}
+
+
+class PaceModel:
+    feature_names = ['TyreLife', 'TrackTemp', 'AirTemp', 'Pressure', 'Compound_MEDIUM', 'Compound_SOFT']
+
+    def predict_array(self, X):
+        soft = X[:, 5] == 1
+        base = np.where(soft, COMPOUND_PACE['SOFT'][0], COMPOUND_PACE['MEDIUM'][0])
+        wear = np.where(soft, COMPOUND_PACE['SOFT'][1], COMPOUND_PACE['MEDIUM'][1])
+        return base + wear * X[:, 0]
+
+
+def race_laps(year, noise=0.0, seed=0):
+    rng = np.random.default_rng(seed)
+    rows = []
+    for driver, plan in PLANS.items():
+        lap_number = 0
+        for stint, (compound, laps) in enumerate(plan, start=1):
+            base, wear = COMPOUND_PACE[compound]
+            for life in range(1, laps + 1):
+                lap_number += 1
+                pit = 20.0 if life == laps and stint < len(plan) else 0.0
+                rows.append({'year': year, 'round': 1, 'session_type': 'R', 'Driver': driver, 'Stint': stint,
+                             'LapNumber': lap_number, 'TyreLife': float(life), 'Compound': compound, **WEATHER,
+                             'LapTime': base + wear * life + pit + rng.normal(0, noise)})
+    return pd.DataFrame(rows)
+
+
+def test_strategy_ranking_matches_when_simulation_is_exact():
+    laps = race_laps(2023)
+    accuracy = strategy_ranking_accuracy(laps[['Driver', 'Stint']], laps['LapTime'], laps['Compound'],
+                                         PaceModel(), WEATHER)
+    assert accuracy == 1.0
+
+
+def test_strategy_ranking_is_inverted_by_reversed_times():
+    laps = race_laps(2023)
+    accuracy = strategy_ranking_accuracy(laps[['Driver', 'Stint']], -laps['LapTime'], laps['Compound'],
+                                         PaceModel(), WEATHER)
+    assert accuracy == 0.0
+
+
+def test_backtest_reports_strategy_next_to_pace_ranking():
+    laps = pd.concat([race_laps(year, noise=0.05, seed=year) for year in (2021, 2022, 2023)], ignore_index=True)
+
+    report = walk_forward_backtest(laps, degree=2, n_workers=1)
+
+    sessions = report['sessions']
+    assert len(sessions) == 2
+    assert {'stint_pace_ranking_accuracy', 'strategy_ranking_accuracy'} <= set(sessions.columns)
+    assert sessions['strategy_ranking_accuracy'].between(0, 1).all()
+    assert report['overall']['strategy_ranking_accuracy'].notna().all()
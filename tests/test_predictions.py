@@ -0,0 +1,82 @@
+import asyncio
+import numpy as np
+import pytest
+
+from src.prediction import PredictionService, RequestError
+from models.monaco_simulation.lap_time_tables import LapTimeTableCache
+
+FEATURES = ['TyreLife', 'TrackTemp', 'AirTemp', 'Pressure', 'Compound_SOFT', 'Compound_MEDIUM']
+WEATHER = {'TrackTemp': 40.0, 'AirTemp': 25.0, 'Pressure': 1010.0}
+
+
+class LinearLapModel:
+    """Stand-in tire model: 75 s plus 0.1 s per lap of tyre life."""
+    feature_names = FEATURES
+
+    def predict_array(self, X):
+        X = np.asarray(X, dtype=float)
+        if np.isnan(X).any():
+            raise ValueError("Input contains NaN.")
+        return 75.0 + 0.1 * X[:, 0]
+
+
+def run_batch(service, endpoint, requests):
+    async def main():
+        await service.start()
+        try:
+            return await asyncio.gather(*(service.predict(endpoint, r) for r in requests), return_exceptions=True)
+        finally:
+            await service.stop()
+    return asyncio.run(main())
+
+
+def lap_row(tyre_life):
+    return dict(dict.fromkeys(FEATURES, 0.0), TyreLife=tyre_life, **WEATHER)
+
+
+def test_bad_lap_time_requests_do_not_fail_the_batch():
+    service = PredictionService({'tire': LinearLapModel()}, max_wait_ms=50)
+    requests = [{'rows': [lap_row(life)]} for life in range(1, 6)]
+    requests.insert(2, {'rows': [dict(lap_row(1), TyreLife='abc')]})
+    requests.append({'rows': [lap_row(float('nan'))]})
+    requests.append(['not', 'a', 'dict'])
+
+    results = run_batch(service, 'lap_time', requests)
+
+    good = [results[i] for i in (0, 1, 3, 4, 5)]
+    assert [r['lap_times'][0] for r in good] == pytest.approx([75.1, 75.2, 75.3, 75.4, 75.5])
+    assert all(isinstance(results[i], RequestError) for i in (2, 6, 7))
+    assert service.stats['lap_time'].errors == 3
+
+
+def test_lap_time_requests_on_unknown_compounds_are_rejected():
+    service = PredictionService({'tire': LinearLapModel()}, max_wait_ms=50)
+    requests = [{'compound': compound, 'tyre_life': [1, 2], 'weather': WEATHER}
+                for compound in ['Soft', 'Wet', 'Sfot', None]]
+
+    results = run_batch(service, 'lap_time', requests)
+
+    assert results[0]['lap_times'] == pytest.approx([75.1, 75.2])
+    assert all(isinstance(r, RequestError) for r in results[1:])
+
+
+def test_strategy_stint_lengths_and_compounds_are_validated():
+    # The default compounds include Hard/Intermediate/Wet, which this model has no columns for
+    service = PredictionService({'tire': LinearLapModel()}, max_wait_ms=50)
+    base = {'weather': WEATHER, 'pit_loss': 20}
+    requests = [
+        dict(base, strategies=[[['Soft', 30], ['Medium', 48]]]),
+        dict(base, strategies=[[['Soft', -3], ['Medium', 48]]]),
+        dict(base, strategies=[[['Soft', 30], ['Medium', 1000]]]),
+        dict(base, strategies=[[['Wet', 30], ['Medium', 48]]]),
+    ]
+
+    results = run_batch(service, 'strategy', requests)
+
+    assert results[0]['ranking'][0]['simulated_time'] > 0
+    assert all(isinstance(r, RequestError) for r in results[1:])
+
+
+def test_table_cache_rejects_compounds_the_model_was_not_trained_on():
+    with pytest.raises(ValueError, match='Wet'):
+        LapTimeTableCache(LinearLapModel(), ['Soft', 'Wet'])
@@ -0,0 +1,34 @@
+import numpy as np
+from models.monaco_simulation.lap_time_tables import LapTimeTable
+from models.monaco_simulation.race_simulator import simulate_race
+
+TOTAL_LAPS = 78
+NO_NOISE = {'lap_noise_std': 0.0}
+
+
+def soft_table():
+    lap_times = np.full((1, TOTAL_LAPS + 1), np.nan)
+    lap_times[0, 1:] = 80 + 0.02 * np.arange(1, TOTAL_LAPS + 1)
+    return LapTimeTable(['Soft'], lap_times, {})
+
+
+def car(driver, pace_offset=0.0):
+    return {'driver': driver, 'strategy': [('Soft', TOTAL_LAPS)], 'pace_offset': pace_offset}
+
+
+def test_backmarker_does_not_hold_up_the_leader():
+    table = soft_table()
+    alone = simulate_race([car('LEA')], table, TOTAL_LAPS, params=NO_NOISE)['results']
+    with_backmarker = simulate_race([car('LEA'), car('BAK', pace_offset=3.0)], table, TOTAL_LAPS,
+                                    params=NO_NOISE)['results'].set_index('driver')
+
+    assert with_backmarker.loc['LEA', 'finish_time'] == alone['finish_time'].iloc[0]
+    # Lapping a car is not an overtake
+    assert with_backmarker.loc['LEA', 'overtakes'] == 0
+
+
+def test_cars_on_the_same_lap_still_need_to_overtake():
+    results = simulate_race([car('SLO', pace_offset=0.5), car('FAS')], soft_table(), TOTAL_LAPS,
+                            params=dict(NO_NOISE, overtake_base_prob=0.0, overtake_pace_scale=0.0))['results']
+
+    assert list(results['driver']) == ['SLO', 'FAS']
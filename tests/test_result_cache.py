@@ -0,0 +1,42 @@
+import numpy as np
+import pandas as pd
+from models.monaco_simulation.result_cache import ResultCache, cached_strategies_batch
+from models.monaco_simulation.tire_model import TirePerformanceModel
+
+WEATHER = {'TrackTemp': 40.0, 'AirTemp': 25.0, 'Pressure': 1010.0}
+STRATEGIES = [[('Soft', 30), ('Medium', 48)], [('Medium', 40), ('Soft', 38)]]
+
+
+def training_data(slope, seed=0):
+    rng = np.random.default_rng(seed)
+    soft = rng.integers(0, 2, 200).astype(float)
+    X = pd.DataFrame({'TyreLife': rng.integers(1, 40, 200).astype(float), **WEATHER,
+                      'Compound_SOFT': soft, 'Compound_MEDIUM': 1 - soft})
+    return X, 75 + slope * X['TyreLife'] - 0.5 * soft
+
+
+def fitted_model(slope=0.1):
+    model = TirePerformanceModel()
+    model.fit(*training_data(slope))
+    return model
+
+
+def test_second_identical_call_is_a_hit():
+    model, cache = fitted_model(), ResultCache()
+
+    first = cached_strategies_batch(STRATEGIES, model, WEATHER, cache=cache)
+    second = cached_strategies_batch(STRATEGIES, model, WEATHER, cache=cache)
+
+    assert (cache.misses, cache.memory_hits) == (1, 1)
+    pd.testing.assert_frame_equal(first, second)
+
+
+def test_refitting_in_place_invalidates_results():
+    model, cache = fitted_model(), ResultCache()
+    before = cached_strategies_batch(STRATEGIES, model, WEATHER, cache=cache)
+
+    model.fit(*training_data(slope=0.3))
+    after = cached_strategies_batch(STRATEGIES, model, WEATHER, cache=cache)
+
+    assert cache.misses == 2
+    assert after['simulated_time'].min() > before['simulated_time'].min()
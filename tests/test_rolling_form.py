@@ -0,0 +1,54 @@
+from pathlib import Path
+import numpy as np
+import pandas as pd
+import pytest
+from models.feature_engineering import RACE_COLS, RollingFormState, rolling_form
+
+RACE_RESULTS = Path(__file__).resolve().parents[1] / "data" / "processed" / "race_results_clean.csv"
+KEYS = RACE_COLS + ['driver_id']
+
+
+@pytest.fixture(scope='module')
+def results():
+    return pd.read_csv(RACE_RESULTS)
+
+
+def form_columns(features):
+    form = [col for col in features.columns if col.startswith(('driver_form_', 'constructor_form_'))]
+    return features[KEYS + form].sort_values(KEYS).reset_index(drop=True)
+
+
+def race_keys(frame):
+    return list(zip(frame['season'], frame['round']))
+
+
+def test_changing_a_race_does_not_change_its_own_or_earlier_features(results):
+    races = sorted(set(race_keys(results)))
+    race = races[len(races) // 2]
+    in_race = np.array([key == race for key in race_keys(results)])
+
+    # Reverse the finishing order, move the points with it and retire the winner
+    changed = results.copy()
+    changed.loc[in_race, 'position_order'] = changed.loc[in_race, 'position_order'].max() + 1 - changed.loc[in_race, 'position_order']
+    changed.loc[in_race, 'points'] = changed.loc[in_race, 'points'].to_numpy()[::-1]
+    changed.loc[in_race & (changed['position_order'] == 1), 'status'] = 'Engine'
+
+    before, after = form_columns(rolling_form(results)), form_columns(rolling_form(changed))
+    up_to_race = np.array([key <= race for key in race_keys(before)])
+    later = np.array([key > race for key in race_keys(before)])
+
+    pd.testing.assert_frame_equal(before[up_to_race], after[up_to_race])
+    # The change does show up in the next races' form
+    assert not before[later].equals(after[later])
+
+
+def test_append_race_matches_rolling_form(results):
+    last_race = max(race_keys(results))
+    is_last = np.array([key == last_race for key in race_keys(results)])
+
+    state = RollingFormState.from_results(results[~is_last])
+    incremental = form_columns(state.append_race(results[is_last]))
+    batch = form_columns(rolling_form(results))
+    batch = batch[[key == last_race for key in race_keys(batch)]].reset_index(drop=True)
+
+    pd.testing.assert_frame_equal(incremental, batch, check_dtype=False)
@@ -0,0 +1,51 @@
+from collections import Counter
+import numpy as np
+from models.monaco_simulation.lap_time_tables import LapTimeTable
+from models.monaco_simulation.strategy_optimizer import find_optimal_strategies
+
+TOTAL_LAPS = 30
+PIT_LOSS = 20
+MIN_STINT = 5
+
+
+def table():
+    life = np.arange(TOTAL_LAPS + 1)
+    lap_times = np.vstack([74 + 0.12 * life + 0.002 * life ** 2, 74.6 + 0.06 * life, 75.2 + 0.03 * life])
+    lap_times[:, 0] = np.nan
+    return LapTimeTable(['Soft', 'Medium', 'Hard'], lap_times, {})
+
+
+def all_plans(laps_left, n_compounds):
+    if laps_left == 0:
+        yield []
+    for laps in range(MIN_STINT, laps_left + 1):
+        for compound in range(n_compounds):
+            for rest in all_plans(laps_left - laps, n_compounds):
+                yield [(compound, laps)] + rest
+
+
+def distinct_plan_times(table):
+    times = {}
+    for plan in all_plans(TOTAL_LAPS, len(table.compounds)):
+        if len({compound for compound, _ in plan}) < 2:
+            continue
+        key = tuple(sorted((table.compounds[c], laps) for c, laps in plan))
+        times[key] = sum(table.stint_times[c, laps] for c, laps in plan) + PIT_LOSS * (len(plan) - 1)
+    return sorted(times.values())
+
+
+def test_top_k_plans_are_distinct_and_fastest():
+    lap_times = table()
+    best = find_optimal_strategies(lap_times, TOTAL_LAPS, pit_loss=PIT_LOSS, min_stint=MIN_STINT, top_k=8)
+
+    keys = [Counter(strategy) for strategy in best['strategy']]
+    assert all(keys[i] != keys[j] for i in range(len(keys)) for j in range(i))
+    np.testing.assert_allclose(best['total_time'], distinct_plan_times(lap_times)[:8])
+
+
+def test_reorderings_tie_without_distinct():
+    best = find_optimal_strategies(table(), TOTAL_LAPS, pit_loss=PIT_LOSS, min_stint=MIN_STINT, top_k=4,
+                                   distinct=False)
+
+    assert best['total_time'].nunique() < 4
+    assert len({tuple(sorted(strategy)) for strategy in best['strategy']}) < 4
@@ -0,0 +1,25 @@
+import numpy as np
+from models.monaco_simulation.streaming_join import StreamingAsOfJoin
+
+WEATHER = {'TrackTemp': 40.0, 'AirTemp': 25.0, 'Pressure': 1010.0, 'Rainfall': 0.0}
+
+
+def lap(time, driver, number):
+    return {'time': time, 'kind': 'lap', 'driver': driver, 'data': {'LapNumber': number, 'LapTime': 75.0}}
+
+
+def test_laps_before_any_sample_have_the_same_fields_as_later_laps():
+    join = StreamingAsOfJoin(tolerance=10.0, allowed_lateness=0.0)
+    events = [
+        lap(100.0, 'AAA', 1),
+        {'time': 200.0, 'kind': 'weather', 'driver': None, 'data': WEATHER},
+        {'time': 200.0, 'kind': 'gap', 'driver': 'AAA',
+         'data': {'LapNumber': 2, 'GapToLeader': 0.0, 'IntervalToPositionAhead': 0.0}},
+        lap(200.0, 'AAA', 2),
+    ]
+    joined = [row for event in events for row in join.process(event)] + join.flush()
+
+    early, later = joined
+    assert early.keys() == later.keys()
+    assert np.isnan([early[field] for field in ['TrackTemp', 'GapToLeader', 'weather_offset', 'gap_offset']]).all()
+    assert later['TrackTemp'] == 40.0 and later['gap_offset'] == 0.0